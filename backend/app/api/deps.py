@@ -1,28 +1,20 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import verify_token
+from app.core.security import decode_token, verify_token
 from app.db.database import get_db, get_users_collection
-from app.schemas.mongodb_schemas import MongoDBUser as User
+from app.schemas.mongodb_schemas import MongoDBUser as User, TokenPrincipal
+from app.services.principal_cache import principal_cache
 from bson import ObjectId
 
 security = HTTPBearer()
 
 
-async def get_current_user(
-    db = Depends(get_db),
-    credentials: HTTPAuthorizationCredentials = Depends(security)
-) -> User:
-    """Get current authenticated user"""
-    token = credentials.credentials
-    user_email = verify_token(token)
-    
-    if user_email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+async def _get_user_by_subject(user_email: str) -> Optional[User]:
+    """Load the user named by a token subject, served from the principal cache when fresh"""
+    user = principal_cache.get(user_email)
+    if user is not None:
+        return user
     
     # Get users collection
     users_collection = get_users_collection()
@@ -30,10 +22,7 @@ async def get_current_user(
     # Find user by email (since token contains email as subject)
     user_doc = await users_collection.find_one({"email": user_email})
     if user_doc is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
+        return None
     
     # Convert ObjectId to string for the response
     user_doc["_id"] = str(user_doc["_id"])
@@ -64,9 +53,32 @@ async def get_current_user(
     if 'push_notifications' not in user_data:
         user_data['push_notifications'] = True
     
+    user = User(**user_data)
+    principal_cache.set(user_email, user)
+    return user
+
+
+async def get_current_user(
+    db = Depends(get_db),
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> User:
+    """Get current authenticated user"""
+    token = credentials.credentials
+    user_email = verify_token(token)
     
+    if user_email is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
     
-    user = User(**user_data)
+    user = await _get_user_by_subject(user_email)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
     
     if not user.is_active:
         raise HTTPException(
@@ -77,6 +89,41 @@ async def get_current_user(
     return user
 
 
+async def get_token_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> TokenPrincipal:
+    """Get the caller from verified token claims without loading the user.
+
+    For role-gated endpoints that only need email and role. The user's
+    current state is not checked, so a deactivated user keeps access until
+    the token expires; use get_current_user where that matters. Tokens
+    without a role claim fall back to the user lookup.
+    """
+    claims = decode_token(credentials.credentials)
+    if claims is None or claims.get("sub") is None or claims.get("type") != "access":
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    if claims.get("role"):
+        return TokenPrincipal(email=claims["sub"], role=claims["role"])
+    
+    user = await _get_user_by_subject(claims["sub"])
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    if not user.is_active:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Inactive user"
+        )
+    return TokenPrincipal(email=user.email, role=user.role)
+
+
 def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
@@ -128,46 +175,10 @@ async def get_optional_current_user(
         if user_email is None:
             return None
         
-        # Get users collection
-        users_collection = get_users_collection()
-        
-        # Find user by email (since token contains email as subject)
-        user_doc = await users_collection.find_one({"email": user_email})
-        if user_doc is None:
+        user = await _get_user_by_subject(user_email)
+        if user is None:
             return None
         
-        # Convert ObjectId to string for the response
-        user_doc["_id"] = str(user_doc["_id"])
-        
-        # Convert to User schema - handle missing fields
-        user_data = user_doc.copy()
-        # Ensure required fields exist
-        if 'user_id' not in user_data:
-            user_data['user_id'] = None
-        if 'is_active' not in user_data:
-            user_data['is_active'] = True
-        if 'skills' not in user_data:
-            user_data['skills'] = []
-        if 'preferred_job_types' not in user_data:
-            user_data['preferred_job_types'] = []
-        if 'preferred_locations' not in user_data:
-            user_data['preferred_locations'] = []
-        if 'jobs_applied' not in user_data:
-            user_data['jobs_applied'] = 0
-        if 'jobs_posted' not in user_data:
-            user_data['jobs_posted'] = 0
-        if 'profile_views' not in user_data:
-            user_data['profile_views'] = 0
-        if 'job_alerts' not in user_data:
-            user_data['job_alerts'] = True
-        if 'email_notifications' not in user_data:
-            user_data['email_notifications'] = True
-        if 'push_notifications' not in user_data:
-            user_data['push_notifications'] = True
-        
-
-        
-        user = User(**user_data)
         return user if user.is_active else None
     except:
         return None
\ No newline at end of file
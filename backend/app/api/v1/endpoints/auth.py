@@ -4,9 +4,11 @@ from typing import Optional
 from app.db.database import get_users_collection
 from app.schemas.mongodb_schemas import MongoDBUser
 from jose import jwt
-import bcrypt
 import logging
 from app.core.config import settings
+from app.core.security import get_signing_key
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.services.skill_taxonomy import skill_keys
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -22,7 +24,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, get_signing_key(SECRET_KEY, ALGORITHM), algorithm=ALGORITHM)
     return encoded_jwt
 
 
@@ -44,8 +46,10 @@ async def register(user_data: dict, users_collection=Depends(get_users_db)):
         
         # Hash password
         try:
-            hashed_password = bcrypt.hashpw(user_data["password"].encode("utf-8"), bcrypt.gensalt())
+            hashed_password = await password_hasher.hash(user_data["password"])
             logger.info("Password hashed successfully")
+        except PasswordHasherBusy as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
         except Exception as e:
             logger.error(f"Password hashing failed: {e}")
             raise HTTPException(status_code=500, detail=f"Password hashing failed: {str(e)}")
@@ -55,7 +59,7 @@ async def register(user_data: dict, users_collection=Depends(get_users_db)):
             "email": user_data["email"],
             "name": user_data.get("name"),
             "role": user_data.get("role", "jobseeker"),
-            "password": hashed_password.decode("utf-8"),
+            "password": hashed_password,
             "phone": user_data.get("phone"),
             "location": user_data.get("location"),
             "created_at": datetime.utcnow(),
@@ -77,6 +81,7 @@ async def register(user_data: dict, users_collection=Depends(get_users_db)):
             # Job seeker specific fields
             user_doc.update({
                 "skills": user_data.get("skills", []),
+                "skill_keys": skill_keys(user_data.get("skills", [])),
                 "experience_years": user_data.get("experience_years"),
                 "preferred_job_types": user_data.get("preferred_job_types", []),
                 "preferred_locations": user_data.get("preferred_locations", []),
@@ -143,10 +148,12 @@ async def login(user_data: dict, users_collection=Depends(get_users_db)):
             logger.info(f"Attempting password verification for user: {user_data['email']}")
             logger.info(f"Stored password hash: {user['password'][:20]}...")
             
-            if not bcrypt.checkpw(user_data["password"].encode("utf-8"), user["password"].encode("utf-8")):
+            if not await password_hasher.verify(user_data["password"], user["password"]):
                 logger.warning(f"Invalid password for user: {user_data['email']}")
                 raise HTTPException(status_code=401, detail="Incorrect email or password")
             logger.info("Password verification successful")
+        except PasswordHasherBusy as e:
+            raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
         except Exception as e:
             logger.error(f"Password verification failed: {e}")
             raise HTTPException(status_code=401, detail="Incorrect email or password")
@@ -194,7 +194,7 @@ async def create_company(
 
 
 @router.put("/{company_id}", response_model=MongoDBCompany)
-def update_company(
+async def update_company(
     company_id: str,
     company_data: dict,
     companies_collection = Depends(get_companies_db)
@@ -206,7 +206,7 @@ def update_company(
             if value is not None:
                 update_data[field] = value
         
-        result = companies_collection.update_one(
+        result = await companies_collection.update_one(
             {"_id": ObjectId(company_id)},
             {"$set": update_data}
         )
@@ -215,7 +215,7 @@ def update_company(
             raise HTTPException(status_code=404, detail="Company not found")
         
         # Return updated company
-        updated_company = companies_collection.find_one({"_id": ObjectId(company_id)})
+        updated_company = await companies_collection.find_one({"_id": ObjectId(company_id)})
         updated_company["_id"] = str(updated_company["_id"])
         return MongoDBCompany(**updated_company)
     except HTTPException:
@@ -225,13 +225,13 @@ def update_company(
 
 
 @router.delete("/{company_id}")
-def delete_company(
+async def delete_company(
     company_id: str,
     companies_collection = Depends(get_companies_db)
 ):
     """Delete a company"""
     try:
-        result = companies_collection.delete_one({"_id": ObjectId(company_id)})
+        result = await companies_collection.delete_one({"_id": ObjectId(company_id)})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Company not found")
         
@@ -243,7 +243,7 @@ def delete_company(
 
 
 @router.get("/search/")
-def search_companies(
+async def search_companies(
     query: Optional[str] = None,
     industry: Optional[str] = None,
     location: Optional[str] = None,
@@ -274,7 +274,7 @@ def search_companies(
         
         cursor = companies_collection.find(search_query).skip(skip).limit(limit)
         companies = []
-        for company in cursor:
+        async for company in cursor:
             company["_id"] = str(company["_id"])
             companies.append(MongoDBCompany(**company))
         return companies
@@ -3,11 +3,13 @@ from typing import List, Optional
 from app.crud.mongodb_jobs import get_mongodb_job_crud, get_mongodb_application_crud
 from app.schemas.mongodb_schemas import (
     MongoDBJob, MongoDBJobApplication, JobCreateRequest, JobUpdateRequest,
-    JobSearchRequest, JobApplicationRequest, JobStatus, ApplicationStatus
+    JobSearchRequest, JobApplicationRequest, JobStatus, ApplicationStatus, JobType, WorkMode,
+    JobSortField, JobSortOrder
 )
 from app.api.deps import get_current_user
 from app.models.user import User
 from app.db.mongodb import connect_to_mongo
+from app.services.task_queue import task_queue
 import logging
 
 logger = logging.getLogger(__name__)
@@ -69,8 +71,9 @@ async def search_jobs(
     company_id: Optional[str] = Query(None, description="Company ID"),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
-    sort_by: str = Query("created_at", description="Sort field"),
-    sort_order: str = Query("desc", description="Sort order (asc/desc)")
+    sort_by: JobSortField = Query("created_at", description="Sort field"),
+    sort_order: JobSortOrder = Query("desc", description="Sort order (asc/desc)"),
+    include_facets: bool = Query(False, description="Include facet counts")
 ):
     """Search and filter jobs"""
     try:
@@ -104,7 +107,8 @@ async def search_jobs(
             sort_order=sort_order
         )
         
-        result = await mongodb_job_crud.search_jobs(search_request)
+        job_crud = get_mongodb_job_crud()
+        result = await job_crud.search_jobs(search_request, include_facets=include_facets)
         return result
     except Exception as e:
         logger.error(f"Error searching jobs: {e}")
@@ -307,6 +311,17 @@ async def close_job(
                 detail="Job not found"
             )
         
+        try:
+            await task_queue.enqueue(
+                "notifications.job_closed",
+                idempotency_key=f"job_closed:{job_id}",
+                job_id=job_id,
+                job_title=closed_job.title,
+                company_name=closed_job.company_name
+            )
+        except Exception as notification_error:
+            logger.error(f"Failed to queue job closed notifications: {notification_error}")
+        
         return closed_job
     except HTTPException:
         raise
@@ -549,8 +564,8 @@ async def update_application_status(
         
         # Send notification to job seeker about status update
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_application_status_notification(
+            await task_queue.enqueue(
+                "notifications.application_status",
                 applicant_id=updated_application.applicant_id,
                 job_title=job.title,
                 company_name=job.company_name or "Company",
@@ -1,15 +1,22 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
-from app.db.database import get_jobs_collection, get_applications_collection
+from app.db.database import get_jobs_collection, get_applications_collection, get_users_collection
 from app.schemas.mongodb_schemas import (
     MongoDBJob, JobCreateRequest, JobUpdateRequest, JobSearchRequest,
     MongoDBJobApplication, JobApplicationRequest
 )
 import logging
-from app.api.deps import get_current_user
-from app.schemas.mongodb_schemas import MongoDBUser as User
+import re
+from app.api.deps import get_current_user, get_token_principal
+from app.schemas.mongodb_schemas import MongoDBUser as User, TokenPrincipal
+from app.services.job_cache import job_cache
+from app.services.counters import counter_buffer
+from app.services.job_search import job_search
+from app.services.resume_export import resume_exporter
+from app.services.task_queue import task_queue
 
 router = APIRouter()
 
@@ -93,6 +100,21 @@ async def create_job(
         jobs_collection = get_jobs_db()
         result = await jobs_collection.insert_one(job_doc)
         job_doc["_id"] = str(result.inserted_id)
+        await job_cache.invalidate_listings()
+        job_search.upsert(job_doc)
+        
+        # Alert job seekers whose skills match (fanned out in the background)
+        try:
+            await task_queue.enqueue(
+                "notifications.job_posted",
+                idempotency_key=f"job_posted:{job_doc['_id']}",
+                job_id=job_doc["_id"],
+                job_title=job_doc["title"],
+                company_name=job_doc.get("company_name"),
+                skills=list(job_doc.get("required_skills") or [])
+            )
+        except Exception as notification_error:
+            logging.error(f"Failed to queue job alerts: {notification_error}")
         
         logging.info(f"Job created successfully with ID: {job_doc['_id']}")
         return job_doc
@@ -108,7 +130,7 @@ async def list_jobs(
     jobs_collection = Depends(get_jobs_db)
 ):
     """List all jobs"""
-    try:
+    async def load_jobs():
         cursor = jobs_collection.find().skip(skip).limit(limit)
         jobs = []
         async for job in cursor:
@@ -130,6 +152,9 @@ async def list_jobs(
             # Return raw job data instead of MongoDBJob object to avoid schema issues
             jobs.append(job)
         return jobs
+    
+    try:
+        return await job_cache.get_listing("jobs:list", {"skip": skip, "limit": limit}, load_jobs)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
@@ -212,12 +237,17 @@ async def get_job(
     jobs_collection = Depends(get_jobs_db)
 ):
     """Get a specific job by ID"""
-    try:
+    async def load_job():
         job = await jobs_collection.find_one({"_id": ObjectId(job_id)})
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+    
+    try:
+        job = await job_cache.get_job(job_id, load_job)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        job["_id"] = str(job["_id"])
         # Convert hyphen format to underscore format for compatibility
         if "job_type" in job and job["job_type"]:
             job["job_type"] = job["job_type"].replace("-", "_")
@@ -252,6 +282,8 @@ async def update_job(
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Job not found")
         
+        await job_cache.invalidate_job(job_id)
+        
         # Return updated job
         updated_job = await jobs_collection.find_one({"_id": ObjectId(job_id)})
         updated_job["_id"] = str(updated_job["_id"])
@@ -260,6 +292,20 @@ async def update_job(
             updated_job["job_type"] = updated_job["job_type"].replace("-", "_")
         if "work_mode" in updated_job and updated_job["work_mode"]:
             updated_job["work_mode"] = updated_job["work_mode"].replace("-", "_")
+        job_search.upsert(updated_job)
+        
+        if update_data.get("status") == "closed":
+            try:
+                await task_queue.enqueue(
+                    "notifications.job_closed",
+                    idempotency_key=f"job_closed:{job_id}",
+                    job_id=job_id,
+                    job_title=updated_job.get("title", "Job"),
+                    company_name=updated_job.get("company_name")
+                )
+            except Exception as notification_error:
+                logging.error(f"Failed to queue job closed notifications: {notification_error}")
+        
         return MongoDBJob(**updated_job)
     except HTTPException:
         raise
@@ -299,6 +345,9 @@ async def delete_job(
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Job not found")
         
+        await job_cache.invalidate_job(job_id)
+        job_search.remove(job_id)
+        
         logging.info(f"Job {job_id} deleted successfully by user {current_user.email}")
         return {"message": "Job deleted successfully"}
     except HTTPException:
@@ -362,11 +411,8 @@ async def apply_to_job(
         result = await applications_collection.insert_one(application_doc)
         application_doc["_id"] = str(result.inserted_id)
         
-        # Update job applications count
-        await jobs_collection.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$inc": {"applications_count": 1}}
-        )
+        # Update job applications count (buffered, flushed in bulk)
+        counter_buffer.increment(jobs_collection, job_id, "applications_count")
         
         logging.info(f"Job application submitted: {current_user.email} applied to job {job_id}")
         return application_doc
@@ -380,7 +426,7 @@ async def apply_to_job(
 @router.get("/{job_id}/applications", response_model=List[MongoDBJobApplication])
 async def get_job_applications(
     job_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: TokenPrincipal = Depends(get_token_principal),
     jobs_collection = Depends(get_jobs_db),
     applications_collection = Depends(get_applications_db)
 ):
@@ -418,9 +464,51 @@ async def get_job_applications(
         raise HTTPException(status_code=500, detail=f"Error fetching applications: {str(e)}")
 
 
+@router.get("/{job_id}/applications/export")
+async def export_application_resumes(
+    job_id: str,
+    current_user: TokenPrincipal = Depends(get_token_principal),
+    jobs_collection = Depends(get_jobs_db),
+    applications_collection = Depends(get_applications_db)
+):
+    """Download every applicant's resume for one of the caller's jobs as one ZIP"""
+    if current_user.role != "employer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only employers can export job applications"
+        )
+    
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    try:
+        job = await jobs_collection.find_one(
+            {"_id": ObjectId(job_id)}, {"title": 1, "employer_name": 1, "employer_id": 1}
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching job: {str(e)}")
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Jobs store the posting employer's email as employer_name (see create_job / get_employer_jobs)
+    if job.get("employer_name") != current_user.email:
+        logging.warning(f"Resume export of job {job_id} denied for {current_user.email}")
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only export applications for your own job postings"
+        )
+    
+    logging.info(f"Resume export of job {job_id} started by {current_user.email}")
+    title = re.sub(r"[^A-Za-z0-9]+", "_", job.get("title") or "job").strip("_").lower() or "job"
+    cursor = applications_collection.find({"job_id": job_id}).sort("created_at", -1).batch_size(100)
+    return StreamingResponse(
+        resume_exporter.stream_zip(cursor, get_users_collection()),
+        media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{title}_{job_id}_resumes.zip"'}
+    )
+
+
 @router.get("/applications/my-applications")
 async def get_my_applications(
-    current_user: User = Depends(get_current_user),
+    current_user: TokenPrincipal = Depends(get_token_principal),
     applications_collection = Depends(get_applications_db)
 ):
     """Get applications submitted by the current user (job seekers only)"""
@@ -447,55 +535,126 @@ async def get_my_applications(
         raise HTTPException(status_code=500, detail=f"Error fetching applications: {str(e)}")
 
 
+def _search_filters(search_data: JobSearchRequest) -> dict:
+    """Structured filters of a search request, shared by both search paths"""
+    return {
+        "location": search_data.location,
+        "job_type": [jt.value for jt in search_data.job_type] if search_data.job_type else None,
+        "work_mode": [wm.value for wm in search_data.work_mode] if search_data.work_mode else None,
+        "experience_level": search_data.experience_level,
+        "salary_min": search_data.salary_min,
+        "salary_max": search_data.salary_max,
+        "skills": search_data.skills,
+        "company_id": search_data.company_id
+    }
+
+
+async def _find_jobs_in_order(jobs_collection, job_ids: List[str]) -> List[dict]:
+    """Fetch ranked jobs in one $in query and return them in ranking order"""
+    object_ids = [ObjectId(job_id) for job_id in job_ids if ObjectId.is_valid(job_id)]
+    jobs_by_id = {}
+    async for job in jobs_collection.find({"_id": {"$in": object_ids}}):
+        job["_id"] = str(job["_id"])
+        # Convert hyphen format to underscore format for compatibility
+        if "job_type" in job and job["job_type"]:
+            job["job_type"] = job["job_type"].replace("-", "_")
+        if "work_mode" in job and job["work_mode"]:
+            job["work_mode"] = job["work_mode"].replace("-", "_")
+        jobs_by_id[job["_id"]] = job
+    return [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+
+
+async def _text_index_search(jobs_collection, search_data: JobSearchRequest, skip: int, limit: int) -> dict:
+    """Search through the MongoDB text index (used until the in-process index is built)"""
+    filters = _search_filters(search_data)
+    query = {}
+    projection = None
+    sort = [("created_at", -1)]
+    
+    if search_data.query:
+        query["$text"] = {"$search": search_data.query}
+        projection = {"score": {"$meta": "textScore"}}
+        sort = [("score", {"$meta": "textScore"})]
+    
+    if filters["location"]:
+        query["location"] = {"$regex": re.escape(filters["location"]), "$options": "i"}
+    
+    if filters["job_type"]:
+        query["job_type"] = {"$in": filters["job_type"]}
+    
+    if filters["work_mode"]:
+        query["work_mode"] = {"$in": filters["work_mode"]}
+    
+    if filters["experience_level"]:
+        query["experience_level"] = filters["experience_level"]
+    
+    if filters["salary_min"] or filters["salary_max"]:
+        salary_query = {}
+        if filters["salary_min"]:
+            salary_query["$gte"] = filters["salary_min"]
+        if filters["salary_max"]:
+            salary_query["$lte"] = filters["salary_max"]
+        query["salary_min"] = salary_query
+    
+    if filters["skills"]:
+        query["required_skills"] = {"$in": filters["skills"]}
+    
+    if filters["company_id"]:
+        query["company_id"] = filters["company_id"]
+    
+    total = await jobs_collection.count_documents(query)
+    cursor = jobs_collection.find(query, projection).sort(sort).skip(skip).limit(limit)
+    job_ids = [str(job["_id"]) async for job in cursor]
+    return {"ids": job_ids, "total": total}
+
+
+async def _run_search(jobs_collection, search_data: JobSearchRequest, include_facets: bool = False) -> dict:
+    """Ranked search through the in-process index, falling back to the text index"""
+    page = max(search_data.page or 1, 1)
+    limit = search_data.limit or 20
+    skip = (page - 1) * limit
+    
+    if job_search.ready:
+        result = job_search.search(
+            query=search_data.query,
+            filters=_search_filters(search_data),
+            offset=skip,
+            limit=limit,
+            include_facets=include_facets
+        )
+    else:
+        result = await _text_index_search(jobs_collection, search_data, skip, limit)
+    
+    return {
+        "jobs": await _find_jobs_in_order(jobs_collection, result["ids"]),
+        "total": result["total"],
+        "page": page,
+        "limit": limit,
+        "pages": (result["total"] + limit - 1) // limit,
+        "facets": result.get("facets")
+    }
+
+
 @router.post("/search", response_model=List[MongoDBJob])
 async def search_jobs(
     search_data: JobSearchRequest,
     jobs_collection = Depends(get_jobs_db)
 ):
-    """Search jobs with filters"""
+    """Search jobs with filters, ranked by relevance"""
     try:
-        query = {}
-        
-        if search_data.query:
-            query["$or"] = [
-                {"title": {"$regex": search_data.query, "$options": "i"}},
-                {"description": {"$regex": search_data.query, "$options": "i"}},
-                {"keywords": {"$regex": search_data.query, "$options": "i"}}
-            ]
-        
-        if search_data.location:
-            query["location"] = {"$regex": search_data.location, "$options": "i"}
-        
-        if search_data.job_type:
-            query["job_type"] = {"$in": search_data.job_type}
-        
-        if search_data.work_mode:
-            query["work_mode"] = {"$in": search_data.work_mode}
-        
-        if search_data.experience_level:
-            query["experience_level"] = search_data.experience_level
-        
-        if search_data.salary_min or search_data.salary_max:
-            salary_query = {}
-            if search_data.salary_min:
-                salary_query["$gte"] = search_data.salary_min
-            if search_data.salary_max:
-                salary_query["$lte"] = search_data.salary_max
-            query["salary_min"] = salary_query
-        
-        if search_data.skills:
-            query["required_skills"] = {"$in": search_data.skills}
-        
-        cursor = jobs_collection.find(query).limit(search_data.limit or 20)
-        jobs = []
-        async for job in cursor:
-            job["_id"] = str(job["_id"])
-            # Convert hyphen format to underscore format for compatibility
-            if "job_type" in job and job["job_type"]:
-                job["job_type"] = job["job_type"].replace("-", "_")
-            if "work_mode" in job and job["work_mode"]:
-                job["work_mode"] = job["work_mode"].replace("-", "_")
-            jobs.append(MongoDBJob(**job))
-        return jobs
+        result = await _run_search(jobs_collection, search_data)
+        return [MongoDBJob(**job) for job in result["jobs"]]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching jobs: {str(e)}")
+
+
+@router.post("/search/ranked")
+async def search_jobs_ranked(
+    search_data: JobSearchRequest,
+    jobs_collection = Depends(get_jobs_db)
+):
+    """Search jobs with pagination metadata and facet counts"""
+    try:
+        return await _run_search(jobs_collection, search_data, include_facets=True)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error searching jobs: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Error searching jobs: {str(e)}")
@@ -5,6 +5,9 @@ from bson import ObjectId
 from app.db.database import get_users_collection
 from app.schemas.mongodb_schemas import MongoDBUser
 from app.api.deps import get_current_user
+from app.services.counters import counter_buffer
+from app.services.principal_cache import principal_cache
+from app.services.skill_taxonomy import skill_keys
 
 router = APIRouter()
 
@@ -36,6 +39,8 @@ async def update_current_user_profile(
         for field, value in user_data.items():
             if value is not None:
                 update_data[field] = value
+        if isinstance(update_data.get("skills"), list):
+            update_data["skill_keys"] = skill_keys(update_data["skills"])
         
         print(f"Final update data: {update_data}")
         
@@ -46,6 +51,7 @@ async def update_current_user_profile(
         )
         
         print(f"Update result: matched={result.matched_count}, modified={result.modified_count}")
+        principal_cache.invalidate(current_user.email)
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
@@ -71,7 +77,7 @@ async def update_current_user_profile(
         )
 
 @router.get("/", response_model=List[MongoDBUser])
-def list_users(
+async def list_users(
     skip: int = 0,
     limit: int = 20,
     users_collection = Depends(get_users_db)
@@ -80,7 +86,7 @@ def list_users(
     try:
         cursor = users_collection.find().skip(skip).limit(limit)
         users = []
-        for user in cursor:
+        async for user in cursor:
             user["_id"] = str(user["_id"])
             users.append(MongoDBUser(**user))
         return users
@@ -89,16 +95,19 @@ def list_users(
 
 
 @router.get("/{user_id}", response_model=MongoDBUser)
-def get_user(
+async def get_user(
     user_id: str,
     users_collection = Depends(get_users_db)
 ):
     """Get a specific user by ID"""
     try:
-        user = users_collection.find_one({"user_id": user_id})
+        user = await users_collection.find_one({"user_id": user_id})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
+        # Count the profile view (buffered, flushed in bulk)
+        counter_buffer.increment(users_collection, user_id, "profile_views", key_field="user_id")
+        
         user["_id"] = str(user["_id"])
         return MongoDBUser(**user)
     except HTTPException:
@@ -108,7 +117,7 @@ def get_user(
 
 
 @router.post("/", response_model=MongoDBUser)
-def create_user(
+async def create_user(
     user_data: dict,
     users_collection = Depends(get_users_db)
 ):
@@ -120,6 +129,7 @@ def create_user(
             "name": user_data.get("name"),
             "role": user_data.get("role", "jobseeker"),
             "skills": user_data.get("skills", []),
+            "skill_keys": skill_keys(user_data.get("skills", [])),
             "experience_years": user_data.get("experience_years"),
             "preferred_job_types": user_data.get("preferred_job_types", []),
             "preferred_locations": user_data.get("preferred_locations", []),
@@ -137,7 +147,7 @@ def create_user(
             "last_active": datetime.utcnow()
         }
         print("[DEBUG] Creating user in MongoDB with user_doc:", user_doc)
-        result = users_collection.insert_one(user_doc)
+        result = await users_collection.insert_one(user_doc)
         user_doc["_id"] = str(result.inserted_id)
         
         return MongoDBUser(**user_doc)
@@ -146,7 +156,7 @@ def create_user(
 
 
 @router.put("/{user_id}", response_model=MongoDBUser)
-def update_user(
+async def update_user(
     user_id: str,
     user_data: dict,
     users_collection = Depends(get_users_db)
@@ -157,17 +167,20 @@ def update_user(
         for field, value in user_data.items():
             if value is not None:
                 update_data[field] = value
+        if isinstance(update_data.get("skills"), list):
+            update_data["skill_keys"] = skill_keys(update_data["skills"])
         
-        result = users_collection.update_one(
+        result = await users_collection.update_one(
             {"user_id": user_id},
             {"$set": update_data}
         )
+        principal_cache.invalidate_user_id(user_id)
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
         
         # Return updated user
-        updated_user = users_collection.find_one({"user_id": user_id})
+        updated_user = await users_collection.find_one({"user_id": user_id})
         updated_user["_id"] = str(updated_user["_id"])
         return MongoDBUser(**updated_user)
     except HTTPException:
@@ -177,13 +190,14 @@ def update_user(
 
 
 @router.delete("/{user_id}")
-def delete_user(
+async def delete_user(
     user_id: str,
     users_collection = Depends(get_users_db)
 ):
     """Delete a user"""
     try:
-        result = users_collection.delete_one({"user_id": user_id})
+        result = await users_collection.delete_one({"user_id": user_id})
+        principal_cache.invalidate_user_id(user_id)
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -1,9 +1,18 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from app.services.drive_client import DriveError
 from app.services.google_drive_service import google_drive_service
-from app.services.pdf_generator import pdf_generator
+from app.services.pdf_renderer import PDFRenderBusy, pdf_renderer
+from app.services.process_pool import WorkerPoolBusy
+from app.services.text_extraction import resume_parser
 import os
+import re
 import json
+import base64
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -37,30 +46,56 @@ router = APIRouter()
 # (All these endpoints depend on SQLAlchemy models that are not available in MongoDB setup)
 
 
+PDF_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _pdf_filename(resume_data: dict) -> str:
+    name = (resume_data.get('personalInfo') or {}).get('name') or 'resume'
+    return f"{name.replace(' ', '_').lower()}_resume.pdf"
+
+
+def _content_disposition(filename: str) -> str:
+    """attachment header with an ASCII fallback and the UTF-8 name (RFC 6266)"""
+    fallback = re.sub(r'[^A-Za-z0-9._-]', '_', filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _iter_chunks(content: bytes):
+    view = memoryview(content)
+    for start in range(0, len(view), PDF_STREAM_CHUNK_SIZE):
+        yield bytes(view[start:start + PDF_STREAM_CHUNK_SIZE])
+
+
 @router.post("/generate-pdf")
 async def generate_resume_pdf(
-    resume_data: dict
+    resume_data: dict,
+    format: str = Query(
+        "binary",
+        pattern="^(binary|base64|hex)$",
+        description="binary streams application/pdf; base64 and hex (deprecated) wrap it in JSON"
+    )
 ):
     """Generate a PDF for the resume from provided data"""
     try:
         logger.info(f"Generating PDF for resume data: {resume_data.keys()}")
         
-        # Generate PDF from resume data
-        pdf_content = pdf_generator.generate_resume_pdf(resume_data)
-        
-        # Create filename
-        name = resume_data.get('personalInfo', {}).get('name', 'resume')
-        filename = f"{name.replace(' ', '_').lower()}_resume.pdf"
+        # Generate PDF from resume data in the render worker pool
+        pdf_content = await pdf_renderer.render_resume(resume_data)
+        filename = _pdf_filename(resume_data)
         
         logger.info(f"PDF generated successfully, filename: {filename}")
         
-        return {
-            "success": True,
-            "message": "PDF generated successfully",
-            "filename": filename,
-            "pdf_content": pdf_content.hex()  # Convert bytes to hex for JSON transmission
-        }
-        
+    except PDFRenderBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "2"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="PDF generation timed out"
+        )
     except Exception as e:
         logger.error(f"Error generating PDF: {e}")
         raise HTTPException(
@@ -68,6 +103,27 @@ async def generate_resume_pdf(
             detail=f"Failed to generate PDF: {str(e)}"
         )
 
+    if format == "binary":
+        return StreamingResponse(
+            _iter_chunks(pdf_content),
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": _content_disposition(filename),
+                "Content-Length": str(len(pdf_content))
+            }
+        )
+
+    response = {
+        "success": True,
+        "message": "PDF generated successfully",
+        "filename": filename
+    }
+    if format == "base64":
+        response["pdf_base64"] = base64.b64encode(pdf_content).decode("ascii")
+    else:
+        response["pdf_content"] = pdf_content.hex()
+    return response
+
 
 @router.get("/test-pdf")
 async def test_pdf_generation():
@@ -87,7 +143,7 @@ async def test_pdf_generation():
     }
     
     try:
-        pdf_content = pdf_generator.generate_resume_pdf(sample_data)
+        pdf_content = await pdf_renderer.render_resume(sample_data)
         return {
             "success": True,
             "message": "Test PDF generated successfully",
@@ -148,16 +204,25 @@ async def parse_google_drive_resume(
         # to download the file using the file_id and access token
         
         file_content = await file.read()
-        
-        # Parse based on file type
-        if mime_type == 'application/pdf':
-            parsed_data = google_drive_service.parse_pdf_content(file_content)
-        elif mime_type == 'application/vnd.openxmlformats-officedocument.wordprocessingml.document':
-            parsed_data = google_drive_service.parse_docx_content(file_content)
-        else:
+        if len(file_content) > 10 * 1024 * 1024:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Unsupported file type"
+                detail="File size must be less than 10MB."
+            )
+        
+        # Parse in the worker pool; identical files are answered from cache
+        try:
+            parsed_data = await resume_parser.parse(file_content, mime_type)
+        except WorkerPoolBusy as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "2"}
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Resume parsing timed out"
             )
         
         return {
@@ -166,6 +231,8 @@ async def parse_google_drive_resume(
             "data": parsed_data
         }
         
+    except HTTPException:
+        raise
     except json.JSONDecodeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -175,4 +242,45 @@ async def parse_google_drive_resume(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to parse resume: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+class GoogleDriveImportRequest(BaseModel):
+    file_id: str
+    access_token: str
+
+
+@router.post("/import-google-drive")
+async def import_google_drive_resume(request: GoogleDriveImportRequest):
+    """Download a resume from Google Drive with the user's access token and parse it"""
+    try:
+        parsed_data = await google_drive_service.process_google_drive_file(request.file_id, request.access_token)
+        return {
+            "success": True,
+            "message": "Resume parsed successfully",
+            "data": parsed_data
+        }
+    except HTTPException:
+        raise
+    except DriveError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": e.retry_after} if e.retry_after else None
+        )
+    except WorkerPoolBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "2"}
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Resume parsing timed out"
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to import resume: {str(e)}"
+        )
@@ -4,6 +4,10 @@ from datetime import datetime
 import os
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
+from app.services.job_cache import job_cache
+from app.services.counters import counter_buffer
+from app.services.job_search import job_search
+from app.services.task_queue import task_queue
 
 router = APIRouter()
 
@@ -35,6 +39,8 @@ async def shutdown_event():
     """Close MongoDB connection on shutdown"""
     global client
     if client:
+        # Write out buffered counters before the client they target goes away
+        await counter_buffer.flush()
         client.close()
         print("🔌 MongoDB connection closed")
 
@@ -47,7 +53,7 @@ async def list_jobs(
     job_type: Optional[str] = Query(None, description="Filter by job type")
 ):
     """List all published jobs with pagination and filters"""
-    try:
+    async def load_jobs():
         # Build query
         query = {"status": "published"}
         if location:
@@ -74,6 +80,13 @@ async def list_jobs(
             "limit": limit,
             "pages": (total + limit - 1) // limit
         }
+    
+    try:
+        return await job_cache.get_listing(
+            "simple:list",
+            {"page": page, "limit": limit, "location": location, "job_type": job_type},
+            load_jobs
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -84,21 +97,23 @@ async def list_jobs(
 @router.get("/{job_id}", response_model=Dict[str, Any])
 async def get_job(job_id: str):
     """Get a specific job by ID"""
-    try:
+    async def load_job():
         job = await db.jobs.find_one({"_id": ObjectId(job_id)})
+        if job:
+            job["_id"] = str(job["_id"])
+        return job
+    
+    try:
+        job = await job_cache.get_job(job_id, load_job)
         if not job:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
             )
         
-        # Increment view count
-        await db.jobs.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$inc": {"views_count": 1}}
-        )
+        # Increment view count (buffered, flushed in bulk)
+        counter_buffer.increment(db.jobs, job_id, "views_count")
         
-        job["_id"] = str(job["_id"])
         return job
     except HTTPException:
         raise
@@ -123,6 +138,8 @@ async def create_job(job_data: Dict[str, Any]):
         
         result = await db.jobs.insert_one(job_data)
         job_data["_id"] = str(result.inserted_id)
+        await job_cache.invalidate_listings()
+        job_search.upsert(job_data)
         
         return job_data
     except Exception as e:
@@ -153,9 +170,12 @@ async def publish_job(job_id: str):
                 detail="Job not found"
             )
         
+        await job_cache.invalidate_job(job_id)
+        
         # Get updated job
         job = await db.jobs.find_one({"_id": ObjectId(job_id)})
         job["_id"] = str(job["_id"])
+        job_search.upsert(job)
         return job
     except HTTPException:
         raise
@@ -171,7 +191,7 @@ async def get_featured_jobs(
     limit: int = Query(10, ge=1, le=50, description="Number of featured jobs")
 ):
     """Get featured jobs"""
-    try:
+    async def load_jobs():
         cursor = db.jobs.find({
             "status": "published",
             "is_featured": True
@@ -183,6 +203,9 @@ async def get_featured_jobs(
             jobs.append(job)
         
         return jobs
+    
+    try:
+        return await job_cache.get_listing("simple:featured", {"limit": limit}, load_jobs)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -195,7 +218,7 @@ async def get_recent_jobs(
     limit: int = Query(20, ge=1, le=100, description="Number of recent jobs")
 ):
     """Get recent published jobs"""
-    try:
+    async def load_jobs():
         cursor = db.jobs.find({
             "status": "published"
         }).sort("published_at", -1).limit(limit)
@@ -206,6 +229,9 @@ async def get_recent_jobs(
             jobs.append(job)
         
         return jobs
+    
+    try:
+        return await job_cache.get_listing("simple:recent", {"limit": limit}, load_jobs)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -254,18 +280,16 @@ async def apply_to_job(job_id: str, application_data: Dict[str, Any]):
         
         print(f"✅ Application created successfully: {result.inserted_id}")
         
-        # Increment applications count for the job
-        await db.jobs.update_one(
-            {"_id": ObjectId(job_id)},
-            {"$inc": {"applications_count": 1}}
-        )
+        # Increment applications count for the job (buffered, flushed in bulk)
+        counter_buffer.increment(db.jobs, job_id, "applications_count")
         
         print(f"📊 Updated applications count for job: {job_id}")
         
         # Send notification to employer about new application
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_new_application_notification(
+            await task_queue.enqueue(
+                "notifications.new_application",
+                idempotency_key=f"new_application:{result.inserted_id}",
                 employer_id=job.get("employer_id"),
                 applicant_name=application_data.get("applicant_name", "Applicant"),
                 job_title=job.get("title", "Job"),
@@ -406,11 +430,12 @@ async def update_application_status(
         
         # Send notification to job seeker about status change
         try:
-            from app.services.notification_service import notification_service
-            await notification_service.create_status_update_notification(
+            await task_queue.enqueue(
+                "notifications.application_status",
                 applicant_id=application.get("applicant_id"),
                 status=new_status,
                 job_title=application.get("job_title", "Job"),
+                company_name=application.get("company_name"),
                 job_id=application.get("job_id"),
                 application_id=application_id
             )
@@ -436,64 +461,41 @@ async def get_applications_by_email(email: str):
     try:
         print(f"Fetching applications for email: {email}")
         
-        # First, let's check what collections exist and what's in them
-        collections = await db.list_collection_names()
-        print(f"Available collections: {collections}")
+        # One round trip: match both application collections on the indexed
+        # applicant_email field and join each application with its job
+        match_stage = {"$match": {"applicant_email": email}}
+        pipeline = [
+            match_stage,
+            {"$unionWith": {"coll": "applications", "pipeline": [match_stage]}},
+            {"$sort": {"created_at": -1}},
+            {"$lookup": {
+                "from": "jobs",
+                "let": {"job_oid": {"$convert": {
+                    "input": "$job_id", "to": "objectId", "onError": None, "onNull": None
+                }}},
+                "pipeline": [
+                    {"$match": {"$expr": {"$eq": ["$_id", "$$job_oid"]}}},
+                    {"$project": {"title": 1, "company_name": 1}}
+                ],
+                "as": "job"
+            }},
+            {"$set": {"job": {"$arrayElemAt": ["$job", 0]}}},
+            {"$set": {
+                "job_id": {"$toString": "$job_id"},
+                "job_title": {"$cond": [
+                    {"$ifNull": ["$job", False]},
+                    {"$ifNull": ["$job.title", "Unknown Job"]},
+                    "Job Not Found"
+                ]},
+                "company_name": {"$ifNull": ["$job.company_name", "Unknown Company"]}
+            }},
+            {"$project": {"job": 0}}
+        ]
         
-        # Try to find applications in different possible collections
         applications = []
-        
-        # Try job_applications collection first
-        try:
-            cursor = db.job_applications.find({"applicant_email": email})
-            async for app in cursor:
-                app["_id"] = str(app["_id"])
-                app["job_id"] = str(app["job_id"])
-                applications.append(app)
-            print(f"Found {len(applications)} applications in job_applications collection")
-        except Exception as e:
-            print(f"Error searching job_applications collection: {e}")
-        
-        # If no applications found, try applications collection
-        if len(applications) == 0:
-            try:
-                cursor = db.applications.find({"applicant_email": email})
-                async for app in cursor:
-                    app["_id"] = str(app["_id"])
-                    app["job_id"] = str(app["job_id"])
-                    applications.append(app)
-                print(f"Found {len(applications)} applications in applications collection")
-            except Exception as e:
-                print(f"Error searching applications collection: {e}")
-        
-        # If still no applications, try a broader search
-        if len(applications) == 0:
-            try:
-                # Search for any document containing this email
-                cursor = db.job_applications.find({})
-                async for app in cursor:
-                    if app.get("applicant_email") == email:
-                        app["_id"] = str(app["_id"])
-                        app["job_id"] = str(app["job_id"])
-                        applications.append(app)
-                print(f"Found {len(applications)} applications in broad search")
-            except Exception as e:
-                print(f"Error in broad search: {e}")
-        
-        # Get job details for each application
-        for app in applications:
-            try:
-                job = await db.jobs.find_one({"_id": ObjectId(app["job_id"])})
-                if job:
-                    app["job_title"] = job.get("title", "Unknown Job")
-                    app["company_name"] = job.get("company_name", "Unknown Company")
-                else:
-                    app["job_title"] = "Job Not Found"
-                    app["company_name"] = "Unknown Company"
-            except Exception as jobError:
-                print(f"Error fetching job details for {app['job_id']}: {jobError}")
-                app["job_title"] = "Job Not Found"
-                app["company_name"] = "Unknown Company"
+        async for app in db.job_applications.aggregate(pipeline):
+            app["_id"] = str(app["_id"])
+            applications.append(app)
         
         print(f"Final result: Found {len(applications)} applications for {email}")
         return applications
@@ -1,11 +1,20 @@
 import os
-import uuid
+import hashlib
 import logging
+import aiofiles
+import aiofiles.os
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status, UploadFile, File
+from fastapi.responses import RedirectResponse
+from bson import ObjectId
+from pydantic import BaseModel, Field
 from app.db.database import get_users_collection
 from app.api.deps import get_current_user
 from app.schemas.mongodb_schemas import MongoDBUser as User
+from app.services.principal_cache import principal_cache
+from app.services.avatar_variants import avatar_variants
+from app.services.blob_store import blob_store
+from app.services.storage import storage
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -25,6 +34,7 @@ ALLOWED_VIDEO_TYPES = {"video/mp4", "video/webm", "video/quicktime"}
 ALLOWED_AUDIO_TYPES = {"audio/mpeg", "audio/wav", "audio/webm", "audio/mp4"}
 
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 256 * 1024  # 256KB
 
 
 def validate_file_size(file: UploadFile):
@@ -36,29 +46,65 @@ def validate_file_size(file: UploadFile):
         )
 
 
-def save_file(file: UploadFile, directory: str) -> str:
-    """Save uploaded file and return the file path"""
+async def save_file(
+    file: UploadFile,
+    directory: str,
+    max_size: int = MAX_FILE_SIZE,
+    owner: Optional[str] = None
+) -> dict:
+    """Stream an upload into the blob store and return its URL, size and SHA-256.
+
+    The size limit is enforced while copying, so an oversized upload is
+    rejected after max_size bytes instead of being read whole; memory use
+    stays at one chunk whatever the file size. Content that is already
+    stored is not written again. directory is kept for logging only; owner
+    is the uploading user, recorded as holding the content.
+    """
+    file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
+    partial_path = blob_store.temp_path(file_extension)
+    
+    digest = hashlib.sha256()
+    size = 0
     try:
-        # Generate unique filename
-        file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = os.path.join(UPLOAD_DIR, directory, unique_filename)
-        
-        # Save file
-        with open(file_path, "wb") as buffer:
-            content = file.file.read()
-            buffer.write(content)
-        
-        logger.info(f"File saved successfully: {file_path}")
-        
-        # Return relative path for URL
-        return f"/{file_path}"
+        async with aiofiles.open(partial_path, "wb") as buffer:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail=f"File size too large. Maximum size is {max_size // (1024*1024)}MB"
+                    )
+                digest.update(chunk)
+                await buffer.write(chunk)
+        saved = await blob_store.commit(
+            partial_path, digest.hexdigest(), size, file_extension, file.content_type, owner
+        )
+    except HTTPException:
+        await _remove_quietly(partial_path)
+        raise
     except Exception as e:
+        await _remove_quietly(partial_path)
         logger.error(f"Error saving file: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save file"
         )
+    
+    logger.info(
+        f"File saved successfully ({directory}): {saved['url']} ({size} bytes"
+        f"{', deduplicated' if saved['deduplicated'] else ''})"
+    )
+    return saved
+
+
+async def _remove_quietly(path: str):
+    try:
+        await aiofiles.os.remove(path)
+    except OSError:
+        pass
 
 
 @router.post("/test")
@@ -67,8 +113,28 @@ async def test_upload():
     return {"message": "Upload endpoint is working", "status": "ok"}
 
 
+async def _set_avatar(current_user: User, saved: dict, background_tasks: BackgroundTasks) -> bool:
+    """Point the user at a stored avatar and resize it in the background; False if the user is gone"""
+    if current_user.avatar_url == saved["url"] and current_user.avatar_variants:
+        return True
+    users_collection = get_users_collection()
+    result = await users_collection.update_one(
+        {"email": current_user.email},
+        {"$set": {"avatar_url": saved["url"]}, "$unset": {"avatar_variants": ""}}
+    )
+    principal_cache.invalidate(current_user.email)
+    if result.matched_count == 0:
+        return False
+    if current_user.avatar_url != saved["url"]:
+        await blob_store.release(current_user.avatar_url)
+    await avatar_variants.release(current_user.avatar_variants)
+    background_tasks.add_task(avatar_variants.generate, current_user.email, saved["url"], saved["key"])
+    return True
+
+
 @router.post("/avatar")
 async def upload_avatar(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -104,16 +170,11 @@ async def upload_avatar(
     
     try:
         # Save file
-        avatar_url = save_file(file, "avatars")
+        saved = await save_file(file, "avatars", owner=str(current_user.id))
+        avatar_url = saved["url"]
         
-        # Update user avatar URL in MongoDB
-        users_collection = get_users_collection()
-        result = await users_collection.update_one(
-            {"email": current_user.email},
-            {"$set": {"avatar_url": avatar_url}}
-        )
-        
-        if result.matched_count == 0:
+        # Update user avatar URL in MongoDB; resized variants follow in the background
+        if not await _set_avatar(current_user, saved, background_tasks):
             logger.error(f"User not found in database: {current_user.email}")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -121,7 +182,7 @@ async def upload_avatar(
             )
         
         logger.info(f"Avatar uploaded successfully for user: {current_user.email}")
-        return {"avatar_url": avatar_url}
+        return {"avatar_url": avatar_url, "size": saved["size"], "sha256": saved["sha256"]}
         
     except HTTPException:
         raise
@@ -134,7 +195,7 @@ async def upload_avatar(
 
 
 @router.post("/resume")
-def upload_resume(
+async def upload_resume(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -151,10 +212,12 @@ def upload_resume(
     
     try:
         # Save file
-        resume_url = save_file(file, "resumes")
+        saved = await save_file(file, "resumes", owner=str(current_user.id))
         
-        return {"resume_url": resume_url}
+        return {"resume_url": saved["url"], "size": saved["size"], "sha256": saved["sha256"]}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -163,7 +226,7 @@ def upload_resume(
 
 
 @router.post("/video")
-def upload_video(
+async def upload_video(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -180,10 +243,12 @@ def upload_video(
     
     try:
         # Save file
-        video_url = save_file(file, "videos")
+        saved = await save_file(file, "videos", owner=str(current_user.id))
         
-        return {"video_url": video_url}
+        return {"video_url": saved["url"], "size": saved["size"], "sha256": saved["sha256"]}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -192,7 +257,7 @@ def upload_video(
 
 
 @router.post("/audio")
-def upload_audio(
+async def upload_audio(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user)
 ):
@@ -209,12 +274,154 @@ def upload_audio(
     
     try:
         # Save file
-        audio_url = save_file(file, "audio")
+        saved = await save_file(file, "audio", owner=str(current_user.id))
         
-        return {"voice_url": audio_url}
+        return {"voice_url": saved["url"], "size": saved["size"], "sha256": saved["sha256"]}
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload audio"
-        )
\ No newline at end of file
+        )
+
+
+UPLOAD_KINDS = {
+    "avatar": (ALLOWED_IMAGE_TYPES, "avatar_url"),
+    "resume": (ALLOWED_DOCUMENT_TYPES, "resume_url"),
+    "video": (ALLOWED_VIDEO_TYPES, "video_url"),
+    "audio": (ALLOWED_AUDIO_TYPES, "voice_url"),
+}
+
+
+class DirectUploadRequest(BaseModel):
+    kind: str
+    filename: str
+    content_type: str
+    size: int = Field(..., gt=0)
+    sha256: str = Field(..., pattern="^[0-9a-f]{64}$")
+
+
+def _validate_direct_upload(request: DirectUploadRequest) -> str:
+    """Check kind, type and size of a direct upload and return its field name"""
+    if request.kind not in UPLOAD_KINDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid upload kind. Allowed kinds: {', '.join(UPLOAD_KINDS)}"
+        )
+    allowed_types, field = UPLOAD_KINDS[request.kind]
+    if request.content_type not in allowed_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}"
+        )
+    if request.size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File size too large. Maximum size is {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+    return field
+
+
+async def _registered_upload(
+    request: DirectUploadRequest,
+    saved: dict,
+    current_user: User,
+    background_tasks: BackgroundTasks
+) -> dict:
+    """Response for a stored direct upload; avatars are also set on the user like /avatar does"""
+    field = UPLOAD_KINDS[request.kind][1]
+    if request.kind == "avatar":
+        await _set_avatar(current_user, saved, background_tasks)
+    return {field: saved["url"], "size": saved["size"], "sha256": saved["sha256"]}
+
+
+@router.post("/direct")
+async def start_direct_upload(
+    request: DirectUploadRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Get a presigned URL to upload a file straight to object storage.
+
+    If this user has stored the same content before, it is registered right
+    away and no upload is needed.
+    """
+    _validate_direct_upload(request)
+    extension = os.path.splitext(request.filename)[1]
+    owner = str(current_user.id)
+    try:
+        target = await blob_store.direct_upload(request.sha256, request.size, extension, request.content_type, owner)
+    except Exception as e:
+        logger.error(f"Direct upload setup failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error preparing upload: {str(e)}")
+    
+    if target is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Direct uploads need the S3 storage backend; POST the file to /upload/{request.kind} instead"
+        )
+    if not target["exists"]:
+        return {"upload": target["upload"], "key": target["key"]}
+    
+    try:
+        saved = await blob_store.register(request.sha256, request.size, extension, request.content_type, owner)
+    except Exception as e:
+        logger.error(f"Direct upload registration failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error registering upload: {str(e)}")
+    
+    if saved is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Stored file size does not match"
+        )
+    return {"upload": None, **await _registered_upload(request, saved, current_user, background_tasks)}
+
+
+@router.post("/direct/complete")
+async def complete_direct_upload(
+    request: DirectUploadRequest,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user)
+):
+    """Register a file the client uploaded with a presigned URL"""
+    _validate_direct_upload(request)
+    extension = os.path.splitext(request.filename)[1]
+    try:
+        saved = await blob_store.register(
+            request.sha256, request.size, extension, request.content_type, str(current_user.id)
+        )
+    except Exception as e:
+        logger.error(f"Direct upload completion failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error completing upload: {str(e)}")
+    
+    if saved is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Uploaded file not found or size does not match"
+        )
+    return await _registered_upload(request, saved, current_user, background_tasks)
+
+
+@router.get("/files/{key:path}")
+async def get_file(key: str):
+    """Redirect to a short-lived download URL for a stored file"""
+    if not key.startswith(f"{blob_store.PREFIX}/") or ".." in key:
+        raise HTTPException(status_code=404, detail="File not found")
+    return RedirectResponse(storage.download_url(key))
+
+
+@router.get("/avatar/{user_id}")
+async def get_avatar(
+    user_id: str,
+    size: int = Query(128, gt=0, le=2048, description="Displayed size in px; the smallest variant at least this big is used"),
+    format: str = Query("webp", pattern="^(webp|jpeg)$")
+):
+    """Redirect to the best fitting resized avatar of a user"""
+    query = {"$or": [{"user_id": user_id}, {"_id": ObjectId(user_id)}]} if ObjectId.is_valid(user_id) else {"user_id": user_id}
+    user = await get_users_collection().find_one(query, {"avatar_url": 1, "avatar_variants": 1})
+    url = avatar_variants.pick(user, size, format) if user else None
+    if not url:
+        raise HTTPException(status_code=404, detail="Avatar not found")
+    return RedirectResponse(url)
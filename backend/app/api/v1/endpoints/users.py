@@ -10,17 +10,16 @@ from typing import Dict
 import random
 import time
 from datetime import datetime, timedelta
-from twilio.rest import Client
 from app.core.config import settings
+from app.services.password_hasher import PasswordHasherBusy, password_hasher
+from app.services.task_queue import task_queue
+import app.services.tasks  # noqa: F401  (registers the sms.send task)
 
 router = APIRouter()
 
 # In-memory store for OTPs with expiry (for demo only - use Redis in production)
 otp_store: Dict[str, Dict[str, any]] = {}
 
-# Initialize Twilio client
-twilio_client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
-
 class SendOtpRequest(BaseModel):
     phone: str
 
@@ -37,14 +36,14 @@ def get_current_user_profile(
 
 
 @router.put("/me", response_model=UserResponse)
-def update_current_user_profile(
+async def update_current_user_profile(
     user_data: UserUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update current user profile"""
     try:
-        updated_user = update_user(db, user_id=current_user.id, user_data=user_data)
+        updated_user = await update_user(db, user_id=current_user.id, user_data=user_data)
         if not updated_user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -64,26 +63,25 @@ class ChangePasswordRequest(BaseModel):
     new_password: str
 
 @router.post("/change-password")
-def change_password(
+async def change_password(
     password_data: ChangePasswordRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Change user password"""
-    import bcrypt
     from app.crud.user import update_user_password
     
     try:
         # Verify current password - MongoDB stores it as "password" field
-        if not bcrypt.checkpw(password_data.current_password.encode("utf-8"), current_user.password.encode("utf-8")):
+        if not await password_hasher.verify(password_data.current_password, current_user.password):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Incorrect current password"
             )
         
         # Update password - MongoDB stores it as "password" field
-        hashed_password = bcrypt.hashpw(password_data.new_password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
-        success = update_user_password(db, user_id=current_user.id, hashed_password=hashed_password)
+        hashed_password = await password_hasher.hash(password_data.new_password)
+        success = await update_user_password(db, user_id=current_user.id, hashed_password=hashed_password)
         
         if not success:
             raise HTTPException(
@@ -92,6 +90,12 @@ def change_password(
             )
         
         return {"message": "Password updated successfully"}
+    except PasswordHasherBusy as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"}
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -103,7 +107,7 @@ def change_password(
 
 
 @router.delete("/me")
-def delete_current_user_account(
+async def delete_current_user_account(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -111,7 +115,7 @@ def delete_current_user_account(
     from app.crud.user import deactivate_user
     
     try:
-        success = deactivate_user(db, user_id=current_user.id)
+        success = await deactivate_user(db, user_id=current_user.id)
         if not success:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -161,11 +165,12 @@ async def send_otp(data: SendOtpRequest):
             "attempts": 0
         }
         
-        # Send SMS via Twilio
-        message = twilio_client.messages.create(
-            body=f"Your SkillGlide verification code is: {otp}. Valid for {settings.OTP_EXPIRY_MINUTES} minutes.",
-            from_=settings.TWILIO_PHONE_NUMBER,
-            to=data.phone
+        # Send SMS via Twilio from the task queue; the code is valid before it arrives
+        task_id = await task_queue.enqueue(
+            "sms.send",
+            idempotency_key=f"otp:{data.phone}:{otp}",
+            to=data.phone,
+            body=f"Your SkillGlide verification code is: {otp}. Valid for {settings.OTP_EXPIRY_MINUTES} minutes."
         )
         
         print(f"OTP sent to {data.phone}: {otp}")  # For debugging
@@ -173,7 +178,7 @@ async def send_otp(data: SendOtpRequest):
         return {
             "success": True, 
             "message": f"OTP sent to {data.phone}",
-            "message_sid": message.sid
+            "task_id": task_id
         }
         
     except Exception as e:
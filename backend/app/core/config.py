@@ -37,16 +37,102 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     MAIL_FROM_NAME: str = "SkillGlide"
+    MAIL_USE_TLS: bool = False  # implicit TLS (port 465)
+    MAIL_START_TLS: bool = True  # require STARTTLS when not using implicit TLS; a server without it fails to connect
+    MAIL_POOL_SIZE: int = 3
+    MAIL_RATE_PER_SECOND: float = 10.0
+    MAIL_MAX_MESSAGES_PER_CONNECTION: int = 100
+    MAIL_CONNECTION_IDLE_SECONDS: float = 60.0
+    MAIL_TIMEOUT_SECONDS: float = 30.0
+    EMAIL_APP_URL: str = "http://localhost:3000"  # base for links in emails
+    EMAIL_DEFAULT_LOCALE: str = "en"  # templates at the top of app/templates/email
+    EMAIL_FRAGMENT_CACHE_SIZE: int = 5000  # rendered fragments (e.g. job cards) kept per process
     
     # File Storage
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
     AWS_BUCKET_NAME: Optional[str] = None
     AWS_REGION: str = "us-east-1"
+    STORAGE_BACKEND: str = "local"  # local | s3
+    S3_ENDPOINT_URL: Optional[str] = None  # e.g. http://localhost:9000 for MinIO/LocalStack
+    S3_PUBLIC_BASE_URL: Optional[str] = None  # CDN or public bucket URL; None serves via presigned redirects
+    STORAGE_URL_EXPIRE_SECONDS: int = 900
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
-    
+
+    # Cache
+    CACHE_BACKEND: str = "memory"  # memory | redis
+    CACHE_MAX_ENTRIES: int = 10000
+    JOB_CACHE_TTL_SECONDS: int = 300
+    JOB_LISTING_CACHE_TTL_SECONDS: int = 30
+
+    # Write-behind counters
+    COUNTER_FLUSH_INTERVAL_SECONDS: float = 5.0
+    COUNTER_MAX_PENDING: int = 1000
+
+    # Job search index
+    SEARCH_INDEX_REFRESH_SECONDS: int = 300
+
+    # Authenticated user cache
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+
+    # Password hashing pool (0 = min(4, CPU count))
+    PASSWORD_HASH_WORKERS: int = 0
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Upload blob store garbage collection
+    BLOB_GC_GRACE_SECONDS: int = 86400
+    BLOB_GC_INTERVAL_SECONDS: int = 21600
+
+    # Resized avatar variants
+    AVATAR_VARIANT_SIZES: List[int] = [64, 128, 256]
+    AVATAR_VARIANT_QUALITY: int = 82
+    AVATAR_MAX_PIXELS: int = 40_000_000
+
+    # Rendered resume PDF cache (disk tier off when PDF_CACHE_DISK_BYTES is 0)
+    PDF_CACHE_DIR: str = "cache/pdf"  # relative to the backend directory, or absolute
+    PDF_CACHE_MEMORY_BYTES: int = 32 * 1024 * 1024
+    PDF_CACHE_DISK_BYTES: int = 512 * 1024 * 1024
+    PDF_CACHE_DISK_TTL_SECONDS: int = 86400  # cached files contain personal data; deleted after this
+
+    # PDF rendering worker processes (0 = min(2, CPU count))
+    PDF_RENDER_WORKERS: int = 0
+    PDF_RENDER_MAX_PENDING: int = 32
+    PDF_RENDER_TIMEOUT_SECONDS: float = 20.0
+    PDF_RENDER_QUEUE_TIMEOUT_SECONDS: float = 10.0
+
+    # Uploaded resume parsing (0 workers = min(2, CPU count))
+    RESUME_PARSE_WORKERS: int = 0
+    RESUME_PARSE_MAX_PENDING: int = 16
+    RESUME_PARSE_TIMEOUT_SECONDS: float = 30.0
+    RESUME_PARSE_QUEUE_TIMEOUT_SECONDS: float = 30.0
+    RESUME_PARSE_MAX_PAGES: int = 20
+    RESUME_PARSE_MAX_CHARS: int = 200_000
+    RESUME_PARSE_CACHE_ENTRIES: int = 1024
+
+    # Google Drive API (override the URL to point at a local fake in tests)
+    GOOGLE_DRIVE_API_URL: str = "https://www.googleapis.com"
+    GOOGLE_DRIVE_MAX_DOWNLOAD_BYTES: int = 10 * 1024 * 1024
+    GOOGLE_DRIVE_TIMEOUT_SECONDS: float = 30.0
+
+    # Background tasks (email, SMS, notifications)
+    TASK_QUEUE_BACKEND: str = "memory"  # memory | redis
+    TASK_QUEUE_WORKERS: int = 4  # per API process; 0 leaves the queue to `python -m app.worker`
+    TASK_WORKER_CONCURRENCY: int = 16  # consumers in `python -m app.worker`
+    TASK_MAX_RETRIES: int = 5
+    TASK_RETRY_BASE_SECONDS: float = 2.0
+    TASK_RETRY_MAX_SECONDS: float = 300.0
+    TASK_TIMEOUT_SECONDS: float = 60.0
+    TASK_IDEMPOTENCY_TTL_SECONDS: int = 86400
+    TASK_DEAD_LETTER_LIMIT: int = 1000
+
+    # Notification fan-out (recipients per users lookup and per insert_many)
+    NOTIFICATION_FANOUT_BATCH_SIZE: int = 500
+    NOTIFICATION_FANOUT_TIMEOUT_SECONDS: float = 900.0  # per fan-out task; retries resume where it stopped
+
     # Environment
     ENVIRONMENT: str = "development"
     DEBUG: bool = True
@@ -1,6 +1,10 @@
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
-from jose import jwt, JWTError
+from functools import lru_cache
+from typing import Any, Dict, Union, Optional
+from jose import jwk, jwt, JWTError
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from app.core.config import settings
@@ -8,6 +12,58 @@ from app.core.config import settings
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Decoded access tokens by token string, so repeat requests skip signature checks
+_token_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
+
+
+@lru_cache(maxsize=8)
+def get_signing_key(secret: str, algorithm: str):
+    """Build the JWT key object once instead of on every encode/decode"""
+    return jwk.construct(secret, algorithm)
+
+
+def decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT and return its claims, or None if it is invalid or expired.
+
+    Verified claims are kept in an LRU keyed by the token; cached entries are
+    still checked against their exp claim.
+    """
+    with _token_cache_lock:
+        claims = _token_cache.get(token)
+        if claims is not None:
+            if claims.get("exp") is not None and claims["exp"] <= time.time():
+                del _token_cache[token]
+                return None
+            _token_cache.move_to_end(token)
+            _token_cache_stats["hits"] += 1
+            return claims
+        _token_cache_stats["misses"] += 1
+
+    try:
+        claims = jwt.decode(
+            token, get_signing_key(settings.SECRET_KEY, settings.ALGORITHM), algorithms=[settings.ALGORITHM]
+        )
+    except JWTError:
+        return None
+
+    with _token_cache_lock:
+        _token_cache[token] = claims
+        while len(_token_cache) > settings.TOKEN_CACHE_MAX_ENTRIES:
+            _token_cache.popitem(last=False)
+    return claims
+
+
+def token_cache_stats() -> Dict[str, Any]:
+    """Hit/miss counters of the decoded token cache"""
+    lookups = _token_cache_stats["hits"] + _token_cache_stats["misses"]
+    return {
+        "entries": len(_token_cache),
+        **_token_cache_stats,
+        "hit_rate": round(_token_cache_stats["hits"] / lookups, 4) if lookups else 0.0
+    }
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
@@ -21,7 +77,9 @@ def create_access_token(
         )
     
     to_encode = {"exp": expire, "sub": str(subject), "type": "access"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(
+        to_encode, get_signing_key(settings.SECRET_KEY, settings.ALGORITHM), algorithm=settings.ALGORITHM
+    )
     return encoded_jwt
 
 
@@ -29,24 +87,23 @@ def create_refresh_token(subject: Union[str, Any]) -> str:
     """Create JWT refresh token"""
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode = {"exp": expire, "sub": str(subject), "type": "refresh"}
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(
+        to_encode, get_signing_key(settings.SECRET_KEY, settings.ALGORITHM), algorithm=settings.ALGORITHM
+    )
     return encoded_jwt
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[str]:
     """Verify JWT token and return subject"""
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        user_id: str = payload.get("sub")
-        token_type_payload: str = payload.get("type")
-        
-        if user_id is None or token_type_payload != token_type:
-            return None
-        return user_id
-    except JWTError:
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    user_id: str = payload.get("sub")
+    token_type_payload: str = payload.get("type")
+    
+    if user_id is None or token_type_payload != token_type:
         return None
+    return user_id
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
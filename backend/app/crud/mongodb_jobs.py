@@ -1,4 +1,5 @@
 from typing import List, Optional, Dict, Any
+import re
 from datetime import datetime
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorCollection
@@ -7,6 +8,9 @@ from app.schemas.mongodb_schemas import (
     MongoDBJob, MongoDBJobApplication, JobCreateRequest, 
     JobUpdateRequest, JobSearchRequest, JobStatus, ApplicationStatus
 )
+from app.services.job_cache import job_cache
+from app.services.counters import counter_buffer
+from app.services.job_search import job_search
 import logging
 
 logger = logging.getLogger(__name__)
@@ -47,24 +51,41 @@ class MongoDBJobCRUD:
             
             result = await self._get_jobs_collection().insert_one(job_dict)
             job_dict["_id"] = str(result.inserted_id)
+            await job_cache.invalidate_listings()
+            job_search.upsert(job_dict)
             
             return MongoDBJob(**job_dict)
         except Exception as e:
             logger.error(f"Error creating job: {e}")
             raise
     
+    async def _load_job_doc(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Load a raw job document from MongoDB"""
+        job_doc = await self._get_jobs_collection().find_one({"_id": ObjectId(job_id)})
+        if job_doc:
+            job_doc["_id"] = str(job_doc["_id"])
+        return job_doc
+    
     async def get_job_by_id(self, job_id: str) -> Optional[MongoDBJob]:
         """Get a job by ID"""
         try:
-            job_doc = await self.jobs_collection.find_one({"_id": ObjectId(job_id)})
+            job_doc = await job_cache.get_job(job_id, lambda: self._load_job_doc(job_id))
             if job_doc:
-                job_doc["_id"] = str(job_doc["_id"])
                 return MongoDBJob(**job_doc)
             return None
         except Exception as e:
             logger.error(f"Error getting job by ID: {e}")
             raise
     
+    async def _reindex_job(self, job_id: str) -> Optional[MongoDBJob]:
+        """Reload a changed job and refresh its search index entry"""
+        job = await self.get_job_by_id(job_id)
+        if job:
+            job_search.upsert(job.dict(by_alias=True))
+        else:
+            job_search.remove(job_id)
+        return job
+    
     async def get_jobs_by_employer(self, employer_id: str, skip: int = 0, limit: int = 20) -> List[MongoDBJob]:
         """Get all jobs by an employer"""
         try:
@@ -91,13 +112,14 @@ class MongoDBJobCRUD:
             if update_data.get("status") == JobStatus.PUBLISHED:
                 update_data["published_at"] = datetime.utcnow()
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await job_cache.invalidate_job(job_id)
+                return await self._reindex_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error updating job: {e}")
@@ -106,7 +128,10 @@ class MongoDBJobCRUD:
     async def delete_job(self, job_id: str) -> bool:
         """Delete a job posting"""
         try:
-            result = await self.jobs_collection.delete_one({"_id": ObjectId(job_id)})
+            result = await self._get_jobs_collection().delete_one({"_id": ObjectId(job_id)})
+            if result.deleted_count > 0:
+                await job_cache.invalidate_job(job_id)
+                job_search.remove(job_id)
             return result.deleted_count > 0
         except Exception as e:
             logger.error(f"Error deleting job: {e}")
@@ -121,13 +146,14 @@ class MongoDBJobCRUD:
                 "updated_at": datetime.utcnow()
             }
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await job_cache.invalidate_job(job_id)
+                return await self._reindex_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error publishing job: {e}")
@@ -141,29 +167,96 @@ class MongoDBJobCRUD:
                 "updated_at": datetime.utcnow()
             }
             
-            result = await self.jobs_collection.update_one(
+            result = await self._get_jobs_collection().update_one(
                 {"_id": ObjectId(job_id)},
                 {"$set": update_data}
             )
             
             if result.modified_count > 0:
-                return await self.get_job_by_id(job_id)
+                await job_cache.invalidate_job(job_id)
+                return await self._reindex_job(job_id)
             return None
         except Exception as e:
             logger.error(f"Error closing job: {e}")
             raise
     
-    async def search_jobs(self, search_request: JobSearchRequest) -> Dict[str, Any]:
-        """Search jobs with filters"""
+    FACET_FIELDS = ("job_type", "work_mode", "experience_level", "location")
+    FACET_LIMIT = 20
+    SALARY_BUCKET_BOUNDARIES = [0, 300000, 600000, 1000000, 1500000, 2500000, 5000000, 1000000000]
+    
+    def _facet_stages(self) -> Dict[str, List[Dict[str, Any]]]:
+        """$facet sub-pipelines counting matches per facet value and salary bucket"""
+        stages = {
+            field: [{"$sortByCount": f"${field}"}, {"$limit": self.FACET_LIMIT}]
+            for field in self.FACET_FIELDS
+        }
+        stages["salary"] = [{
+            "$bucket": {
+                "groupBy": "$salary_min",
+                "boundaries": self.SALARY_BUCKET_BOUNDARIES,
+                "default": "unspecified",
+                "output": {"count": {"$sum": 1}}
+            }
+        }]
+        return stages
+    
+    def _format_facets(self, raw: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Turn raw $facet output into {field: [{value, count}]}"""
+        facets = {
+            field: [
+                {"value": bucket["_id"], "count": bucket["count"]}
+                for bucket in raw.get(field, []) if bucket["_id"] is not None
+            ]
+            for field in self.FACET_FIELDS
+        }
+        upper_bounds = dict(zip(self.SALARY_BUCKET_BOUNDARIES, self.SALARY_BUCKET_BOUNDARIES[1:]))
+        facets["salary"] = [
+            {"min": bucket["_id"], "max": upper_bounds.get(bucket["_id"]), "count": bucket["count"]}
+            if bucket["_id"] != "unspecified" else {"value": "unspecified", "count": bucket["count"]}
+            for bucket in raw.get("salary", [])
+        ]
+        return facets
+    
+    async def _load_search_page(
+        self,
+        query: Dict[str, Any],
+        sort: Dict[str, int],
+        skip: int,
+        limit: int,
+        include_facets: bool
+    ) -> Dict[str, Any]:
+        """One page of raw job documents, the total and optionally facets, from one aggregation"""
+        facet = {
+            "results": [{"$sort": sort}, {"$skip": skip}, {"$limit": limit}],
+            "total": [{"$count": "count"}]
+        }
+        if include_facets:
+            facet.update(self._facet_stages())
+        cursor = self._get_jobs_collection().aggregate([{"$match": query}, {"$facet": facet}])
+        raw = (await cursor.to_list(length=1))[0]
+        for job_doc in raw["results"]:
+            job_doc["_id"] = str(job_doc["_id"])
+        page = {"results": raw["results"], "total": raw["total"][0]["count"] if raw["total"] else 0}
+        if include_facets:
+            page["facets"] = self._format_facets(raw)
+        return page
+    
+    async def search_jobs(self, search_request: JobSearchRequest, include_facets: bool = False) -> Dict[str, Any]:
+        """Search jobs with filters, optionally with facet counts.
+
+        Results, total and facets come from a single $facet aggregation
+        sharing one $match stage. Searches without a text query are cached
+        as a whole, page and facets together.
+        """
         try:
             # Build query
-            query = {"status": JobStatus.PUBLISHED}
+            query = {"status": JobStatus.PUBLISHED.value}
             
             if search_request.query:
                 query["$text"] = {"$search": search_request.query}
             
             if search_request.location:
-                query["location"] = {"$regex": search_request.location, "$options": "i"}
+                query["location"] = {"$regex": re.escape(search_request.location), "$options": "i"}
             
             if search_request.job_type:
                 query["job_type"] = {"$in": [jt.value for jt in search_request.job_type]}
@@ -188,58 +281,70 @@ class MongoDBJobCRUD:
             if search_request.company_id:
                 query["company_id"] = search_request.company_id
             
-            # Count total results
-            total = await self.jobs_collection.count_documents(query)
-            
-            # Get paginated results
             skip = (search_request.page - 1) * search_request.limit
             sort_order = -1 if search_request.sort_order == "desc" else 1
             
-            cursor = self.jobs_collection.find(query)
-            cursor.skip(skip).limit(search_request.limit).sort(search_request.sort_by, sort_order)
+            def load():
+                return self._load_search_page(
+                    query, {search_request.sort_by: sort_order}, skip, search_request.limit, include_facets
+                )
             
-            jobs = []
-            async for job_doc in cursor:
-                job_doc["_id"] = str(job_doc["_id"])
-                jobs.append(MongoDBJob(**job_doc))
+            if search_request.query:
+                page = await load()
+            else:
+                page = await job_cache.get_listing(
+                    "crud:search", {**search_request.dict(), "include_facets": include_facets}, load
+                )
             
-            return {
+            jobs = [MongoDBJob(**job_doc) for job_doc in page["results"]]
+            total = page["total"]
+            
+            result = {
                 "jobs": jobs,
                 "total": total,
                 "page": search_request.page,
                 "limit": search_request.limit,
                 "pages": (total + search_request.limit - 1) // search_request.limit
             }
+            if include_facets:
+                result["facets"] = page["facets"]
+            
+            return result
         except Exception as e:
             logger.error(f"Error searching jobs: {e}")
             raise
     
     async def increment_job_views(self, job_id: str) -> bool:
-        """Increment job view count"""
+        """Increment job view count (buffered, flushed in bulk)"""
         try:
-            result = await self.jobs_collection.update_one(
-                {"_id": ObjectId(job_id)},
-                {"$inc": {"views_count": 1}}
-            )
-            return result.modified_count > 0
+            counter_buffer.increment(self._get_jobs_collection(), job_id, "views_count")
+            return True
         except Exception as e:
             logger.error(f"Error incrementing job views: {e}")
             raise
     
+    async def _load_job_docs(self, query: Dict[str, Any], sort_by: str, limit: int) -> List[Dict[str, Any]]:
+        """Load raw job documents matching a query"""
+        cursor = self._get_jobs_collection().find(query).sort(sort_by, -1).limit(limit)
+        
+        job_docs = []
+        async for job_doc in cursor:
+            job_doc["_id"] = str(job_doc["_id"])
+            job_docs.append(job_doc)
+        
+        return job_docs
+    
     async def get_featured_jobs(self, limit: int = 10) -> List[MongoDBJob]:
         """Get featured jobs"""
         try:
-            cursor = self.jobs_collection.find({
-                "status": JobStatus.PUBLISHED,
-                "is_featured": True
-            }).sort("created_at", -1).limit(limit)
-            
-            jobs = []
-            async for job_doc in cursor:
-                job_doc["_id"] = str(job_doc["_id"])
-                jobs.append(MongoDBJob(**job_doc))
-            
-            return jobs
+            job_docs = await job_cache.get_listing(
+                "crud:featured",
+                {"limit": limit},
+                lambda: self._load_job_docs(
+                    {"status": JobStatus.PUBLISHED.value, "is_featured": True}, "created_at", limit
+                )
+            )
+            return [MongoDBJob(**job_doc) for job_doc in job_docs]
         except Exception as e:
             logger.error(f"Error getting featured jobs: {e}")
             raise
@@ -247,16 +352,14 @@ class MongoDBJobCRUD:
     async def get_recent_jobs(self, limit: int = 20) -> List[MongoDBJob]:
         """Get recent published jobs"""
         try:
-            cursor = self.jobs_collection.find({
-                "status": JobStatus.PUBLISHED
-            }).sort("published_at", -1).limit(limit)
-            
-            jobs = []
-            async for job_doc in cursor:
-                job_doc["_id"] = str(job_doc["_id"])
-                jobs.append(MongoDBJob(**job_doc))
-            
-            return jobs
+            job_docs = await job_cache.get_listing(
+                "crud:recent",
+                {"limit": limit},
+                lambda: self._load_job_docs(
+                    {"status": JobStatus.PUBLISHED.value}, "published_at", limit
+                )
+            )
+            return [MongoDBJob(**job_doc) for job_doc in job_docs]
         except Exception as e:
             logger.error(f"Error getting recent jobs: {e}")
             raise
@@ -290,10 +393,9 @@ class MongoDBJobApplicationCRUD:
             result = await self._get_applications_collection().insert_one(application_data)
             application_data["_id"] = str(result.inserted_id)
             
-            # Increment applications count for the job
-            await self._get_jobs_collection().update_one(
-                {"_id": ObjectId(application_data["job_id"])},
-                {"$inc": {"applications_count": 1}}
+            # Increment applications count for the job (buffered, flushed in bulk)
+            counter_buffer.increment(
+                self._get_jobs_collection(), application_data["job_id"], "applications_count"
             )
             
             return MongoDBJobApplication(**application_data)
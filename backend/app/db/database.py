@@ -18,6 +18,7 @@ companies_collection = database.companies
 users_collection = database.users
 notifications_collection = database.notifications
 resumes_collection = database.resumes
+blobs_collection = database.blobs
 
 def get_database():
     """Get MongoDB database instance"""
@@ -55,6 +56,10 @@ def get_resumes_collection():
     """Get resumes collection"""
     return resumes_collection
 
+def get_blobs_collection():
+    """Get upload blob metadata collection"""
+    return blobs_collection
+
 async def check_mongodb_health():
     """Check MongoDB connection health"""
     try:
@@ -71,6 +71,8 @@ async def create_indexes():
         await async_db.job_applications.create_index("applicant_id")
         await async_db.job_applications.create_index("status")
         await async_db.job_applications.create_index("created_at")
+        await async_db.job_applications.create_index([("applicant_email", 1), ("created_at", -1)])
+        await async_db.applications.create_index([("applicant_email", 1), ("created_at", -1)])
         
         # Companies collection indexes
         await async_db.companies.create_index("name")
@@ -81,11 +83,19 @@ async def create_indexes():
         await async_db.users.create_index("email")
         await async_db.users.create_index("role")
         await async_db.users.create_index("location")
+        # Canonical skill keys, for matching new jobs to job seekers
+        await async_db.users.create_index("skill_keys")
         
         # Notifications collection indexes
         await async_db.notifications.create_index("user_id")
         await async_db.notifications.create_index("read")
         await async_db.notifications.create_index("created_at")
+        # One notification per user per fan-out, so a retried fan-out skips users already notified
+        await async_db.notifications.create_index(
+            [("fan_out_id", 1), ("user_id", 1)],
+            unique=True,
+            partialFilterExpression={"fan_out_id": {"$exists": True}}
+        )
         
         logger.info("MongoDB indexes created successfully")
         
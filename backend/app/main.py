@@ -9,7 +9,25 @@ import logging
 import os
 from dotenv import load_dotenv
 from app.core.config import settings
-from app.db.mongodb import connect_to_mongo, close_mongo_connection
+from app.db.mongodb import connect_to_mongo, close_mongo_connection, get_jobs_collection
+from app.services.counters import counter_buffer
+from app.services.job_search import job_search
+from app.services.principal_cache import principal_cache
+from app.services.password_hasher import password_hasher
+from app.core.security import token_cache_stats
+from app.services.blob_store import blob_store
+from app.services.avatar_variants import avatar_variants
+from app.services.media_files import MediaFiles
+from app.services.pdf_cache import pdf_render_cache
+from app.services.pdf_renderer import pdf_renderer
+from app.services.resume_export import resume_exporter
+from app.services.text_extraction import resume_parser
+from app.services.drive_client import drive_client
+from app.services.task_queue import task_queue
+from app.services.mailer import mailer
+from app.services.email_templates import email_templates
+from app.services.notification_service import notification_service
+import app.services.tasks  # noqa: F401  (registers background tasks)
 from app.api.v1.endpoints import (
     mongodb_jobs_clean, mongodb_users, mongodb_notifications, 
     mongodb_companies, health, auth, upload, ai_chat, resumes, simple_mongodb_jobs,
@@ -49,6 +67,7 @@ app.add_middleware(
     allow_credentials=False,  # Set to False when using wildcard
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition"],
 )
 
 # Trusted host middleware
@@ -94,11 +113,29 @@ async def health_check():
         else:
             mongodb_status = {"status": "unhealthy", "error": "MongoDB not connected"}
         
+        from app.services.cache import cache_service
         return {
             "status": "healthy",
             "timestamp": time.time(),
             "services": {
-                "mongodb": mongodb_status
+                "mongodb": mongodb_status,
+                "cache": cache_service.stats(),
+                "counters": counter_buffer.stats(),
+                "search": {"ready": job_search.ready, "documents": len(job_search.index)},
+                "principals": principal_cache.stats(),
+                "password_hashing": password_hasher.stats(),
+                "tokens": token_cache_stats(),
+                "blobs": blob_store.stats(),
+                "avatar_variants": avatar_variants.stats(),
+                "pdf_cache": pdf_render_cache.stats(),
+                "pdf_rendering": pdf_renderer.stats(),
+                "resume_exports": resume_exporter.stats(),
+                "resume_parsing": resume_parser.stats(),
+                "google_drive": drive_client.stats(),
+                "tasks": task_queue.stats(),
+                "mail": mailer.stats(),
+                "email_templates": email_templates.stats(),
+                "notifications": notification_service.stats()
             }
         }
     except Exception as e:
@@ -137,7 +174,7 @@ app.include_router(users.router, prefix=f"{settings.API_V1_STR}/basic-users", ta
 app.include_router(companies.router, prefix=f"{settings.API_V1_STR}/basic-companies", tags=["basic-companies"])
 
 # Serve static files
-app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+app.mount("/uploads", MediaFiles(directory="uploads"), name="uploads")
 
 # Startup event
 @app.on_event("startup")
@@ -146,19 +183,41 @@ async def startup_event():
     try:
         await connect_to_mongo()
         logger.info("MongoDB connection established")
+        job_search.start(get_jobs_collection())
     except Exception as e:
         logger.error(f"Failed to connect to MongoDB: {e}")
         logger.warning("Continuing startup without MongoDB connection")
         # Don't fail startup - app can work without MongoDB for basic endpoints
+    counter_buffer.start()
+    blob_store.start()
+    email_templates.load()
+    task_queue.start()
+    try:
+        await pdf_renderer.start()
+        await resume_parser.start()
+    except Exception as e:
+        logger.error(f"Failed to start worker processes: {e}")
 
 # Shutdown event
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down Jobify API server...")
+    await job_search.stop()
+    await blob_store.stop()
+    await task_queue.stop()
+    await mailer.close()
+    try:
+        await counter_buffer.stop()
+    except Exception as e:
+        logger.error(f"Error flushing buffered counters: {e}")
     try:
         await close_mongo_connection()
     except Exception as e:
         logger.error(f"Error closing MongoDB connection: {e}")
+    password_hasher.shutdown()
+    pdf_renderer.shutdown()
+    resume_parser.shutdown()
+    await drive_client.aclose()
 
 # Root endpoint
 @app.get("/")
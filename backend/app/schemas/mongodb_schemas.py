@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -200,6 +200,7 @@ class MongoDBUser(BaseModel):
     role: str  # jobseeker, employer, admin
     is_active: bool = True
     avatar_url: Optional[str] = None
+    avatar_variants: Optional[Dict[str, Dict[str, str]]] = None  # {"64": {"webp": url, "jpeg": url}, ...}
     phone: Optional[str] = None
     location: Optional[str] = None
     bio: Optional[str] = None
@@ -244,6 +245,12 @@ class MongoDBUser(BaseModel):
         }
 
 
+class TokenPrincipal(BaseModel):
+    """Authenticated caller as described by verified token claims"""
+    email: str
+    role: str
+
+
 class MongoDBNotification(BaseModel):
     """MongoDB Notification Schema"""
     id: Optional[str] = Field(None, alias="_id")
@@ -317,6 +324,11 @@ class JobUpdateRequest(BaseModel):
     expires_at: Optional[datetime] = None
 
 
+# Job fields a search may be sorted by; anything else is rejected with 422
+JobSortField = Literal["created_at", "updated_at", "salary_min", "salary_max", "title", "views_count", "applications_count"]
+JobSortOrder = Literal["asc", "desc"]
+
+
 class JobSearchRequest(BaseModel):
     """Request model for job search"""
     query: Optional[str] = None
@@ -330,8 +342,8 @@ class JobSearchRequest(BaseModel):
     company_id: Optional[str] = None
     page: int = 1
     limit: int = 20
-    sort_by: str = "created_at"
-    sort_order: str = "desc"
+    sort_by: JobSortField = "created_at"
+    sort_order: JobSortOrder = "desc"
 
 
 class JobApplicationRequest(BaseModel):
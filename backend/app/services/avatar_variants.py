@@ -0,0 +1,129 @@
+"""
+Resized WebP/JPEG variants of uploaded avatars
+"""
+import asyncio
+import hashlib
+import io
+from typing import Any, Dict, List, Optional, Tuple
+import aiofiles
+from PIL import Image, ImageOps
+from app.core.config import settings
+from app.db.database import get_users_collection
+from app.services.blob_store import blob_store
+from app.services.principal_cache import principal_cache
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    "webp": ("WEBP", ".webp", "image/webp"),
+    "jpeg": ("JPEG", ".jpg", "image/jpeg"),
+}
+
+
+class AvatarVariantService:
+    """Builds square thumbnails of an avatar at a few fixed sizes.
+
+    Variants are stored as blobs like any upload, so re-uploading the same
+    picture reuses them. The user document gets
+    avatar_variants = {"64": {"webp": url, "jpeg": url}, ...}; clients pick
+    the smallest size that covers what they display (see pick).
+    """
+
+    def __init__(self, sizes: List[int], quality: int = 82, max_pixels: int = 40_000_000):
+        self.sizes = sorted(set(sizes))
+        self.quality = quality
+        self.max_pixels = max_pixels
+        self.processed = 0
+        self.failed = 0
+
+    def _render(self, data: bytes) -> List[Tuple[int, str, bytes]]:
+        """Decode once and encode every size and format (runs in a worker thread)"""
+        largest = self.sizes[-1]
+        with Image.open(io.BytesIO(data)) as source:
+            width, height = source.size
+            if width * height > self.max_pixels:
+                raise ValueError(f"Image too large to resize ({width}x{height})")
+            # Let the JPEG decoder downscale while decoding; animated images use their first frame
+            source.draft("RGB", (largest * 2, largest * 2))
+            image = ImageOps.exif_transpose(source)
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+        # Cheap box reduction first, so LANCZOS only works on a small image
+        factor = min(image.size) // (largest * 2)
+        if factor > 1:
+            image = image.reduce(factor)
+
+        variants = []
+        for size in reversed(self.sizes):
+            # Each size is resampled from the next larger one
+            image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+            for name, (pil_format, _, _) in FORMATS.items():
+                out = io.BytesIO()
+                if pil_format == "JPEG" and image.mode == "RGBA":
+                    flat = Image.new("RGB", image.size, (255, 255, 255))
+                    flat.paste(image, mask=image.getchannel("A"))
+                    flat.save(out, pil_format, quality=self.quality, optimize=True, progressive=True)
+                else:
+                    image.save(out, pil_format, quality=self.quality, method=4)
+                variants.append((size, name, out.getvalue()))
+        return variants
+
+    async def _store(self, data: bytes, name: str) -> str:
+        _, extension, content_type = FORMATS[name]
+        path = blob_store.temp_path(extension)
+        async with aiofiles.open(path, "wb") as handle:
+            await handle.write(data)
+        saved = await blob_store.commit(path, hashlib.sha256(data).hexdigest(), len(data), extension, content_type)
+        return saved["url"]
+
+    async def generate(self, email: str, avatar_url: str, key: str):
+        """Build the variants of an avatar and set them on the user if it is still their avatar"""
+        try:
+            data = await blob_store.storage.read(key)
+            rendered = await asyncio.to_thread(self._render, data)
+            variants: Dict[str, Dict[str, str]] = {}
+            for size, name, encoded in rendered:
+                variants.setdefault(str(size), {})[name] = await self._store(encoded, name)
+
+            result = await get_users_collection().update_one(
+                {"email": email, "avatar_url": avatar_url},
+                {"$set": {"avatar_variants": variants}}
+            )
+            if result.matched_count == 0:
+                # Replaced by a newer upload in the meantime
+                await self.release(variants)
+                return
+            principal_cache.invalidate(email)
+            self.processed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Avatar variant generation failed for {email}: {e}")
+
+    async def release(self, variants: Optional[Dict[str, Dict[str, str]]]):
+        """Drop the blob references held by a set of variants"""
+        for formats in (variants or {}).values():
+            for url in formats.values():
+                await blob_store.release(url)
+
+    def pick(self, user: Dict[str, Any], size: int, image_format: str = "webp") -> Optional[str]:
+        """URL of the smallest variant at least size px, else the largest one, else the original"""
+        variants = user.get("avatar_variants") or {}
+        sizes = sorted(int(s) for s in variants)
+        if not sizes:
+            return user.get("avatar_url")
+        chosen = next((s for s in sizes if s >= size), sizes[-1])
+        formats = variants[str(chosen)]
+        return formats.get(image_format) or next(iter(formats.values()))
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {"sizes": self.sizes, "processed": self.processed, "failed": self.failed}
+
+
+# Global instance
+avatar_variants = AvatarVariantService(
+    settings.AVATAR_VARIANT_SIZES,
+    quality=settings.AVATAR_VARIANT_QUALITY,
+    max_pixels=settings.AVATAR_MAX_PIXELS
+)
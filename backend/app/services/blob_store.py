@@ -0,0 +1,309 @@
+"""
+Content-addressed storage for uploaded files, with reference counting and garbage collection
+"""
+import asyncio
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+import aiofiles.os
+from app.core.config import settings
+from app.db.database import get_blobs_collection, get_database
+from app.services.storage import storage
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """Stores each distinct upload once, under blobs/<sha[:2]>/<sha><ext> in the storage backend.
+
+    Blob metadata lives in the blobs collection keyed by SHA-256. Uploading
+    content that already exists only bumps its reference count. The garbage
+    collector treats the URLs stored on users and applications as the source
+    of truth: unreferenced blobs past a grace period are deleted and the
+    reference counts of the rest are corrected.
+
+    Each blob records the users who have proven they hold its bytes, by
+    uploading them through the API or through a checksummed presigned PUT.
+    Only those owners may register the blob again by hash alone. Anyone else
+    uploads to their own staging key first, so knowing a hash neither
+    attaches someone else's file nor reveals that it is stored. Staging
+    objects that are never completed should be expired with a bucket
+    lifecycle rule on the staging/ prefix.
+    """
+
+    # Document fields that may point at an uploaded file
+    REFERENCE_FIELDS = {
+        "users": ("avatar_url", "resume_url", "video_resume_url", "audio_resume_url", "video_url", "voice_url"),
+        "applications": ("resume_url", "video_resume_url", "audio_resume_url"),
+        "job_applications": ("resume_url", "video_resume_url", "audio_resume_url"),
+    }
+    # Fields holding {name: {name: url}} maps of derived files, e.g. avatar variants
+    NESTED_REFERENCE_FIELDS = {
+        "users": ("avatar_variants",),
+    }
+    PREFIX = "blobs"
+    STAGING_PREFIX = "staging"
+    _URL_PATTERN = re.compile(r"/blobs/[0-9a-f]{2}/([0-9a-f]{64})(\.[A-Za-z0-9]+)?(\?|$)")
+
+    def __init__(self, storage, tmp_dir: str = "uploads/tmp", grace_seconds: int = 86400, gc_interval: int = 21600):
+        self.storage = storage
+        self.tmp_dir = tmp_dir
+        self.grace_seconds = grace_seconds
+        self.gc_interval = gc_interval
+        self._task: Optional[asyncio.Task] = None
+        self.stored = 0
+        self.deduplicated = 0
+        os.makedirs(self.tmp_dir, exist_ok=True)
+
+    def key_for(self, sha256: str, extension: str = "") -> str:
+        return f"{self.PREFIX}/{sha256[:2]}/{sha256}{extension.lower()}"
+
+    def staging_key(self, owner: str, sha256: str, extension: str = "") -> str:
+        """Where a user uploads content directly before it joins the store"""
+        return f"{self.STAGING_PREFIX}/{owner}/{sha256}{extension.lower()}"
+
+    def sha_from_url(self, url: Optional[str]) -> Optional[str]:
+        """SHA-256 of the blob a stored URL points at, or None for other URLs"""
+        match = self._URL_PATTERN.search(url) if url else None
+        return match.group(1) if match else None
+
+    def temp_path(self, extension: str = "") -> str:
+        """A unique scratch path to stream an upload into before commit"""
+        return os.path.join(self.tmp_dir, f"{os.urandom(16).hex()}{extension}.part")
+
+    def _saved(self, key: str, sha256: str, size: int, deduplicated: bool) -> Dict[str, Any]:
+        return {
+            "url": self.storage.url_for(key),
+            "key": key,
+            "size": size,
+            "sha256": sha256,
+            "deduplicated": deduplicated
+        }
+
+    @staticmethod
+    def _reference_update(now: datetime, owner: Optional[str]) -> Dict[str, Any]:
+        update: Dict[str, Any] = {"$inc": {"refcount": 1}, "$set": {"last_referenced_at": now}}
+        if owner:
+            update["$addToSet"] = {"owners": owner}
+        return update
+
+    async def _add_reference(
+        self,
+        sha256: str,
+        key: str,
+        size: int,
+        content_type: Optional[str],
+        now: datetime,
+        owner: Optional[str] = None
+    ):
+        await get_blobs_collection().update_one(
+            {"_id": sha256},
+            {
+                **self._reference_update(now, owner),
+                "$setOnInsert": {
+                    "key": key,
+                    "size": size,
+                    "content_type": content_type,
+                    "created_at": now
+                }
+            },
+            upsert=True
+        )
+
+    async def commit(
+        self,
+        temp_path: str,
+        sha256: str,
+        size: int,
+        extension: str = "",
+        content_type: Optional[str] = None,
+        owner: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Move a fully written upload into the store, or drop it if the content already exists.
+
+        owner is the uploading user, recorded as holding the content.
+        """
+        now = datetime.utcnow()
+        existing = await get_blobs_collection().find_one_and_update(
+            {"_id": sha256}, self._reference_update(now, owner)
+        )
+        if existing is not None and await self.storage.size(existing["key"]) is not None:
+            await aiofiles.os.remove(temp_path)
+            self.deduplicated += 1
+            return self._saved(existing["key"], sha256, size, deduplicated=True)
+
+        key = existing["key"] if existing is not None else self.key_for(sha256, extension)
+        # Identical content, so overwriting a concurrently committed copy is harmless
+        await self.storage.put_file(temp_path, key, content_type)
+        if existing is None:
+            await self._add_reference(sha256, key, size, content_type, now, owner)
+        self.stored += 1
+        return self._saved(key, sha256, size, deduplicated=False)
+
+    async def direct_upload(
+        self,
+        sha256: str,
+        size: int,
+        extension: str,
+        content_type: str,
+        owner: str
+    ) -> Optional[Dict[str, Any]]:
+        """Where a user should upload content itself, or that they already hold it.
+
+        Returns {"exists": True, ...saved} when the blob is stored and owner
+        has uploaded it before (the caller then registers it like any other
+        upload). Otherwise returns presigned instructions for owner's staging
+        key, or None if the backend has none.
+        """
+        existing = await get_blobs_collection().find_one({"_id": sha256})
+        if (
+            existing is not None
+            and owner in existing.get("owners", ())
+            and await self.storage.size(existing["key"]) is not None
+        ):
+            return {"exists": True, **self._saved(existing["key"], sha256, size, deduplicated=True)}
+        key = self.staging_key(owner, sha256, extension)
+        upload = self.storage.presigned_upload(key, content_type, size, sha256)
+        if upload is None:
+            return None
+        return {"exists": False, "key": key, "upload": upload}
+
+    async def register(
+        self,
+        sha256: str,
+        size: int,
+        extension: str,
+        content_type: Optional[str],
+        owner: str
+    ) -> Optional[Dict[str, Any]]:
+        """Record owner's reference to content they uploaded directly; None if it is not there.
+
+        Unless owner already holds the blob, the content must be at their
+        staging key. The presigned PUT that put it there was signed with the
+        SHA-256, so its presence proves owner has the bytes.
+        """
+        existing = await get_blobs_collection().find_one({"_id": sha256})
+        if existing is not None and owner in existing.get("owners", ()):
+            key = existing["key"]
+            if await self.storage.size(key) != size:
+                return None
+        else:
+            staging_key = self.staging_key(owner, sha256, extension)
+            if await self.storage.size(staging_key) != size:
+                return None
+            if existing is not None and await self.storage.size(existing["key"]) is not None:
+                key = existing["key"]
+                await self.storage.delete(staging_key)
+            else:
+                key = existing["key"] if existing is not None else self.key_for(sha256, extension)
+                await self.storage.move(staging_key, key)
+        await self._add_reference(sha256, key, size, content_type, datetime.utcnow(), owner)
+        if existing is None:
+            self.stored += 1
+        else:
+            self.deduplicated += 1
+        return self._saved(key, sha256, size, deduplicated=existing is not None)
+
+    async def release(self, url: Optional[str]):
+        """Drop one reference to a blob (e.g. when an avatar is replaced)"""
+        sha256 = self.sha_from_url(url)
+        if sha256 is None:
+            return
+        await get_blobs_collection().update_one(
+            {"_id": sha256, "refcount": {"$gt": 0}},
+            {"$inc": {"refcount": -1}}
+        )
+
+    async def _reference_counts(self) -> Dict[str, int]:
+        """Count references to each blob across users and applications"""
+        database = get_database()
+        references: Dict[str, int] = {}
+        for name, fields in self.REFERENCE_FIELDS.items():
+            nested = self.NESTED_REFERENCE_FIELDS.get(name, ())
+            query = {"$or": [{field: {"$regex": f"/{self.PREFIX}/"}} for field in fields]
+                     + [{field: {"$type": "object"}} for field in nested]}
+            projection = {field: 1 for field in fields + nested}
+            async for doc in database[name].find(query, projection):
+                urls = [doc.get(field) for field in fields]
+                for field in nested:
+                    for inner in (doc.get(field) or {}).values():
+                        urls.extend(inner.values())
+                for url in urls:
+                    sha256 = self.sha_from_url(url)
+                    if sha256:
+                        references[sha256] = references.get(sha256, 0) + 1
+        return references
+
+    async def collect_garbage(self) -> Dict[str, int]:
+        """Delete unreferenced blobs older than the grace period and resync reference counts"""
+        references = await self._reference_counts()
+        cutoff = datetime.utcnow() - timedelta(seconds=self.grace_seconds)
+        blobs = get_blobs_collection()
+        deleted = reclaimed = resynced = 0
+
+        async for blob in blobs.find({}, {"key": 1, "size": 1, "refcount": 1, "last_referenced_at": 1}):
+            count = references.get(blob["_id"], 0)
+            last_referenced_at = blob.get("last_referenced_at")
+            if count == 0 and last_referenced_at is not None and last_referenced_at < cutoff:
+                # Only delete if nothing re-referenced it since we looked
+                result = await blobs.delete_one({"_id": blob["_id"], "last_referenced_at": last_referenced_at})
+                if result.deleted_count:
+                    await self.storage.delete(blob["key"])
+                    deleted += 1
+                    reclaimed += blob.get("size", 0)
+            elif count and blob.get("refcount") != count:
+                await blobs.update_one({"_id": blob["_id"]}, {"$set": {"refcount": count}})
+                resynced += 1
+
+        # Scratch files left behind by interrupted uploads
+        for name in await aiofiles.os.listdir(self.tmp_dir):
+            path = os.path.join(self.tmp_dir, name)
+            try:
+                if time.time() - (await aiofiles.os.stat(path)).st_mtime > self.grace_seconds:
+                    await aiofiles.os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        if deleted:
+            logger.info(f"Blob GC deleted {deleted} blobs ({reclaimed} bytes)")
+        return {"deleted": deleted, "reclaimed_bytes": reclaimed, "resynced": resynced}
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            try:
+                await self.collect_garbage()
+            except Exception as e:
+                logger.error(f"Blob garbage collection failed: {e}")
+
+    def start(self):
+        """Run garbage collection periodically on the running event loop"""
+        if self.gc_interval <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the garbage collection task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {"backend": self.storage.name, "stored": self.stored, "deduplicated": self.deduplicated}
+
+
+# Global instance
+blob_store = BlobStore(
+    storage,
+    grace_seconds=settings.BLOB_GC_GRACE_SECONDS,
+    gc_interval=settings.BLOB_GC_INTERVAL_SECONDS
+)
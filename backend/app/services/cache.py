@@ -0,0 +1,222 @@
+"""
+Read-through cache with an in-process LRU backend and an optional Redis backend
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import bson
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry expiry"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Counters live outside the LRU so they are never evicted
+        self._counters: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at and expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        expires_at = time.monotonic() + ttl if ttl else 0
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._entries.pop(key, None)
+            self._counters.pop(key, None)
+
+    async def incr(self, key: str) -> int:
+        self._counters[key] = self._counters.get(key, 0) + 1
+        return self._counters[key]
+
+
+class RedisCacheBackend:
+    """Redis-backed cache shared by every API worker"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[int] = None):
+        await self._client.set(key, value, ex=ttl or None)
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self._client.delete(*keys)
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(key)
+
+
+class CacheService:
+    """Read-through cache that coalesces concurrent misses into a single load"""
+
+    def __init__(self, backend, default_ttl: int = 60):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self._inflight: Dict[str, "asyncio.Future[Optional[bytes]]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(namespace: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a normalized cache key: parameter order and unset parameters do not matter"""
+        if not params:
+            return namespace
+        normalized = {
+            name: value.strip() if isinstance(value, str) else value
+            for name, value in params.items()
+            if value is not None and value != ""
+        }
+        payload = json.dumps(normalized, sort_keys=True, default=str)
+        return f"{namespace}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    @staticmethod
+    def _encode(value: Any) -> bytes:
+        return bson.encode({"v": value})
+
+    @staticmethod
+    def _decode(raw: Optional[bytes]) -> Any:
+        if raw is None:
+            return None
+        return bson.decode(raw)["v"]
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    async def _write(self, key: str, raw: bytes, ttl: Optional[int]):
+        try:
+            await self.backend.set(key, raw, ttl or self.default_ttl)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    async def get(self, key: str) -> Any:
+        """Return a cached value or None"""
+        return self._decode(await self._read(key))
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        """Store a value under key"""
+        await self._write(key, self._encode(value), ttl)
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """Return the cached value for key, calling loader once on a miss.
+
+        Concurrent callers that miss on the same key wait for the first
+        caller's load instead of hitting the database themselves. None
+        results are returned but not cached.
+        """
+        raw = await self._read(key)
+        if raw is not None:
+            self.hits += 1
+            return self._decode(raw)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return self._decode(await asyncio.shield(inflight))
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+            raw = self._encode(value) if value is not None else None
+            if raw is not None:
+                await self._write(key, raw, ttl)
+            future.set_result(raw)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when no other caller was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def invalidate(self, *keys: str):
+        """Drop keys from the cache"""
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache invalidation failed for {keys}: {e}")
+
+    async def get_version(self, namespace: str) -> int:
+        """Current generation number of a namespace"""
+        raw = await self._read(f"{namespace}:version")
+        return int(raw) if raw else 0
+
+    async def bump_version(self, namespace: str):
+        """Invalidate every key built from a namespace's previous generation"""
+        try:
+            await self.backend.incr(f"{namespace}:version")
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Cache version bump failed for {namespace}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0
+        }
+
+
+def _build_backend():
+    if settings.CACHE_BACKEND == "redis":
+        try:
+            return RedisCacheBackend(settings.REDIS_URL)
+        except Exception as e:
+            logger.error(f"Failed to initialise Redis cache, falling back to memory: {e}")
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+# Global instance
+cache_service = CacheService(_build_backend(), default_ttl=settings.JOB_LISTING_CACHE_TTL_SECONDS)
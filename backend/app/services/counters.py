@@ -0,0 +1,132 @@
+"""
+Write-behind buffer for hot document counters (views, applications, profile views)
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CounterBuffer:
+    """Accumulates $inc deltas in memory and flushes them as one bulk_write per collection"""
+
+    def __init__(self, flush_interval: float = 5.0, max_pending: int = 1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # (collection full name, key field, key value) -> {field: delta}
+        self._pending: Dict[Tuple[str, str, Any], Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._collections: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_updates = 0
+        self.failed_flushes = 0
+
+    def increment(self, collection, key: Any, field: str, amount: int = 1, key_field: str = "_id"):
+        """Buffer an increment of field on the document whose key_field equals key.
+
+        Safe to call from sync handlers running in the threadpool. String
+        ids are converted to ObjectId when key_field is _id.
+        """
+        if key_field == "_id" and isinstance(key, str):
+            key = ObjectId(key)
+        with self._lock:
+            self._collections[collection.full_name] = collection
+            self._pending[(collection.full_name, key_field, key)][field] += amount
+            should_wake = len(self._pending) >= self.max_pending
+        if should_wake and self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def pending_count(self) -> int:
+        """Number of documents with unflushed deltas"""
+        return len(self._pending)
+
+    async def flush(self) -> int:
+        """Write every pending delta to MongoDB and return the number of updated documents"""
+        with self._lock:
+            if not self._pending:
+                return 0
+            pending, self._pending = self._pending, defaultdict(lambda: defaultdict(int))
+
+        operations: Dict[str, list] = defaultdict(list)
+        for (collection_name, key_field, key), deltas in pending.items():
+            operations[collection_name].append(
+                UpdateOne({key_field: key}, {"$inc": dict(deltas)})
+            )
+
+        flushed = 0
+        for collection_name, ops in operations.items():
+            try:
+                await self._collections[collection_name].bulk_write(ops, ordered=False)
+                flushed += len(ops)
+            except Exception as e:
+                self.failed_flushes += 1
+                logger.error(f"Failed to flush {len(ops)} counter updates to {collection_name}: {e}")
+                self._requeue(collection_name, pending)
+
+        self.flushed_updates += flushed
+        return flushed
+
+    def _requeue(self, collection_name: str, pending: Dict[Tuple[str, str, Any], Dict[str, int]]):
+        """Put a failed collection's deltas back so the next flush retries them"""
+        with self._lock:
+            for pending_key, deltas in pending.items():
+                if pending_key[0] != collection_name:
+                    continue
+                for field, delta in deltas.items():
+                    self._pending[pending_key][field] += delta
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Counter flush failed: {e}")
+
+    def start(self):
+        """Start the periodic flush task on the running event loop"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+        logger.info(f"Counter buffer started (flush every {self.flush_interval}s)")
+
+    async def stop(self):
+        """Stop the flush task and write out whatever is still pending"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        logger.info("Counter buffer stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "pending_documents": self.pending_count(),
+            "flushed_updates": self.flushed_updates,
+            "failed_flushes": self.failed_flushes
+        }
+
+
+# Global instance
+counter_buffer = CounterBuffer(
+    flush_interval=settings.COUNTER_FLUSH_INTERVAL_SECONDS,
+    max_pending=settings.COUNTER_MAX_PENDING
+)
@@ -0,0 +1,198 @@
+"""
+Async Google Drive REST client with pooled connections and streamed downloads
+"""
+import hashlib
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import quote
+import httpx
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Native Google files have no binary content and must be exported
+EXPORT_MIME_TYPES = {
+    "application/vnd.google-apps.document": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+# 403 reasons Drive uses for quota rather than access problems
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "dailyLimitExceeded", "sharingRateLimitExceeded"}
+# 403 reasons meaning the token itself is not good enough
+AUTH_REASONS = {"authError", "insufficientPermissions", "appNotAuthorizedToFile"}
+
+
+class DriveError(Exception):
+    """A Drive request failed"""
+
+    status_code = 502
+
+    def __init__(self, message: str, retry_after: Optional[str] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class DriveAuthError(DriveError):
+    """The access token is invalid, expired or lacks the needed scope"""
+
+    status_code = 401
+
+
+class DriveForbidden(DriveError):
+    """The token is valid but the file cannot be read with it"""
+
+    status_code = 403
+
+
+class DriveRateLimited(DriveError):
+    status_code = 429
+
+
+class DriveNotFound(DriveError):
+    status_code = 404
+
+
+class DriveFileTooLarge(DriveError):
+    status_code = 413
+
+
+class DriveUnsupportedType(DriveError):
+    status_code = 400
+
+
+class DriveClient:
+    """Talks to the Drive v3 REST API directly over one pooled HTTP client.
+
+    No discovery document is needed, and the token is validated by the first
+    real request (the metadata lookup) rather than by a separate call.
+    Downloads are streamed in chunks, hashed on the way and capped at
+    max_bytes.
+    """
+
+    def __init__(self, base_url: str = "https://www.googleapis.com", max_bytes: int = 10 * 1024 * 1024, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.bytes_downloaded = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60)
+            )
+        return self._client
+
+    @staticmethod
+    def _error_reason(response: httpx.Response) -> str:
+        try:
+            errors = response.json()["error"].get("errors") or [{}]
+            return errors[0].get("reason", "")
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return ""
+
+    @classmethod
+    def _raise_for_status(cls, response: httpx.Response, file_id: str):
+        """Map a Drive error response to a DriveError; the body must have been read"""
+        if response.status_code < 400:
+            return
+        retry_after = response.headers.get("Retry-After")
+        if response.status_code == 401:
+            raise DriveAuthError("Invalid or expired Google OAuth token")
+        if response.status_code == 403:
+            reason = cls._error_reason(response)
+            if reason in RATE_LIMIT_REASONS:
+                raise DriveRateLimited("Google Drive rate limit reached, try again shortly", retry_after)
+            if reason in AUTH_REASONS:
+                raise DriveAuthError("Google OAuth token does not grant access to Drive files")
+            raise DriveForbidden(f"Google Drive refused access to file {file_id}" + (f" ({reason})" if reason else ""))
+        if response.status_code == 404:
+            raise DriveNotFound(f"File {file_id} not found in Google Drive")
+        if response.status_code == 429:
+            raise DriveRateLimited("Google Drive rate limit reached, try again shortly", retry_after)
+        raise DriveError(f"Google Drive request failed with status {response.status_code}")
+
+    async def get_metadata(self, file_id: str, access_token: str) -> Dict[str, Any]:
+        """id, name, mimeType and size of a file"""
+        self.requests += 1
+        try:
+            response = await self._get_client().get(
+                f"/drive/v3/files/{quote(file_id, safe='')}",
+                params={"fields": "id,name,mimeType,size", "supportsAllDrives": "true"},
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+        except httpx.HTTPError as e:
+            raise DriveError(f"Google Drive request failed: {e}") from e
+        self._raise_for_status(response, file_id)
+        return response.json()
+
+    async def download(
+        self,
+        file_id: str,
+        access_token: str,
+        allowed_mime_types: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Content of a file (exported for native Google files), streamed and capped.
+
+        With allowed_mime_types, other files are rejected from their metadata
+        before any content is fetched. Returns {file_id, name, mime_type,
+        content, sha256}.
+        """
+        metadata = await self.get_metadata(file_id, access_token)
+        mime_type = EXPORT_MIME_TYPES.get(metadata.get("mimeType", ""), metadata.get("mimeType", ""))
+        if allowed_mime_types is not None and mime_type not in allowed_mime_types:
+            raise DriveUnsupportedType(f"Unsupported file type: {mime_type or 'unknown'}")
+        if int(metadata.get("size") or 0) > self.max_bytes:
+            raise DriveFileTooLarge(f"File is larger than {self.max_bytes // (1024 * 1024)}MB")
+
+        path = f"/drive/v3/files/{quote(file_id, safe='')}"
+        if metadata.get("mimeType") in EXPORT_MIME_TYPES:
+            url, params = f"{path}/export", {"mimeType": mime_type}
+        else:
+            url, params = path, {"alt": "media", "supportsAllDrives": "true"}
+
+        buffer = bytearray()
+        digest = hashlib.sha256()
+        self.requests += 1
+        try:
+            async with self._get_client().stream(
+                "GET", url, params=params, headers={"Authorization": f"Bearer {access_token}"}
+            ) as response:
+                if response.status_code >= 400:
+                    await response.aread()
+                self._raise_for_status(response, file_id)
+                async for chunk in response.aiter_bytes():
+                    if len(buffer) + len(chunk) > self.max_bytes:
+                        raise DriveFileTooLarge(f"File is larger than {self.max_bytes // (1024 * 1024)}MB")
+                    buffer += chunk
+                    digest.update(chunk)
+        except httpx.HTTPError as e:
+            raise DriveError(f"Google Drive download failed: {e}") from e
+        self.bytes_downloaded += len(buffer)
+        return {
+            "file_id": file_id,
+            "name": metadata.get("name", ""),
+            "mime_type": mime_type,
+            "content": bytes(buffer),
+            "sha256": digest.hexdigest()
+        }
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {"requests": self.requests, "bytes_downloaded": self.bytes_downloaded}
+
+
+# Global instance
+drive_client = DriveClient(
+    base_url=settings.GOOGLE_DRIVE_API_URL,
+    max_bytes=settings.GOOGLE_DRIVE_MAX_DOWNLOAD_BYTES,
+    timeout=settings.GOOGLE_DRIVE_TIMEOUT_SECONDS
+)
@@ -1,80 +1,55 @@
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from app.core.config import settings
+import asyncio
+from typing import Any, Dict, List, Optional
+from app.services.email_templates import email_templates
+from app.services.mailer import mailer
+import logging
 
+logger = logging.getLogger(__name__)
 
-def send_email(to_email: str, subject: str, body: str, is_html: bool = False):
-    """Send email using SMTP"""
+
+async def send_email(to_email: str, subject: str, body: str, is_html: bool = False):
+    """Send email through the pooled SMTP mailer"""
     try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = settings.MAIL_FROM
-        msg['To'] = to_email
-        msg['Subject'] = subject
-        
-        # Add body
-        msg.attach(MIMEText(body, 'html' if is_html else 'plain'))
-        
-        # Connect to server and send email
-        server = smtplib.SMTP(settings.MAIL_SERVER, settings.MAIL_PORT)
-        server.starttls()
-        server.login(settings.MAIL_USERNAME, settings.MAIL_PASSWORD)
-        
-        text = msg.as_string()
-        server.sendmail(settings.MAIL_FROM, to_email, text)
-        server.quit()
-        
+        await mailer.send(to_email, subject, body, is_html)
         return True
     except Exception as e:
-        print(f"Failed to send email: {e}")
+        logger.error(f"Failed to send email: {e}")
         return False
 
 
-def send_password_reset_email(email: str, reset_token: str):
+async def send_template_email(to_email: str, template: str, locale: Optional[str] = None, **context):
+    """Render an email template for the recipient's locale and send it"""
+    rendered = email_templates.render(template, locale, **context)
+    return await send_email(to_email, rendered["subject"], rendered["html"], is_html=True)
+
+
+async def send_password_reset_email(email: str, reset_token: str, locale: Optional[str] = None):
     """Send password reset email"""
-    reset_url = f"http://localhost:3000/reset-password?token={reset_token}"
-    
-    subject = "Password Reset - SkillGlide"
-    body = f"""
-    <html>
-        <body>
-            <h2>Password Reset Request</h2>
-            <p>You have requested to reset your password for your SkillGlide account.</p>
-            <p>Click the link below to reset your password:</p>
-            <a href="{reset_url}" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Reset Password</a>
-            <p>This link will expire in 1 hour.</p>
-            <p>If you didn't request this, please ignore this email.</p>
-            <br>
-            <p>Best regards,<br>The SkillGlide Team</p>
-        </body>
-    </html>
-    """
-    
-    return send_email(email, subject, body, is_html=True)
+    return await send_template_email(email, "password_reset.html", locale, token=reset_token)
 
 
-def send_welcome_email(email: str, name: str):
+async def send_welcome_email(email: str, name: str, locale: Optional[str] = None):
     """Send welcome email to new users"""
-    subject = "Welcome to SkillGlide!"
-    body = f"""
-    <html>
-        <body>
-            <h2>Welcome to SkillGlide, {name}!</h2>
-            <p>Thank you for joining SkillGlide, the AI-powered job portal.</p>
-            <p>You can now:</p>
-            <ul>
-                <li>Create and customize your professional resume</li>
-                <li>Search for jobs that match your skills</li>
-                <li>Get AI-powered job recommendations</li>
-                <li>Connect with top employers</li>
-            </ul>
-            <p>Get started by completing your profile and uploading your resume.</p>
-            <a href="http://localhost:3000/profile" style="background-color: #007bff; color: white; padding: 10px 20px; text-decoration: none; border-radius: 5px;">Complete Profile</a>
-            <br><br>
-            <p>Best regards,<br>The SkillGlide Team</p>
-        </body>
-    </html>
+    return await send_template_email(email, "welcome.html", locale, name=name)
+
+
+def _render_job_alerts(alerts: List[Dict[str, Any]]) -> List[Any]:
+    messages = []
+    for alert in alerts:
+        rendered = email_templates.render("job_alert.html", alert.get("locale"), name=alert["name"], jobs=alert["jobs"])
+        messages.append(mailer.build_message(alert["email"], rendered["subject"], rendered["html"], is_html=True))
+    return messages
+
+
+async def send_job_alert_emails(alerts: List[Dict[str, Any]]) -> int:
+    """Send a batch of job alerts; each alert has email, name, jobs and an optional locale.
+
+    Job cards are rendered once per job and locale however many alerts include them,
+    and the batch is rendered off the event loop. Returns the number of alerts sent.
     """
-    
-    return send_email(email, subject, body, is_html=True)
\ No newline at end of file
+    messages = await asyncio.to_thread(_render_job_alerts, alerts)
+    errors = await mailer.send_many(messages)
+    for alert, error in zip(alerts, errors):
+        if error is not None:
+            logger.error(f"Failed to send job alert to {alert['email']}: {error}")
+    return errors.count(None)
@@ -0,0 +1,153 @@
+"""
+Email templates compiled once, rendered per locale, with a cache of rendered fragments
+"""
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, pass_context, select_autoescape
+from markupsafe import Markup
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates", "email")
+
+
+class EmailTemplates:
+    """Jinja2 email templates, compiled together on load() and never re-read.
+
+    Templates for the default locale sit at the top of the directory; a
+    localized variant lives in a subdirectory named after its locale
+    (es/welcome.html). Lookups fall back from es-mx to es to the default.
+    Each email defines a subject block alongside its HTML body.
+
+    Templates call fragment(name, key, ...) for markup shared by many
+    emails, such as a job card that appears in thousands of job alerts. A
+    fragment is rendered once per template variant and key, so the key must
+    change whenever anything the fragment shows changes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        default_locale: str = "en",
+        fragment_cache_size: int = 5000,
+        globals: Optional[Dict[str, Any]] = None
+    ):
+        self.default_locale = self._normalize_locale(default_locale)
+        self.fragment_cache_size = fragment_cache_size
+        self.env = Environment(
+            loader=FileSystemLoader(directory),
+            autoescape=select_autoescape(["html"]),
+            auto_reload=False,
+            cache_size=-1,
+            trim_blocks=True,
+            lstrip_blocks=True
+        )
+        self.env.globals.update(globals or {})
+        self.env.globals["fragment"] = self._fragment
+        self._templates: Dict[str, Template] = {}
+        self._resolved: Dict[Tuple[str, str], Template] = {}
+        self._fragments: "OrderedDict[Tuple[str, str], Markup]" = OrderedDict()
+        # Emails may be rendered from threadpool handlers as well as the event loop
+        self._lock = threading.Lock()
+        self.fragment_hits = 0
+        self.fragment_misses = 0
+
+    @staticmethod
+    def _normalize_locale(locale: Optional[str]) -> str:
+        return (locale or "").strip().lower().replace("_", "-")
+
+    def load(self) -> int:
+        """Compile every template up front so syntax errors surface at startup"""
+        templates = {name: self.env.get_template(name) for name in self.env.list_templates(extensions=["html"])}
+        with self._lock:
+            self._templates = templates
+            self._resolved.clear()
+            self._fragments.clear()
+        logger.info(f"Compiled {len(templates)} email templates")
+        return len(templates)
+
+    def _candidates(self, name: str, locale: str) -> List[str]:
+        candidates = []
+        if locale and locale != self.default_locale:
+            candidates.append(f"{locale}/{name}")
+            language = locale.split("-", 1)[0]
+            if language != locale and language != self.default_locale:
+                candidates.append(f"{language}/{name}")
+        candidates.append(name)
+        return candidates
+
+    def get(self, name: str, locale: Optional[str] = None) -> Template:
+        """The compiled template for a locale, falling back to the default"""
+        if not self._templates:
+            self.load()
+        locale = self._normalize_locale(locale) or self.default_locale
+        template = self._resolved.get((name, locale))
+        if template is None:
+            for candidate in self._candidates(name, locale):
+                template = self._templates.get(candidate)
+                if template is not None:
+                    break
+            else:
+                raise TemplateNotFound(name)
+            self._resolved[(name, locale)] = template
+        return template
+
+    def render(self, name: str, locale: Optional[str] = None, /, **context) -> Dict[str, str]:
+        """Render an email; returns {"subject", "html"}"""
+        locale = self._normalize_locale(locale) or self.default_locale
+        template = self.get(name, locale)
+        context["locale"] = locale
+        subject = ""
+        if "subject" in template.blocks:
+            subject = "".join(template.blocks["subject"](template.new_context(context))).strip()
+        return {"subject": subject, "html": template.render(context)}
+
+    @pass_context
+    def _fragment(self, context, name: str, key: Any, /, **values) -> Markup:
+        locale = context.get("locale") or self.default_locale
+        template = self.get(name, locale)
+        # Keyed by the resolved template so locales that fall back share entries
+        cache_key = (template.name, str(key))
+        with self._lock:
+            cached = self._fragments.get(cache_key)
+            if cached is not None:
+                self._fragments.move_to_end(cache_key)
+                self.fragment_hits += 1
+                return cached
+        values["locale"] = locale
+        markup = Markup(template.render(values))
+        with self._lock:
+            self.fragment_misses += 1
+            if self.fragment_cache_size > 0:
+                self._fragments[cache_key] = markup
+                while len(self._fragments) > self.fragment_cache_size:
+                    self._fragments.popitem(last=False)
+        return markup
+
+    def clear_fragments(self):
+        """Drop every cached fragment"""
+        with self._lock:
+            self._fragments.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Template and fragment cache counters for monitoring"""
+        with self._lock:
+            return {
+                "templates": len(self._templates),
+                "fragments": len(self._fragments),
+                "fragment_hits": self.fragment_hits,
+                "fragment_misses": self.fragment_misses
+            }
+
+
+# Global instance
+email_templates = EmailTemplates(
+    TEMPLATE_DIR,
+    default_locale=settings.EMAIL_DEFAULT_LOCALE,
+    fragment_cache_size=settings.EMAIL_FRAGMENT_CACHE_SIZE,
+    globals={"app_url": settings.EMAIL_APP_URL.rstrip("/")}
+)
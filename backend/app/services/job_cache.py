@@ -0,0 +1,65 @@
+"""
+Cache tier for job detail documents and public job listings
+"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.core.config import settings
+from app.services.cache import CacheService, cache_service
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class JobCache:
+    """Caches raw job documents by id and listing results by normalized query.
+
+    Both kinds of key carry a generation number read before loading, and
+    invalidation bumps the generation instead of deleting the entry. A load
+    that read the old document while an update ran therefore writes it under
+    a key no reader uses any more, rather than putting it back in the cache.
+    """
+
+    DETAIL_NAMESPACE = "job"
+    LISTING_NAMESPACE = "jobs:listing"
+
+    def __init__(self, cache: CacheService):
+        self.cache = cache
+
+    def _detail_key(self, job_id: str) -> str:
+        return f"{self.DETAIL_NAMESPACE}:{job_id}"
+
+    async def get_job(
+        self,
+        job_id: str,
+        loader: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Get a job document, loading it from MongoDB on a miss"""
+        version = await self.cache.get_version(self._detail_key(job_id))
+        return await self.cache.get_or_load(
+            f"{self._detail_key(job_id)}:{version}", loader, ttl=settings.JOB_CACHE_TTL_SECONDS
+        )
+
+    async def get_listing(
+        self,
+        name: str,
+        params: Dict[str, Any],
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Get a listing result keyed by endpoint name and query parameters"""
+        version = await self.cache.get_version(self.LISTING_NAMESPACE)
+        key = self.cache.make_key(f"{self.LISTING_NAMESPACE}:{version}:{name}", params)
+        return await self.cache.get_or_load(
+            key, loader, ttl=settings.JOB_LISTING_CACHE_TTL_SECONDS
+        )
+
+    async def invalidate_listings(self):
+        """Drop every cached listing (e.g. after a job is created)"""
+        await self.cache.bump_version(self.LISTING_NAMESPACE)
+
+    async def invalidate_job(self, job_id: str):
+        """Drop a job document and every listing that may contain it"""
+        await self.cache.bump_version(self._detail_key(job_id))
+        await self.invalidate_listings()
+
+
+# Global instance
+job_cache = JobCache(cache_service)
@@ -0,0 +1,397 @@
+"""
+In-process full-text job search: BM25 over title, skills, keywords and description
+"""
+import asyncio
+import bisect
+import math
+import re
+from array import array
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from app.core.config import settings
+from app.services.skill_taxonomy import skill_key
+import logging
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "that", "the", "to", "we", "will", "with", "you", "your"
+})
+_SKILL_PREFIX = "skill:"
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed ("c++" and "c#" survive)"""
+    return [token for token in _TOKEN_RE.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def _normalize_enum(value: Any) -> str:
+    value = getattr(value, "value", value)
+    return str(value).replace("-", "_") if value else ""
+
+
+def _timestamp(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class _Categorical:
+    """Dictionary-encoded column used for filters and facet counts"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {"": 0}
+        self.values: List[str] = [""]
+        self.column = array("i")
+
+    def append(self, value: str):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        self.column.append(code)
+
+    def codes_for(self, values: Iterable[str]) -> List[int]:
+        return [self.codes[value] for value in values if value in self.codes]
+
+
+class JobSearchIndex:
+    """Inverted index with BM25 ranking, prefix expansion and facet counts"""
+
+    FIELD_WEIGHTS = {"title": 3.0, "skills": 2.0, "keywords": 2.0, "description": 1.0}
+    FACET_FIELDS = ("job_type", "work_mode", "experience_level", "location")
+    CATEGORICAL_FIELDS = FACET_FIELDS + ("status", "company_id")
+    MAX_PREFIX_EXPANSIONS = 64
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._job_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._alive = array("b")
+        self._lengths = array("f")
+        self._created = array("d")
+        self._salary_min = array("d")
+        self._salary_max = array("d")
+        self._categoricals = {field: _Categorical() for field in self.CATEGORICAL_FIELDS}
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+        self._total_length = 0.0
+        self._live_count = 0
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    # Indexing
+
+    @staticmethod
+    def _field_text(job: Dict[str, Any], field: str) -> str:
+        if field == "skills":
+            values = (job.get("required_skills") or []) + (job.get("preferred_skills") or [])
+        elif field == "keywords":
+            values = (job.get("keywords") or []) + (job.get("tags") or [])
+        else:
+            return str(job.get(field) or "")
+        return " ".join(str(value) for value in values if value)
+
+    def upsert(self, job: Dict[str, Any]):
+        """Index a job document, replacing any previous version of it"""
+        job_id = str(job.get("_id") or job.get("id") or "")
+        if not job_id:
+            return
+        self.remove(job_id)
+
+        weighted_tf: Counter = Counter()
+        length = 0.0
+        for field, weight in self.FIELD_WEIGHTS.items():
+            for token in tokenize(self._field_text(job, field)):
+                weighted_tf[token] += weight
+                length += weight
+        for skill in job.get("required_skills") or []:
+            if skill:
+                weighted_tf[_SKILL_PREFIX + skill_key(str(skill))] = 0.0
+
+        position = len(self._job_ids)
+        self._job_ids.append(job_id)
+        self._positions[job_id] = position
+        self._alive.append(1)
+        self._lengths.append(length)
+        self._created.append(_timestamp(job.get("created_at")))
+        self._salary_min.append(_number(job.get("salary_min")))
+        self._salary_max.append(_number(job.get("salary_max")))
+        for field, column in self._categoricals.items():
+            value = job.get(field)
+            if field in ("job_type", "work_mode"):
+                value = _normalize_enum(value)
+            else:
+                value = getattr(value, "value", value)
+            column.append(str(value) if value is not None else "")
+
+        for term, tf in weighted_tf.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("i"), array("f"))
+                self._vocabulary_dirty = True
+            postings[0].append(position)
+            postings[1].append(tf)
+
+        self._total_length += length
+        self._live_count += 1
+
+    def remove(self, job_id: str):
+        """Drop a job from results; its postings are compacted on the next rebuild"""
+        position = self._positions.pop(str(job_id), None)
+        if position is None:
+            return
+        self._alive[position] = 0
+        self._total_length -= self._lengths[position]
+        self._live_count -= 1
+
+    # Querying
+
+    def _expand(self, token: str, prefix: bool) -> List[str]:
+        if not prefix:
+            return [token] if token in self._postings else []
+        if self._vocabulary_dirty:
+            self._vocabulary = sorted(term for term in self._postings if not term.startswith(_SKILL_PREFIX))
+            self._vocabulary_dirty = False
+        start = bisect.bisect_left(self._vocabulary, token)
+        terms = []
+        for term in self._vocabulary[start:start + self.MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def _score(self, tokens: List[str], prefix: bool, size: int) -> np.ndarray:
+        scores = np.zeros(size, dtype=np.float32)
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        alive = np.frombuffer(self._alive, dtype=np.int8)
+        avg_length = self._total_length / self._live_count if self._live_count else 1.0
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(avg_length, 1e-6))
+        for index, token in enumerate(tokens):
+            # Only the last token is treated as a prefix (type-ahead)
+            for term in self._expand(token, prefix and index == len(tokens) - 1):
+                docs_raw, tfs_raw = self._postings[term]
+                docs = np.frombuffer(docs_raw, dtype=np.int32)
+                tfs = np.frombuffer(tfs_raw, dtype=np.float32)
+                # Postings of replaced or deleted jobs linger until the next rebuild
+                df = int(alive[docs].sum())
+                if df == 0:
+                    continue
+                idf = math.log(1 + (self._live_count - df + 0.5) / (df + 0.5))
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+        return scores
+
+    def _filter_mask(self, size: int, filters: Dict[str, Any]) -> np.ndarray:
+        mask = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+
+        def categorical_mask(field: str, codes: List[int]) -> np.ndarray:
+            column = np.frombuffer(self._categoricals[field].column, dtype=np.int32)
+            return np.isin(column, codes)
+
+        for field in ("job_type", "work_mode"):
+            values = filters.get(field)
+            if values:
+                codes = self._categoricals[field].codes_for(_normalize_enum(value) for value in values)
+                mask &= categorical_mask(field, codes)
+        for field in ("experience_level", "company_id", "status"):
+            value = filters.get(field)
+            if value:
+                mask &= categorical_mask(field, self._categoricals[field].codes_for([str(value)]))
+        location = filters.get("location")
+        if location:
+            needle = location.strip().lower()
+            locations = self._categoricals["location"]
+            codes = [code for code, value in enumerate(locations.values) if value and needle in value.lower()]
+            mask &= categorical_mask("location", codes)
+        salary = np.frombuffer(self._salary_min, dtype=np.float64)
+        if filters.get("salary_min"):
+            mask &= salary >= filters["salary_min"]
+        if filters.get("salary_max"):
+            mask &= salary <= filters["salary_max"]
+        skills = filters.get("skills")
+        if skills:
+            skill_mask = np.zeros(size, dtype=bool)
+            for skill in skills:
+                postings = self._postings.get(_SKILL_PREFIX + skill_key(str(skill)))
+                if postings is not None:
+                    skill_mask[np.frombuffer(postings[0], dtype=np.int32)] = True
+            mask &= skill_mask
+        return mask
+
+    def facet_counts(self, positions: np.ndarray, top: int = 20) -> Dict[str, List[Dict[str, Any]]]:
+        """Value counts of each facet field over a set of matched documents"""
+        facets = {}
+        for field in self.FACET_FIELDS:
+            categorical = self._categoricals[field]
+            column = np.frombuffer(categorical.column, dtype=np.int32)
+            counts = np.bincount(column[positions], minlength=len(categorical.values))
+            counts[0] = 0  # unset values are not a facet bucket
+            order = np.argsort(-counts, kind="stable")[:top]
+            facets[field] = [
+                {"value": categorical.values[code], "count": int(counts[code])}
+                for code in order if counts[code] > 0
+            ]
+        return facets
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        offset: int = 0,
+        limit: int = 20,
+        prefix: bool = True,
+        sort_by: Optional[str] = None,
+        sort_order: str = "desc",
+        include_facets: bool = False
+    ) -> Dict[str, Any]:
+        """Rank matching job ids.
+
+        With a query, results are ordered by BM25 relevance unless sort_by
+        is given; without one they are ordered by sort_by (created_at by
+        default).
+        """
+        size = len(self._job_ids)
+        mask = self._filter_mask(size, filters or {})
+        tokens = tokenize(query or "")
+        scores = None
+        if tokens:
+            scores = self._score(tokens, prefix, size)
+            mask &= scores > 0
+
+        positions = np.nonzero(mask)[0]
+        total = len(positions)
+
+        sort_columns = {
+            "created_at": self._created,
+            "salary_min": self._salary_min,
+            "salary_max": self._salary_max
+        }
+        if scores is not None and (sort_by is None or sort_by == "relevance"):
+            keys = -scores[positions]
+        else:
+            column = np.frombuffer(sort_columns.get(sort_by or "created_at", self._created), dtype=np.float64)
+            keys = np.nan_to_num(column[positions], nan=-np.inf)
+            keys = -keys if sort_order == "desc" else keys
+
+        end = offset + limit
+        if end < total:
+            top = np.argpartition(keys, end - 1)[:end]
+            top = top[np.argsort(keys[top], kind="stable")]
+        else:
+            top = np.argsort(keys, kind="stable")
+        page = positions[top[offset:end]]
+
+        result = {
+            "ids": [self._job_ids[position] for position in page],
+            "total": total,
+            "scores": [float(scores[position]) for position in page] if scores is not None else None
+        }
+        if include_facets:
+            result["facets"] = self.facet_counts(positions)
+        return result
+
+
+class JobSearchService:
+    """Keeps a JobSearchIndex in sync with the jobs collection"""
+
+    PROJECTION = {
+        "title": 1, "description": 1, "required_skills": 1, "preferred_skills": 1,
+        "keywords": 1, "tags": 1, "status": 1, "job_type": 1, "work_mode": 1,
+        "experience_level": 1, "location": 1, "company_id": 1, "salary_min": 1,
+        "salary_max": 1, "created_at": 1
+    }
+
+    def __init__(self, refresh_interval: int = 300):
+        self.refresh_interval = refresh_interval
+        self.index = JobSearchIndex()
+        self.ready = False
+        self._collection = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending_ops: Optional[List[Tuple[str, Any]]] = None
+
+    @staticmethod
+    def _build(jobs: List[Dict[str, Any]]) -> JobSearchIndex:
+        index = JobSearchIndex()
+        for job in jobs:
+            index.upsert(job)
+        return index
+
+    async def rebuild(self):
+        """Rebuild the index from the jobs collection without blocking the event loop"""
+        if self._collection is None:
+            return
+        self._pending_ops = []
+        try:
+            jobs = [job async for job in self._collection.find({}, self.PROJECTION)]
+            index = await asyncio.to_thread(self._build, jobs)
+            # Replay writes that happened while the new index was being built
+            for op, value in self._pending_ops:
+                index.upsert(value) if op == "upsert" else index.remove(value)
+            self.index = index
+            self.ready = True
+            logger.info(f"Job search index rebuilt with {len(index)} jobs")
+        finally:
+            self._pending_ops = None
+
+    def upsert(self, job: Dict[str, Any]):
+        """Index a created or updated job"""
+        self.index.upsert(job)
+        if self._pending_ops is not None:
+            self._pending_ops.append(("upsert", job))
+
+    def remove(self, job_id: str):
+        """Drop a deleted job"""
+        self.index.remove(job_id)
+        if self._pending_ops is not None:
+            self._pending_ops.append(("remove", job_id))
+
+    def search(self, *args, **kwargs) -> Dict[str, Any]:
+        """Search the current index (see JobSearchIndex.search)"""
+        return self.index.search(*args, **kwargs)
+
+    async def _run(self):
+        while True:
+            try:
+                await self.rebuild()
+            except Exception as e:
+                logger.error(f"Job search index rebuild failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self, collection):
+        """Build the index in the background and refresh it periodically"""
+        self._collection = collection
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global instance
+job_search = JobSearchService(refresh_interval=settings.SEARCH_INDEX_REFRESH_SECONDS)
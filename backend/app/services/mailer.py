@@ -0,0 +1,190 @@
+"""
+Async SMTP mailer with a pool of reused, authenticated connections
+"""
+import asyncio
+import time
+from email.message import EmailMessage
+from email.utils import formataddr, make_msgid
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import aiosmtplib
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Mailer:
+    """Sends email over at most pool_size SMTP connections kept open between messages.
+
+    A connection pays for TCP, STARTTLS and AUTH once and then carries many
+    messages; it is replaced after max_messages_per_connection messages or
+    idle_timeout seconds unused, and a pooled connection the server has
+    dropped is reopened transparently. Sends are spaced to stay under
+    rate_per_second across the whole pool. Without implicit TLS, STARTTLS
+    is required unless start_tls is turned off, so a server (or anyone in
+    between) that does not offer it fails the connect rather than receiving
+    credentials in plaintext.
+    """
+
+    def __init__(
+        self,
+        hostname: str,
+        port: int,
+        username: Optional[str] = None,
+        password: Optional[str] = None,
+        sender: str = "",
+        sender_name: Optional[str] = None,
+        use_tls: bool = False,
+        start_tls: bool = True,
+        pool_size: int = 3,
+        rate_per_second: float = 10.0,
+        max_messages_per_connection: int = 100,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0
+    ):
+        self.hostname = hostname
+        self.port = port
+        self.username = username
+        self.password = password
+        self.sender = sender
+        self.sender_name = sender_name
+        self.use_tls = use_tls
+        self.start_tls = start_tls
+        self.pool_size = pool_size
+        self.rate_per_second = rate_per_second
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(pool_size)
+        # (client, last used, messages sent on it)
+        self._idle: List[Tuple[aiosmtplib.SMTP, float, int]] = []
+        self._next_send = 0.0
+        self.connections_opened = 0
+        self.reconnects = 0
+        self.sent = 0
+        self.failed = 0
+
+    def build_message(self, to_email: str, subject: str, body: str, is_html: bool = False) -> EmailMessage:
+        """A single-part message from the configured sender"""
+        message = EmailMessage()
+        message["From"] = formataddr((self.sender_name, self.sender)) if self.sender_name else self.sender
+        message["To"] = to_email
+        message["Subject"] = subject
+        message["Message-ID"] = make_msgid(domain=self.sender.rpartition("@")[2] or None)
+        message.set_content(body, subtype="html" if is_html else "plain")
+        return message
+
+    async def _throttle(self):
+        if self.rate_per_second <= 0:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next_send)
+        self._next_send = slot + 1 / self.rate_per_second
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        # start_tls=True fails the connect if the server does not offer STARTTLS;
+        # login happens inside connect()
+        client = aiosmtplib.SMTP(
+            hostname=self.hostname,
+            port=self.port,
+            username=self.username or None,
+            password=self.password or None,
+            use_tls=self.use_tls,
+            start_tls=self.start_tls and not self.use_tls,
+            timeout=self.timeout
+        )
+        try:
+            await client.connect()
+        except Exception:
+            # A failed STARTTLS or login leaves the socket open
+            client.close()
+            raise
+        self.connections_opened += 1
+        return client
+
+    @staticmethod
+    async def _discard(client: aiosmtplib.SMTP):
+        try:
+            if client.is_connected:
+                await client.quit()
+        except Exception:
+            client.close()
+
+    async def _acquire(self) -> Tuple[aiosmtplib.SMTP, int]:
+        while self._idle:
+            client, last_used, sent = self._idle.pop()
+            fresh = time.monotonic() - last_used < self.idle_timeout and sent < self.max_messages_per_connection
+            if fresh and client.is_connected:
+                return client, sent
+            await self._discard(client)
+        return await self._connect(), 0
+
+    async def send_message(self, message: EmailMessage):
+        """Send a prepared message; raises aiosmtplib errors on failure"""
+        await self._throttle()
+        async with self._slots:
+            for attempt in range(2):
+                client, sent = await self._acquire()
+                try:
+                    await client.send_message(message)
+                except aiosmtplib.SMTPServerDisconnected:
+                    # The server closed a pooled connection while it sat idle
+                    client.close()
+                    if attempt:
+                        self.failed += 1
+                        raise
+                    self.reconnects += 1
+                    continue
+                except Exception:
+                    self.failed += 1
+                    await self._discard(client)
+                    raise
+                self._idle.append((client, time.monotonic(), sent + 1))
+                self.sent += 1
+                return
+
+    async def send(self, to_email: str, subject: str, body: str, is_html: bool = False):
+        """Send one email; raises on failure"""
+        await self.send_message(self.build_message(to_email, subject, body, is_html))
+
+    async def send_many(self, messages: Iterable[EmailMessage]) -> List[Optional[Exception]]:
+        """Send a batch across the pool; returns None or the error for each message, in order"""
+        results = await asyncio.gather(*(self.send_message(message) for message in messages), return_exceptions=True)
+        return [result if isinstance(result, Exception) else None for result in results]
+
+    async def close(self):
+        """QUIT every pooled connection"""
+        idle, self._idle = self._idle, []
+        for client, _, _ in idle:
+            await self._discard(client)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "pool_size": self.pool_size,
+            "idle_connections": len(self._idle),
+            "connections_opened": self.connections_opened,
+            "reconnects": self.reconnects,
+            "sent": self.sent,
+            "failed": self.failed
+        }
+
+
+# Global instance
+mailer = Mailer(
+    hostname=settings.MAIL_SERVER,
+    port=settings.MAIL_PORT,
+    username=settings.MAIL_USERNAME,
+    password=settings.MAIL_PASSWORD,
+    sender=settings.MAIL_FROM,
+    sender_name=settings.MAIL_FROM_NAME,
+    use_tls=settings.MAIL_USE_TLS,
+    start_tls=settings.MAIL_START_TLS,
+    pool_size=settings.MAIL_POOL_SIZE,
+    rate_per_second=settings.MAIL_RATE_PER_SECOND,
+    max_messages_per_connection=settings.MAIL_MAX_MESSAGES_PER_CONNECTION,
+    idle_timeout=settings.MAIL_CONNECTION_IDLE_SECONDS,
+    timeout=settings.MAIL_TIMEOUT_SECONDS
+)
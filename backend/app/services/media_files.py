@@ -0,0 +1,195 @@
+"""
+Static file serving for uploads with byte ranges, strong ETags and long-lived caching
+"""
+import mimetypes
+import os
+import re
+import stat
+from email.utils import formatdate, parsedate
+from typing import Optional, Tuple
+import anyio
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Receive, Scope, Send
+
+# Content-addressed blobs never change, so their hash is a strong ETag
+_BLOB_PATH = re.compile(r"(?:^|/)blobs/[0-9a-f]{2}/([0-9a-f]{64})(\.[A-Za-z0-9]+)?$")
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+# Types worth serving from a .br/.gz sibling when one exists
+COMPRESSIBLE_PREFIXES = ("text/", "application/json", "application/javascript", "image/svg+xml", "application/msword")
+PRECOMPRESSED = (("br", ".br"), ("gzip", ".gz"))
+
+
+class MediaFileResponse(Response):
+    """Sends a byte span of a file.
+
+    Uses the ASGI zero-copy send extension when the server offers it, and
+    otherwise streams the span in chunks read off the event loop.
+    """
+
+    chunk_size = 256 * 1024
+
+    def __init__(self, path: str, start: int, end: int, status_code: int, headers: dict, send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.send_body = send_body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        count = self.end - self.start + 1
+        if not self.send_body or count <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as handle:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": handle,
+                    "offset": self.start,
+                    "count": count,
+                    "more_body": False
+                })
+            return
+
+        async with await anyio.open_file(self.path, "rb") as handle:
+            await handle.seek(self.start)
+            remaining = count
+            while remaining > 0:
+                chunk = await handle.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                # File shrank underneath us; end the response rather than hang
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class MediaFiles(StaticFiles):
+    """StaticFiles for the uploads directory.
+
+    - Single byte ranges (206/416, If-Range) so audio and video can seek
+    - Strong ETags and conditional GET (304)
+    - Content-addressed blobs are cached for a year as immutable; other
+      files must be revalidated
+    - Precompressed .br/.gz siblings for compressible types
+    - Scratch files of in-progress uploads are never served
+    """
+
+    def __init__(self, *args, hidden_prefixes: Tuple[str, ...] = ("tmp/",), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.hidden_prefixes = hidden_prefixes
+
+    def get_path(self, scope: Scope) -> str:
+        path = super().get_path(scope)
+        if path.replace(os.sep, "/").startswith(self.hidden_prefixes):
+            raise HTTPException(status_code=404)
+        return path
+
+    @staticmethod
+    def parse_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+        """(start, end) of a single byte range; None to ignore it; (size, size) if unsatisfiable"""
+        match = _RANGE.match(value.strip())
+        if not match:
+            # Malformed or multiple ranges: answer with the whole file
+            return None
+        first, last = match.groups()
+        if not first and not last:
+            return None
+        if not first:
+            suffix = int(last)
+            if suffix == 0:
+                return size, size
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size:
+            return size, size
+        if end < start:
+            return None
+        return start, end
+
+    def _precompressed(self, full_path: str, request_headers: Headers) -> Optional[Tuple[str, str, os.stat_result]]:
+        """A .br/.gz sibling the client accepts, as (encoding, path, stat)"""
+        accepted = request_headers.get("accept-encoding", "")
+        for encoding, suffix in PRECOMPRESSED:
+            if encoding in accepted:
+                try:
+                    sibling_stat = os.stat(f"{full_path}{suffix}")
+                except OSError:
+                    continue
+                if stat.S_ISREG(sibling_stat.st_mode):
+                    return encoding, f"{full_path}{suffix}", sibling_stat
+        return None
+
+    def file_response(self, full_path, stat_result: os.stat_result, scope: Scope, status_code: int = 200) -> Response:
+        request_headers = Headers(scope=scope)
+        send_body = scope["method"] != "HEAD"
+        path = str(full_path)
+        media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        blob = _BLOB_PATH.search(path.replace(os.sep, "/"))
+
+        headers = {
+            "etag": f'"{blob.group(1)}"' if blob else f'"{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}"',
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE_CONTROL if blob else REVALIDATE_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+            "content-type": media_type,
+        }
+        range_header = request_headers.get("range")
+        if media_type.startswith(COMPRESSIBLE_PREFIXES):
+            headers["vary"] = "Accept-Encoding"
+            # Byte ranges always refer to the identity encoding
+            precompressed = None if range_header else self._precompressed(path, request_headers)
+            if precompressed is not None:
+                encoding, path, stat_result = precompressed
+                headers["content-encoding"] = encoding
+                headers["etag"] = f'{headers["etag"][:-1]}-{encoding}"'
+
+        if self.is_not_modified(Headers(headers), request_headers):
+            return Response(status_code=304, headers={k: v for k, v in headers.items() if k != "content-type"})
+
+        size = stat_result.st_size
+        if range_header and self._if_range_matches(request_headers.get("if-range"), headers):
+            span = self.parse_range(range_header, size)
+            if span is not None:
+                start, end = span
+                if start >= size:
+                    headers["content-range"] = f"bytes */{size}"
+                    headers["content-length"] = "0"
+                    return MediaFileResponse(path, 0, -1, 416, headers, send_body=False)
+                headers["content-range"] = f"bytes {start}-{end}/{size}"
+                headers["content-length"] = str(end - start + 1)
+                return MediaFileResponse(path, start, end, 206, headers, send_body)
+
+        headers["content-length"] = str(size)
+        return MediaFileResponse(path, 0, size - 1, status_code, headers, send_body)
+
+    @staticmethod
+    def _if_range_matches(if_range: Optional[str], headers: dict) -> bool:
+        """A Range request with If-Range only applies if the validator still matches"""
+        if not if_range:
+            return True
+        if if_range.startswith('"') or if_range.startswith("W/"):
+            return if_range == headers["etag"]
+        since, modified = parsedate(if_range), parsedate(headers["last-modified"])
+        return since is not None and modified is not None and since >= modified
+
+    def is_not_modified(self, response_headers: Headers, request_headers: Headers) -> bool:
+        """If-None-Match (any listed tag, or *) takes precedence over If-Modified-Since"""
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = response_headers["etag"]
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags
+        return super().is_not_modified(response_headers, request_headers)
+
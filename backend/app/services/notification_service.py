@@ -1,10 +1,16 @@
 """
 Notification service for sending notifications to users
 """
+import uuid
 from datetime import datetime
-from typing import Optional, Dict, Any
-from app.db.database import get_notifications_collection
+from typing import Optional, Dict, Any, AsyncIterator, Iterable, List, Union
+from bson import ObjectId
+from pymongo.errors import BulkWriteError
+from app.core.config import settings
+from app.db.database import get_applications_collection, get_notifications_collection, get_users_collection
 from app.schemas.mongodb_schemas import MongoDBNotification
+from app.services.skill_taxonomy import skill_keys
+from app.services.task_queue import PRIORITY_LOW, task_queue
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,8 +19,40 @@ logger = logging.getLogger(__name__)
 class NotificationService:
     """Service for creating and managing notifications"""
     
+    # Only the fields fan-out needs from each recipient
+    RECIPIENT_PROJECTION = {"email": 1, "push_notifications": 1, "email_notifications": 1}
+
     def __init__(self):
         self.notifications_collection = get_notifications_collection()
+        self.users_collection = get_users_collection()
+        self.fan_outs = 0
+        self.fan_out_inserted = 0
+        self.fan_out_duplicates = 0
+        self.fan_out_failed = 0
+        self.fan_out_emailed = 0
+
+    @staticmethod
+    def _notification_doc(
+        user_id: str,
+        title: str,
+        message: str,
+        notification_type: str,
+        data: Optional[Dict[str, Any]],
+        action_url: Optional[str],
+        created_at: datetime
+    ) -> Dict[str, Any]:
+        return {
+            "user_id": user_id,
+            "title": title,
+            "message": message,
+            "notification_type": notification_type,
+            "data": dict(data or {}),
+            "action_url": action_url,
+            "is_read": False,
+            "is_archived": False,
+            "created_at": created_at,
+            "read_at": None
+        }
     
     async def create_notification(
         self,
@@ -27,18 +65,9 @@ class NotificationService:
     ) -> Optional[MongoDBNotification]:
         """Create a new notification for a user"""
         try:
-            notification_doc = {
-                "user_id": user_id,
-                "title": title,
-                "message": message,
-                "notification_type": notification_type,
-                "data": data or {},
-                "action_url": action_url,
-                "is_read": False,
-                "is_archived": False,
-                "created_at": datetime.utcnow(),
-                "read_at": None
-            }
+            notification_doc = self._notification_doc(
+                user_id, title, message, notification_type, data, action_url, datetime.utcnow()
+            )
             
             result = await self.notifications_collection.insert_one(notification_doc)
             notification_doc["_id"] = str(result.inserted_id)
@@ -144,6 +173,213 @@ class NotificationService:
             logger.error(f"Error creating new application notification: {e}")
             return None
 
+    async def _insert_batch(self, docs: List[Dict[str, Any]], counts: Dict[str, int]):
+        try:
+            result = await self.notifications_collection.insert_many(docs, ordered=False)
+            counts["inserted"] += len(result.inserted_ids)
+        except BulkWriteError as e:
+            # Unordered: every document without an error was still written
+            errors = e.details.get("writeErrors", [])
+            failures = [error for error in errors if error.get("code") != 11000]
+            counts["inserted"] += e.details.get("nInserted", 0)
+            counts["duplicates"] += len(errors) - len(failures)
+            counts["failed"] += len(failures)
+            if failures:
+                logger.error(f"{len(failures)} notifications in a fan-out batch failed: {failures[0].get('errmsg')}")
+        except Exception as e:
+            counts["failed"] += len(docs)
+            logger.error(f"Fan-out batch of {len(docs)} notifications failed: {e}")
+
+    async def _deliver(
+        self,
+        recipients: AsyncIterator[Dict[str, Any]],
+        title: str,
+        message: str,
+        notification_type: str,
+        data: Optional[Dict[str, Any]],
+        action_url: Optional[str],
+        send_email: bool,
+        fan_out_id: Optional[str],
+        batch_size: int
+    ) -> Dict[str, int]:
+        fan_out_id = fan_out_id or uuid.uuid4().hex
+        created_at = datetime.utcnow()
+        email_body = f"{message}\n\n{settings.EMAIL_APP_URL.rstrip('/')}{action_url}" if action_url else message
+        counts = {"recipients": 0, "inserted": 0, "duplicates": 0, "failed": 0, "emailed": 0, "skipped": 0}
+        batch: List[Dict[str, Any]] = []
+
+        async for user in recipients:
+            counts["recipients"] += 1
+            user_id = str(user["_id"])
+            in_app = user.get("push_notifications", True) is not False
+            by_email = send_email and user.get("email_notifications", True) is not False and bool(user.get("email"))
+            if not in_app and not by_email:
+                counts["skipped"] += 1
+                continue
+
+            if in_app:
+                doc = self._notification_doc(user_id, title, message, notification_type, data, action_url, created_at)
+                doc["fan_out_id"] = fan_out_id
+                batch.append(doc)
+                if len(batch) >= batch_size:
+                    await self._insert_batch(batch, counts)
+                    batch = []
+            if by_email:
+                task_id = await task_queue.enqueue(
+                    "email.send",
+                    priority=PRIORITY_LOW,
+                    idempotency_key=f"{fan_out_id}:{user_id}",
+                    to_email=user["email"],
+                    subject=title,
+                    body=email_body
+                )
+                if task_id:
+                    counts["emailed"] += 1
+
+        if batch:
+            await self._insert_batch(batch, counts)
+
+        self.fan_outs += 1
+        self.fan_out_inserted += counts["inserted"]
+        self.fan_out_duplicates += counts["duplicates"]
+        self.fan_out_failed += counts["failed"]
+        self.fan_out_emailed += counts["emailed"]
+        logger.info(f"Fan-out {fan_out_id} ({notification_type}): {counts}")
+        return counts
+
+    async def fan_out(
+        self,
+        user_filter: Dict[str, Any],
+        title: str,
+        message: str,
+        notification_type: str,
+        data: Optional[Dict[str, Any]] = None,
+        action_url: Optional[str] = None,
+        preference: Optional[str] = None,
+        send_email: bool = False,
+        fan_out_id: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Notify every user matching user_filter, streamed from a cursor and inserted in batches.
+
+        preference names an opt-in recipients must not have switched off (e.g. "job_alerts").
+        push_notifications gates the in-app notification and email_notifications the
+        emailed copy. Reusing a fan_out_id (a retried task) skips users who already have it.
+        """
+        batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+        query = dict(user_filter)
+        if preference:
+            query[preference] = {"$ne": False}
+        cursor = self.users_collection.find(query, self.RECIPIENT_PROJECTION, batch_size=batch_size)
+        return await self._deliver(
+            cursor, title, message, notification_type, data, action_url, send_email, fan_out_id, batch_size
+        )
+
+    async def _users_by_id(
+        self,
+        user_ids: Union[Iterable[str], AsyncIterator[str]],
+        preference: Optional[str],
+        batch_size: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        async def each_id():
+            if hasattr(user_ids, "__aiter__"):
+                async for user_id in user_ids:
+                    yield user_id
+            else:
+                for user_id in user_ids:
+                    yield user_id
+
+        async def lookup(chunk: List[ObjectId]):
+            query: Dict[str, Any] = {"_id": {"$in": chunk}}
+            if preference:
+                query[preference] = {"$ne": False}
+            return await self.users_collection.find(query, self.RECIPIENT_PROJECTION).to_list(length=None)
+
+        chunk: List[ObjectId] = []
+        async for user_id in each_id():
+            if ObjectId.is_valid(user_id):
+                chunk.append(ObjectId(user_id))
+            if len(chunk) >= batch_size:
+                for user in await lookup(chunk):
+                    yield user
+                chunk = []
+        if chunk:
+            for user in await lookup(chunk):
+                yield user
+
+    async def fan_out_to_users(
+        self,
+        user_ids: Union[Iterable[str], AsyncIterator[str]],
+        title: str,
+        message: str,
+        notification_type: str,
+        data: Optional[Dict[str, Any]] = None,
+        action_url: Optional[str] = None,
+        preference: Optional[str] = None,
+        send_email: bool = False,
+        fan_out_id: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Same as fan_out for a stream of user ids, looked up a batch at a time"""
+        batch_size = batch_size or settings.NOTIFICATION_FANOUT_BATCH_SIZE
+        return await self._deliver(
+            self._users_by_id(user_ids, preference, batch_size),
+            title, message, notification_type, data, action_url, send_email, fan_out_id, batch_size
+        )
+
+    async def notify_job_closed(self, job_id: str, job_title: str, company_name: str) -> Dict[str, int]:
+        """Tell everyone who applied to a job that it has closed"""
+        applications = get_applications_collection().find(
+            {"job_id": job_id}, {"applicant_id": 1}, batch_size=settings.NOTIFICATION_FANOUT_BATCH_SIZE
+        )
+        applicant_ids = (application["applicant_id"] async for application in applications if application.get("applicant_id"))
+        return await self.fan_out_to_users(
+            applicant_ids,
+            title="Job Closed",
+            message=f"{job_title} at {company_name} is no longer accepting applications. Your application is still on file with the employer.",
+            notification_type="job_closed",
+            data={"job_id": job_id, "job_title": job_title, "company_name": company_name},
+            action_url=f"/jobs/{job_id}",
+            fan_out_id=f"job_closed:{job_id}"
+        )
+
+    async def notify_job_posted(
+        self,
+        job_id: str,
+        job_title: str,
+        company_name: str,
+        skills: List[str]
+    ) -> Dict[str, int]:
+        """Alert job seekers whose skills overlap a newly posted job's required skills.
+
+        Matches on canonical skill keys, so "JS" on a profile matches a job
+        asking for JavaScript, and the lookup uses the users.skill_keys index.
+        """
+        keys = skill_keys(skills)
+        if not keys:
+            return {"recipients": 0, "inserted": 0, "duplicates": 0, "failed": 0, "emailed": 0, "skipped": 0}
+        return await self.fan_out(
+            {"role": "jobseeker", "is_active": {"$ne": False}, "skill_keys": {"$in": keys}},
+            title="💼 New Job Matching Your Skills",
+            message=f"{company_name} just posted {job_title}, which matches skills on your profile.",
+            notification_type="job_posted",
+            data={"job_id": job_id, "job_title": job_title, "company_name": company_name},
+            action_url=f"/jobs/{job_id}",
+            preference="job_alerts",
+            send_email=True,
+            fan_out_id=f"job_posted:{job_id}"
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Fan-out counters for monitoring"""
+        return {
+            "fan_outs": self.fan_outs,
+            "inserted": self.fan_out_inserted,
+            "duplicates": self.fan_out_duplicates,
+            "failed": self.fan_out_failed,
+            "emailed": self.fan_out_emailed
+        }
+
 
 # Global instance
 notification_service = NotificationService()
\ No newline at end of file
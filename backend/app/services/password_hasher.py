@@ -0,0 +1,104 @@
+"""
+Password hashing and verification in a bounded thread pool
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+import bcrypt
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasherBusy(Exception):
+    """Too many password checks are already queued"""
+
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop.
+
+    bcrypt releases the GIL, so a few worker threads hash in parallel while
+    the loop keeps serving other requests. At most max_workers + max_pending
+    calls are admitted; beyond that a call fails fast with
+    PasswordHasherBusy, so a login burst cannot grow the backlog without
+    bound.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.total_wait_seconds = 0.0
+
+    async def _run(self, func, *args):
+        if self.in_flight >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise PasswordHasherBusy("Too many sign-in attempts in progress, try again shortly")
+        self.in_flight += 1
+        queued_at = time.perf_counter()
+        started = None
+
+        def timed():
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args)
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, timed)
+        finally:
+            finished = time.perf_counter()
+            self.in_flight -= 1
+            if started is not None:
+                elapsed = finished - started
+                self.calls += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+                self.total_wait_seconds += started - queued_at
+
+    @staticmethod
+    def _hash(password: str) -> str:
+        return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+    @staticmethod
+    def _verify(password: str, hashed_password: str) -> bool:
+        return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with a fresh salt"""
+        return await self._run(self._hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored bcrypt hash"""
+        return await self._run(self._verify, password, hashed_password)
+
+    def shutdown(self):
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "waiting": max(0, self.in_flight - self.max_workers),
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2),
+            "avg_wait_ms": round(self.total_wait_seconds / self.calls * 1000, 2) if self.calls else 0.0
+        }
+
+
+# Global instance
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS or min(4, os.cpu_count() or 1),
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING
+)
@@ -0,0 +1,199 @@
+"""
+Render cache for generated PDFs: in-memory LRU in front of a disk tier
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Relative cache directories are resolved here, not against the working directory
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class PDFRenderCache:
+    """Rendered PDF bytes keyed by a canonical hash of the input and the template version.
+
+    The memory tier is bounded by total bytes and evicts least recently used
+    entries. The disk tier survives restarts and is shared by workers on the
+    same host. Its files hold personal data, so each expires disk_ttl
+    seconds after it was written: expired files are ignored on read and
+    deleted by a sweep that runs at least every disk_ttl / 4 seconds, or
+    when the tier grows past its budget (oldest files go first). purge()
+    empties both tiers. The directory is created on the first write. Used
+    from worker threads, hence the lock.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str],
+        memory_bytes: int = 32 * 1024 * 1024,
+        disk_bytes: int = 512 * 1024 * 1024,
+        disk_ttl: int = 86400
+    ):
+        self.directory = os.path.join(BACKEND_DIR, directory) if directory and disk_bytes > 0 else None
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self.disk_ttl = disk_ttl
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_used = 0
+        self._disk_used: Optional[int] = None
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(data: Any, version: str) -> str:
+        """Hash that is the same for equal inputs regardless of key order"""
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{version}\0{canonical}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.pdf")
+
+    def _remember(self, key: str, content: bytes):
+        if len(content) > self.memory_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_used -= len(previous)
+            self._entries[key] = content
+            self._memory_used += len(content)
+            while self._memory_used > self.memory_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._memory_used -= len(evicted)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached bytes for key from memory, else disk, else None"""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return content
+
+        if self.directory:
+            path = self._path(key)
+            try:
+                if time.time() - os.stat(path).st_mtime > self.disk_ttl:
+                    os.remove(path)
+                    content = None
+                else:
+                    with open(path, "rb") as handle:
+                        content = handle.read()
+            except OSError:
+                content = None
+            if content is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, content)
+                return content
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, content: bytes):
+        """Store rendered bytes in both tiers"""
+        self._remember(key, content)
+        if not self.directory:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as handle:
+                handle.write(content)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write PDF cache entry: {e}")
+            return
+        with self._lock:
+            if self._disk_used is not None:
+                self._disk_used += len(content)
+            due = self._disk_used is None or self._disk_used > self.disk_bytes or time.time() >= self._next_sweep
+        if due:
+            self._trim_disk()
+
+    def _trim_disk(self):
+        """Delete expired files, then the oldest until the tier is under 80% of budget"""
+        now = time.time()
+        with self._lock:
+            self._next_sweep = now + self.disk_ttl / 4
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    info = os.stat(path)
+                    if now - info.st_mtime > self.disk_ttl:
+                        os.remove(path)
+                        continue
+                except OSError:
+                    continue
+                files.append((info.st_mtime, info.st_size, path))
+        used = sum(size for _, size, _ in files)
+        if used > self.disk_bytes:
+            target = self.disk_bytes * 0.8
+            for _, size, path in sorted(files):
+                if used <= target:
+                    break
+                try:
+                    os.remove(path)
+                    used -= size
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_used = used
+
+    def clear(self):
+        """Empty the memory tier (the disk tier is left to expiry and trimming)"""
+        with self._lock:
+            self._entries.clear()
+            self._memory_used = 0
+
+    def purge(self):
+        """Empty both tiers, deleting every cached file"""
+        self.clear()
+        if not self.directory:
+            return
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                try:
+                    os.remove(os.path.join(root, name))
+                except OSError:
+                    pass
+        with self._lock:
+            self._disk_used = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rates and sizes for monitoring"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "memory_bytes": self._memory_used,
+                "disk_bytes": self._disk_used,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global instance
+pdf_render_cache = PDFRenderCache(
+    settings.PDF_CACHE_DIR,
+    memory_bytes=settings.PDF_CACHE_MEMORY_BYTES,
+    disk_bytes=settings.PDF_CACHE_DISK_BYTES,
+    disk_ttl=settings.PDF_CACHE_DISK_TTL_SECONDS
+)
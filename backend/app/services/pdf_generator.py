@@ -11,12 +11,17 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from fastapi import HTTPException, status
+from app.services.pdf_cache import PDFRenderCache, pdf_render_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
 class PDFGenerator:
-    def __init__(self):
+    # Bump whenever the layout or styles change so cached renders are not reused
+    TEMPLATE_VERSION = "1"
+
+    def __init__(self, cache: PDFRenderCache = None):
+        self.cache = cache
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
     
@@ -109,7 +114,18 @@ class PDFGenerator:
         ))
 
     def generate_resume_pdf(self, resume_data: Dict[str, Any]) -> bytes:
-        """Generate a PDF resume from resume data"""
+        """Generate a PDF resume from resume data, reusing an earlier render of the same data"""
+        if self.cache is None:
+            return self.render_resume_pdf(resume_data)
+        key = self.cache.key(resume_data, self.TEMPLATE_VERSION)
+        content = self.cache.get(key)
+        if content is None:
+            content = self.render_resume_pdf(resume_data)
+            self.cache.put(key, content)
+        return content
+
+    def render_resume_pdf(self, resume_data: Dict[str, Any]) -> bytes:
+        """Lay out and render the resume with ReportLab"""
         try:
             logger.info("Starting PDF generation")
             logger.info(f"Resume data keys: {list(resume_data.keys()) if resume_data else 'None'}")
@@ -415,4 +431,4 @@ class PDFGenerator:
             return str(date_value)
 
 # Create singleton instance
-pdf_generator = PDFGenerator() 
\ No newline at end of file
+pdf_generator = PDFGenerator(cache=pdf_render_cache) 
\ No newline at end of file
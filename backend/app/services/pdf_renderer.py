@@ -0,0 +1,100 @@
+"""
+PDF rendering in a pool of worker processes
+"""
+import asyncio
+import os
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.services.pdf_cache import PDFRenderCache, pdf_render_cache
+from app.services.pdf_generator import PDFGenerator
+from app.services.process_pool import ProcessWorkerPool, WorkerPoolBusy
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Per-process generator, built once by the pool initializer
+_worker_generator: Optional[PDFGenerator] = None
+
+# Raised when the render queue is full or no worker frees up in time
+PDFRenderBusy = WorkerPoolBusy
+
+
+def _init_worker():
+    global _worker_generator
+    _worker_generator = PDFGenerator()
+
+
+def _render_in_worker(resume_data: Dict[str, Any]) -> bytes:
+    try:
+        return _worker_generator.render_resume_pdf(resume_data)
+    except Exception as e:
+        # HTTPException cannot be pickled back to the parent
+        raise RuntimeError(getattr(e, "detail", None) or str(e)) from None
+
+
+class PDFRenderPool:
+    """Renders resume PDFs in worker processes so layout never blocks the event loop.
+
+    Each worker keeps a PDFGenerator with its styles built. Cache lookups
+    happen in the API process first, so hits never cross a process boundary.
+    Queue bounds and timeouts are those of ProcessWorkerPool: the render
+    timeout starts when a worker picks the job up, and a render that overruns
+    it costs only its own worker.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        timeout: float = 20.0,
+        queue_timeout: Optional[float] = None,
+        cache: Optional[PDFRenderCache] = None
+    ):
+        self.pool = ProcessWorkerPool(
+            "PDF rendering",
+            max_workers=max_workers,
+            max_pending=max_pending,
+            timeout=timeout,
+            queue_timeout=queue_timeout,
+            initializer=_init_worker
+        )
+        self.max_workers = max_workers
+        self.cache = cache
+        self.cache_hits = 0
+
+    async def start(self):
+        """Start the workers and wait until each has built its generator"""
+        await self.pool.start()
+
+    async def render_resume(self, resume_data: Dict[str, Any]) -> bytes:
+        """Rendered resume PDF, from the cache or a worker process"""
+        key = None
+        if self.cache is not None:
+            key = self.cache.key(resume_data, PDFGenerator.TEMPLATE_VERSION)
+            content = self.cache.get(key)
+            if content is not None:
+                self.cache_hits += 1
+                return content
+
+        content = await self.pool.submit(_render_in_worker, resume_data)
+        if key is not None:
+            await asyncio.to_thread(self.cache.put, key, content)
+        return content
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self.pool.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {**self.pool.stats(), "cache_hits": self.cache_hits}
+
+
+# Global instance
+pdf_renderer = PDFRenderPool(
+    max_workers=settings.PDF_RENDER_WORKERS or min(2, os.cpu_count() or 1),
+    max_pending=settings.PDF_RENDER_MAX_PENDING,
+    timeout=settings.PDF_RENDER_TIMEOUT_SECONDS,
+    queue_timeout=settings.PDF_RENDER_QUEUE_TIMEOUT_SECONDS,
+    cache=pdf_render_cache
+)
@@ -0,0 +1,95 @@
+"""
+Short-lived cache of authenticated users, keyed by token subject
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+from app.schemas.mongodb_schemas import MongoDBUser
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PrincipalCache:
+    """LRU of validated user models so authenticated requests skip the users lookup.
+
+    Entries live for a few seconds only, which bounds how stale a user can be
+    on workers that did not see an update. Writes to a user in this process
+    invalidate the entry immediately.
+    """
+
+    def __init__(self, ttl: int = 30, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, MongoDBUser]]" = OrderedDict()
+        # Sync handlers invalidate from the threadpool
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, subject: str) -> Optional[MongoDBUser]:
+        """Return the cached user for a token subject, or None"""
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[subject]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(subject)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, subject: str, user: MongoDBUser):
+        """Cache a validated user under its token subject"""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str):
+        """Drop the cached user for a token subject (email)"""
+        with self._lock:
+            if self._entries.pop(subject, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_user_id(self, user_id: Any):
+        """Drop a cached user by user_id or document _id"""
+        user_id = str(user_id)
+        with self._lock:
+            subjects = [
+                subject for subject, (_, user) in self._entries.items()
+                if user.user_id == user_id or user.id == user_id
+            ]
+            for subject in subjects:
+                del self._entries[subject]
+            self.invalidations += len(subjects)
+
+    def clear(self):
+        """Drop every cached user"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global instance
+principal_cache = PrincipalCache(
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,180 @@
+"""
+Bounded pool of worker processes for CPU-heavy work behind async endpoints
+"""
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class WorkerPoolBusy(Exception):
+    """The pool's queue is full"""
+
+
+class ProcessWorkerPool:
+    """Runs picklable functions in spawned worker processes.
+
+    Each worker is a single-process executor, and a call is handed to a worker
+    only once it is idle, so the timeout covers running alone. At most
+    max_workers + max_pending calls are admitted; beyond that, or after
+    queue_timeout seconds waiting for a worker, submit fails with
+    WorkerPoolBusy. A call that runs past the timeout has its worker process
+    killed and replaced, since a running job cannot be cancelled; jobs on the
+    other workers carry on. A call whose worker died is retried once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int = 2,
+        max_pending: int = 32,
+        timeout: float = 20.0,
+        queue_timeout: Optional[float] = None,
+        initializer: Optional[Callable[[], None]] = None
+    ):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.queue_timeout = timeout if queue_timeout is None else queue_timeout
+        self.initializer = initializer
+        self._workers: Set[ProcessPoolExecutor] = set()
+        self._idle: Optional[asyncio.Queue] = None
+        self.in_flight = 0
+        self.calls = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _spawn(self) -> ProcessPoolExecutor:
+        # spawn: forking a process that runs an event loop and driver threads is unsafe
+        worker = ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer
+        )
+        self._workers.add(worker)
+        return worker
+
+    def _get_idle(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for _ in range(self.max_workers):
+                self._idle.put_nowait(self._spawn())
+        return self._idle
+
+    def _release(self, worker: ProcessPoolExecutor):
+        if worker in self._workers and self._idle is not None:
+            self._idle.put_nowait(worker)
+
+    def _release_from_thread(self, loop: asyncio.AbstractEventLoop, worker: ProcessPoolExecutor):
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release, worker)
+
+    def _ready(self, worker: ProcessPoolExecutor, future: asyncio.Future):
+        if not future.cancelled() and future.exception() is not None:
+            logger.error(f"{self.name} worker failed to start: {future.exception()}")
+        self._release(worker)
+
+    def _replace(self, worker: ProcessPoolExecutor):
+        """Kill a worker that is stuck or died and start another in its place"""
+        if worker not in self._workers:
+            return
+        self._workers.discard(worker)
+        self.restarts += 1
+        logger.warning(f"Replacing a {self.name} worker process")
+        # Private, but the only way to stop a job that is already running
+        for process in list((getattr(worker, "_processes", None) or {}).values()):
+            process.terminate()
+        worker.shutdown(wait=False, cancel_futures=True)
+        # The replacement takes calls once it has run the initializer
+        replacement = self._spawn()
+        future = asyncio.get_running_loop().run_in_executor(replacement, _ping)
+        future.add_done_callback(lambda done: self._ready(replacement, done))
+
+    async def start(self):
+        """Start the workers and wait until each has run the initializer"""
+        loop = asyncio.get_running_loop()
+        self._get_idle()
+        await asyncio.gather(*(loop.run_in_executor(worker, _ping) for worker in list(self._workers)))
+
+    async def _run(self, func: Callable, *args) -> Any:
+        loop = asyncio.get_running_loop()
+        idle = self._get_idle()
+        for attempt in range(2):
+            try:
+                worker = await asyncio.wait_for(idle.get(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise WorkerPoolBusy(f"{self.name} is busy, try again shortly") from None
+            future = None
+            broken = False
+            try:
+                future = worker.submit(func, *args)
+                return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                broken = True
+                raise
+            except BrokenProcessPool:
+                # The worker process crashed or was killed: replace it and retry once
+                broken = True
+                if attempt:
+                    raise
+            finally:
+                if broken:
+                    self._replace(worker)
+                elif future is None:
+                    self._release(worker)
+                else:
+                    # A cancelled caller leaves its job running; the worker is free when it ends
+                    future.add_done_callback(lambda _, worker=worker: self._release_from_thread(loop, worker))
+
+    async def submit(self, func: Callable, *args) -> Any:
+        """Run func(*args) in a worker process"""
+        if self.in_flight >= self.max_workers + self.max_pending:
+            self.rejected += 1
+            raise WorkerPoolBusy(f"{self.name} is busy, try again shortly")
+        self.in_flight += 1
+        started = time.perf_counter()
+        try:
+            return await self._run(func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.in_flight -= 1
+            self.calls += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        for worker in self._workers:
+            worker.shutdown(wait=False, cancel_futures=True)
+        self._workers.clear()
+        self._idle = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "idle_workers": self._idle.qsize() if self._idle is not None else self.max_workers,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 2)
+        }
@@ -0,0 +1,168 @@
+"""
+Bulk export of applicant resumes as a streamed ZIP archive
+"""
+import asyncio
+import re
+import zipfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.services.pdf_renderer import PDFRenderBusy, PDFRenderPool, pdf_renderer
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _ZipSink:
+    """Write-only file object for zipfile; collects output until it is drained.
+
+    Without tell/seek, zipfile writes data descriptors after each entry and
+    never goes back, so the archive can be sent while it is being built.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def resume_data_for_applicant(application: Dict[str, Any], user: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Resume builder data for an applicant, from their profile and application"""
+    user = user or {}
+    return {
+        "personalInfo": {
+            "name": application.get("applicant_name") or user.get("name") or "Applicant",
+            "email": application.get("applicant_email") or user.get("email"),
+            "phone": user.get("phone"),
+            "location": user.get("location"),
+            "summary": user.get("bio"),
+            "linkedIn": application.get("linkedin_url") or user.get("linkedin_url"),
+            "github": application.get("github_url") or user.get("github_url"),
+            "portfolio": application.get("portfolio_url") or user.get("portfolio_url")
+        },
+        "experience": user.get("experience") or [],
+        "education": user.get("education") or [],
+        "skills": user.get("skills") or [],
+        "projects": user.get("projects") or [],
+        "certifications": user.get("certifications") or []
+    }
+
+
+class ResumeExporter:
+    """Renders applicant resumes through the PDF pool and streams them as a ZIP.
+
+    Applications are read from a cursor in small batches and at most
+    `window` renders are outstanding, so memory stays flat however many
+    people applied. Entries are written in completion order. Applicants
+    whose resume fails to render are listed in errors.txt at the end instead
+    of aborting the download.
+    """
+
+    def __init__(self, renderer: PDFRenderPool, window: int = 8, busy_retries: int = 20):
+        self.renderer = renderer
+        self.window = window
+        self.busy_retries = busy_retries
+        self.exports = 0
+        self.entries = 0
+
+    @staticmethod
+    def entry_name(index: int, application: Dict[str, Any]) -> str:
+        name = re.sub(r"[^A-Za-z0-9]+", "_", application.get("applicant_name") or "applicant").strip("_").lower()
+        return f"{index:04d}_{name or 'applicant'}_{application['_id']}.pdf"
+
+    async def _render(self, resume_data: Dict[str, Any]) -> bytes:
+        for attempt in range(self.busy_retries + 1):
+            try:
+                return await self.renderer.render_resume(resume_data)
+            except PDFRenderBusy:
+                # Interactive requests have priority; back off and try again
+                if attempt == self.busy_retries:
+                    raise
+                await asyncio.sleep(min(2.0, 0.1 * (attempt + 1)))
+
+    async def _batches(self, applications_cursor, users_collection) -> AsyncIterator[List[tuple]]:
+        """(application, user profile) pairs, one users query per batch"""
+        batch: List[Dict[str, Any]] = []
+
+        async def with_users(applications):
+            emails = [a.get("applicant_email") for a in applications if a.get("applicant_email")]
+            users = {}
+            async for user in users_collection.find({"email": {"$in": emails}}):
+                users[user["email"]] = user
+            return [(a, users.get(a.get("applicant_email"))) for a in applications]
+
+        async for application in applications_cursor:
+            batch.append(application)
+            if len(batch) >= self.window:
+                yield await with_users(batch)
+                batch = []
+        if batch:
+            yield await with_users(batch)
+
+    async def stream_zip(self, applications_cursor, users_collection) -> AsyncIterator[bytes]:
+        """ZIP archive bytes, yielded as each resume is added"""
+        self.exports += 1
+        sink = _ZipSink()
+        archive = zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+        pending: Dict[asyncio.Task, str] = {}
+        failures: List[str] = []
+        index = 0
+
+        async def write_completed():
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = pending.pop(task)
+                try:
+                    content = task.result()
+                except Exception as e:
+                    failures.append(f"{name}: {e}")
+                    continue
+                info = zipfile.ZipInfo(name, date_time=datetime.utcnow().timetuple()[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                archive.writestr(info, content)
+                self.entries += 1
+
+        try:
+            async for batch in self._batches(applications_cursor, users_collection):
+                for application, user in batch:
+                    index += 1
+                    task = asyncio.create_task(self._render(resume_data_for_applicant(application, user)))
+                    pending[task] = self.entry_name(index, application)
+                    while len(pending) >= self.window:
+                        await write_completed()
+                        data = sink.drain()
+                        if data:
+                            yield data
+            while pending:
+                await write_completed()
+                data = sink.drain()
+                if data:
+                    yield data
+
+            if failures:
+                archive.writestr("errors.txt", "\n".join(failures) + "\n")
+            if index == 0:
+                archive.writestr("README.txt", "No applications for this job yet.\n")
+            archive.close()
+            yield sink.drain()
+        finally:
+            # Client went away or something failed: stop outstanding renders
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {"exports": self.exports, "entries": self.entries}
+
+
+# Global instance
+resume_exporter = ResumeExporter(pdf_renderer, window=max(2, pdf_renderer.max_workers * 2))
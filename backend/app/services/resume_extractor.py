@@ -0,0 +1,341 @@
+"""
+Single-pass extraction of structured resume fields from plain text
+"""
+import re
+from typing import Any, Dict, List, Optional
+from app.services.skill_taxonomy import (
+    CASE_SENSITIVE_ALIASES, CASE_SENSITIVE_LOWER, SKILL_PATTERN, canonical_skill, lowercase
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
+}
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sept?(?:ember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_DATE = r"(?:{month}\.?,?[ \t]+(?:19|20)\d\d|\d{{1,2}}/(?:19|20)\d\d|(?:19|20)\d\d)(?!\d)".format(month=_MONTH)
+
+# One scanner for every inline token, run over each line lowercased so that no alternative has to
+# fold case. Tokens only start at a word boundary on a character some token can begin with, which
+# rejects most positions (including runs of spaces) in two checks; alternatives are then tried in
+# order, so an email or URL is consumed whole before its parts could match as skills or dates.
+# Every word start reaches the skill trie, so the alternatives before it are guarded by their
+# first character, and the email local part is possessive so a plain word fails at its end
+# instead of backtracking through every shorter prefix
+_TOKEN_RE = re.compile(r"(?<!\w)(?=[\w.%+(-])(?:{})".format("|".join([
+    r"(?P<email>[a-z0-9._%+-]++@[a-z0-9.-]+\.[a-z]{2,})",
+    r"(?P<url>(?=[hwlg])(?:https?://|www\.|linkedin\.com/|github\.com/)[^\s,;|]+)",
+    r"(?P<dates>(?=[\djfmasond])(?<!/){date}(?:[ \t]*(?:-|–|—|to)[ \t]*(?:{date}|present|current|now|date))?(?![\w/]))".format(date=_DATE),
+    r"(?P<phone>(?=[\d+(])(?<!\+)\+?\(?\d[\d ().-]{7,}\d(?!\d))",
+    r"(?P<skill>{})".format(SKILL_PATTERN),
+])))
+_DATE_RE = re.compile(_DATE)
+
+_HEADING_RE = re.compile(
+    r"(?:(?P<experience>(?:work |professional |relevant )?experience|employment(?: history)?|work history)"
+    r"|(?P<education>education|academic background|academics)"
+    r"|(?P<skills>(?:technical |core |key )?skills(?: (?:&|and) tools)?|(?:core )?competencies|technologies|tech stack)"
+    r"|(?P<projects>(?:personal |academic |selected |key |side )?projects)"
+    r"|(?P<summary>(?:professional |career )?summary|profile|objective|about(?: me)?)"
+    r"|(?P<other>certifications?|awards|achievements|languages|interests|hobbies|references|publications"
+    r"|contact(?: information)?|volunteer(?:ing| experience)?|activities))[ \t]*:?"
+)
+_BULLETS = "•●▪◦*·–-"
+_BULLET_RE = re.compile(r"^[{}]\s*".format(_BULLETS))
+# The guards let split() reject ordinary characters before trying each separator
+_PART_SPLIT_RE = re.compile(r"(?=[\s|,–—])(?:\s+(?:at|@)\s+|\s*[|,–—]\s*|\s+-\s+)")
+_SKILL_SPLIT_RE = re.compile(r"(?=[\s,;|•·/])\s*[,;|•·/]\s*")
+_SEGMENT_SPLIT_RE = re.compile(r"\s*[|•·]\s*")
+_PARENTHESES_RE = re.compile(r"\s*\(.*?\)")
+_NAME_RE = re.compile(r"[A-Z][A-Za-z.'-]*(?: [A-Z][A-Za-z.'-]*){1,3}")
+_LOCATION_RE = re.compile(r"[A-Z][A-Za-z.]+(?: [A-Z][A-Za-z.]+)*, ?(?:[A-Z]{2}|[A-Z][a-z]+(?: [A-Z][a-z]+)*)")
+# Entry classifiers run on lowercased parts: case-insensitive alternatives cannot be skipped on
+# their first character, which made these searches several times slower
+_JOB_TITLE_RE = re.compile(
+    r"\b(?:engineer|developer|manager|analyst|designer|intern|scientist|consultant|lead|architect|director"
+    r"|specialist|administrator|officer|associate|coordinator|assistant|head|vp|president|founder"
+    r"|teacher|researcher|programmer|tester|technician|executive|representative)\b"
+)
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor|master|doctor|ph\.?d|mba|b\.?\s?(?:s|a|sc|e|tech|com)\b\.?|m\.?\s?(?:s|a|sc|e|tech|com)\b\.?"
+    r"|associate|diploma|high school|secondary)"
+)
+_INSTITUTION_RE = re.compile(r"\b(?:university|college|institute|school|academy|polytechnic|iit|mit)\b")
+_FIELD_RE = re.compile(r"\s+(?:in|of)\s+(?!science\b|arts\b|technology\b|engineering\b)(.+)$")
+_GPA_RE = re.compile(r"\b(?:gpa|cgpa)\b[:\s]*(\d+(?:\.\d+)?)(?:\s*/\s*(\d+(?:\.\d+)?))?")
+
+
+def _normalize_date(date: str) -> str:
+    """"jan 2020" -> "2020-01", "03/2019" -> "2019-03", "2018" -> "2018" """
+    year = date[-4:]
+    if "/" in date:
+        return f"{year}-{int(date.split('/')[0]):02d}"
+    month = _MONTHS.get(date[:3])
+    return f"{year}-{month:02d}" if month else year
+
+
+def _split_parts(text: str) -> List[str]:
+    return [part for part in [p.strip(" \t.:;") for p in _PART_SPLIT_RE.split(text)] if part]
+
+
+class _Entry:
+    """An experience, education or project item while it is being read"""
+
+    __slots__ = ("parts", "lines", "bullets", "start", "end", "current", "skills", "urls")
+
+    def __init__(self, parts: List[str]):
+        self.parts = parts
+        self.lines: List[str] = []
+        self.bullets: List[str] = []
+        self.start: Optional[str] = None
+        self.end: Optional[str] = None
+        self.current = False
+        self.skills: List[str] = []
+        self.urls: List[str] = []
+
+
+class ResumeExtractor:
+    """Pulls contact details, sections, dates and skills out of resume text.
+
+    Each line is tokenized once, lowercased, by a single precompiled scanner
+    (emails, URLs, date ranges, phone numbers, taxonomy skills) and then
+    classified from its tokens as a section heading, a header/contact line
+    or part of an experience, education, skills or project entry.
+    Skills are collected as written and reported under their canonical
+    taxonomy names, looked up once per distinct spelling at the end.
+    """
+
+    def extract(self, text: str) -> Dict[str, Any]:
+        """Structured resume data in the resume builder's shape"""
+        personal: Dict[str, Any] = {}
+        # Skill mentions as written, in order; canonicalized once at the end
+        mentions: List[str] = []
+        sections: Dict[str, List[_Entry]] = {"experience": [], "education": [], "projects": []}
+        summary: List[str] = []
+        summary_fallback: Optional[str] = None
+        section: Optional[str] = None
+        pending: Optional[str] = None
+        header_lines = 0
+
+        def flush_pending():
+            nonlocal pending
+            if pending is None:
+                return
+            entries = sections[section]
+            if not entries:
+                entries.append(_Entry(_split_parts(pending)))
+            else:
+                entry = entries[-1]
+                # A short line straight after a one-part header is usually the missing half of it
+                if len(entry.parts) < 2 and not entry.lines and not entry.bullets and len(pending.split()) <= 8:
+                    entry.parts.extend(_split_parts(pending))
+                else:
+                    entry.lines.append(pending)
+            pending = None
+
+        for line in text.split("\n"):
+            line = line.strip()
+            if not line:
+                continue
+            lowered = lowercase(line)
+            # Skills are by far the most common token, so they are kept apart as plain strings
+            line_skills = []
+            tokens = []
+            for match in _TOKEN_RE.finditer(lowered):
+                if match.lastgroup != "skill":
+                    tokens.append(match)
+                    continue
+                skill = match.group()
+                if skill not in CASE_SENSITIVE_LOWER or line[match.start():match.end()] in CASE_SENSITIVE_ALIASES:
+                    line_skills.append(skill)
+            if not tokens and not line_skills and len(line) <= 40:
+                heading = _HEADING_RE.fullmatch(lowered)
+                if heading:
+                    if section in sections:
+                        flush_pending()
+                    section = heading.lastgroup
+                    continue
+
+            urls = []
+            dates = None
+            cut = []
+            for match in tokens:
+                kind = match.lastgroup
+                start, end = match.span()
+                if kind == "email":
+                    personal.setdefault("email", line[start:end])
+                    cut.append((start, end))
+                elif kind == "url":
+                    url = line[start:end].rstrip(").")
+                    if "linkedin.com" in match.group():
+                        personal.setdefault("linkedIn", url)
+                    elif "github.com" in match.group() and section is None:
+                        personal.setdefault("github", url)
+                    elif section is None:
+                        personal.setdefault("portfolio", url)
+                    urls.append(url)
+                    cut.append((start, end))
+                elif kind == "phone":
+                    if sum(map(str.isdigit, match.group())) >= 10:
+                        personal.setdefault("phone", line[start:end].strip())
+                        cut.append((start, end))
+                elif dates is None:
+                    dates = match.group()
+                    cut.append((start, end))
+
+            if section is None:
+                header_lines += 1
+                if "name" not in personal and header_lines <= 3 and not cut and _NAME_RE.fullmatch(line):
+                    # "Jane Swift" is a name, not a skill
+                    personal["name"] = line
+                    continue
+                for segment in _SEGMENT_SPLIT_RE.split(line):
+                    if "location" not in personal and _LOCATION_RE.fullmatch(segment):
+                        personal["location"] = segment
+                if summary_fallback is None and 50 < len(line) < 500 and not cut:
+                    summary_fallback = line
+                mentions.extend(line_skills)
+                continue
+
+            mentions.extend(line_skills)
+            if section == "summary":
+                summary.append(line)
+                continue
+            if section == "skills":
+                label, _, items = line.rpartition(":")
+                for item in _SKILL_SPLIT_RE.split(items if len(label) < 30 else line):
+                    if item[:1] in _BULLETS:
+                        item = _BULLET_RE.sub("", item)
+                    if "(" in item:
+                        item = _PARENTHESES_RE.sub("", item)
+                    item = item.strip(" .")
+                    if item and len(item) <= 40 and len(item.split()) <= 4:
+                        mentions.append(item)
+                continue
+            if section not in sections:
+                continue
+
+            # Text of the line with dates, emails and links cut out
+            if cut:
+                pieces, position = [], 0
+                for start, end in cut:
+                    pieces.append(line[position:start])
+                    position = end
+                pieces.append(line[position:])
+                remainder = " ".join(pieces).strip(" \t|,–—-()")
+            else:
+                remainder = line
+            bullet = _BULLET_RE.match(remainder) if remainder[:1] in _BULLETS else None
+            entries = sections[section]
+
+            if bullet and entries:
+                flush_pending()
+                entries[-1].bullets.append(remainder[bullet.end():])
+            elif dates is not None or (section == "projects" and (len(remainder.split()) <= 12 or ":" in remainder)):
+                parts = _split_parts(remainder)
+                if pending is not None:
+                    parts = _split_parts(pending) + parts
+                    pending = None
+                entry = _Entry(parts)
+                if dates is not None:
+                    found = _DATE_RE.findall(dates)
+                    entry.start = _normalize_date(found[0])
+                    if len(found) > 1:
+                        entry.end = _normalize_date(found[1])
+                    else:
+                        # A range ending in "Present"; a lone date is just the start
+                        entry.current = len(found[0]) < len(dates)
+                entries.append(entry)
+            else:
+                flush_pending()
+                pending = remainder
+            if entries and (line_skills or urls):
+                entries[-1].skills.extend(line_skills)
+                entries[-1].urls.extend(urls)
+        if section in sections:
+            flush_pending()
+
+        if summary:
+            personal["summary"] = " ".join(summary)[:1000]
+        elif summary_fallback:
+            personal["summary"] = summary_fallback
+
+        return {
+            "personalInfo": personal,
+            "experience": [self._experience(entry) for entry in sections["experience"]],
+            "education": [self._education(entry) for entry in sections["education"]],
+            "projects": [self._project(entry) for entry in sections["projects"]],
+            "skills": list(dict.fromkeys(canonical_skill(skill) for skill in dict.fromkeys(mentions))),
+            "rawText": text[:1000]
+        }
+
+    @staticmethod
+    def _experience(entry: _Entry) -> Dict[str, Any]:
+        parts = entry.parts + ["", ""]
+        position, company = parts[0], parts[1]
+        if company and not _JOB_TITLE_RE.search(lowercase(position)) and _JOB_TITLE_RE.search(lowercase(company)):
+            position, company = company, position
+        return {
+            "position": position,
+            "company": company,
+            "startDate": entry.start,
+            "endDate": entry.end,
+            "current": entry.current,
+            "description": " ".join(entry.lines + parts[2:-2]),
+            "achievements": entry.bullets
+        }
+
+    @staticmethod
+    def _education(entry: _Entry) -> Dict[str, Any]:
+        degree = institution = ""
+        field_match = None
+        rest = []
+        for part in entry.parts:
+            lowered = lowercase(part)
+            if not degree and _DEGREE_RE.search(lowered):
+                degree = part
+                field_match = _FIELD_RE.search(lowered)
+            elif not institution and _INSTITUTION_RE.search(lowered):
+                institution = part
+            else:
+                rest.append(part)
+        if not institution and rest:
+            institution = rest.pop(0)
+        field = ""
+        if field_match:
+            field = degree[field_match.start(1):].strip()
+            degree = degree[:field_match.start()].strip()
+        elif rest and degree:
+            field = rest.pop(0)
+        start, end = entry.start, entry.end
+        if end is None and not entry.current:
+            # A lone date on a degree is when it was completed
+            start, end = None, start
+        education = {
+            "institution": institution,
+            "degree": degree,
+            "field": field,
+            "startDate": start,
+            "endDate": end,
+            "description": " ".join(rest + entry.lines + entry.bullets)
+        }
+        gpa = _GPA_RE.search(lowercase(" ".join(entry.parts + entry.lines + entry.bullets)))
+        if gpa:
+            education["gpa"] = float(gpa.group(1))
+        return education
+
+    @staticmethod
+    def _project(entry: _Entry) -> Dict[str, Any]:
+        name, _, description = (entry.parts[0] if entry.parts else "").partition(":")
+        return {
+            "name": name.strip(),
+            "description": " ".join([description.strip()] + entry.parts[1:] + entry.lines + entry.bullets).strip(),
+            "technologies": list(dict.fromkeys(canonical_skill(skill) for skill in entry.skills)),
+            "url": entry.urls[0] if entry.urls else None
+        }
+
+
+# Global instance
+resume_extractor = ResumeExtractor()
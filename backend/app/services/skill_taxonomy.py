@@ -0,0 +1,174 @@
+"""
+Skill taxonomy: canonical skill names and the aliases that map to them
+"""
+import re
+from typing import Any, Dict, Iterable, List
+
+# Canonical name -> other spellings seen in resumes and job posts
+SKILL_TAXONOMY: Dict[str, tuple] = {
+    # Languages
+    "Python": ("python3",),
+    "Java": (),
+    "JavaScript": ("js", "ecmascript", "es6"),
+    "TypeScript": ("ts",),
+    "C++": ("cpp",),
+    "C#": ("csharp", "c sharp"),
+    "Go": ("golang",),
+    "Rust": (),
+    "Ruby": (),
+    "PHP": (),
+    "Kotlin": (),
+    "Swift": (),
+    "Scala": (),
+    "SQL": (),
+    "HTML": ("html5",),
+    "CSS": ("css3",),
+    # Frameworks and libraries
+    "React": ("react.js", "reactjs"),
+    "React Native": (),
+    "Angular": ("angularjs", "angular.js"),
+    "Vue": ("vue.js", "vuejs"),
+    "Next.js": ("nextjs",),
+    "Node.js": ("node", "nodejs", "node js"),
+    "Express": ("express.js", "expressjs"),
+    "Django": (),
+    "Flask": (),
+    "FastAPI": (),
+    "Spring": ("spring boot", "springboot"),
+    "Ruby on Rails": ("rails",),
+    ".NET": ("dotnet", "asp.net"),
+    "Tailwind CSS": ("tailwind",),
+    "GraphQL": (),
+    "REST APIs": ("rest api", "restful", "rest apis", "restful apis"),
+    "Microservices": ("microservice",),
+    # Data and ML
+    "Machine Learning": ("ml",),
+    "Deep Learning": (),
+    "NLP": ("natural language processing",),
+    "Computer Vision": (),
+    "TensorFlow": (),
+    "PyTorch": (),
+    "scikit-learn": ("sklearn", "scikit learn"),
+    "Pandas": (),
+    "NumPy": (),
+    "Spark": ("apache spark", "pyspark"),
+    "Kafka": ("apache kafka",),
+    "Airflow": ("apache airflow",),
+    "Tableau": (),
+    "Power BI": ("powerbi",),
+    "Excel": ("ms excel", "microsoft excel"),
+    # Databases
+    "PostgreSQL": ("postgres",),
+    "MySQL": (),
+    "MongoDB": ("mongo",),
+    "Redis": (),
+    "Elasticsearch": ("elastic search",),
+    "DynamoDB": (),
+    "SQLite": (),
+    # Cloud and infrastructure
+    "AWS": ("amazon web services",),
+    "Azure": ("microsoft azure",),
+    "GCP": ("google cloud", "google cloud platform"),
+    "Docker": (),
+    "Kubernetes": ("k8s",),
+    "Terraform": (),
+    "Linux": (),
+    "Git": (),
+    "GitHub Actions": (),
+    "Jenkins": (),
+    "CI/CD": ("ci cd", "continuous integration"),
+    # Design and process
+    "Figma": (),
+    "Sketch": (),
+    "Agile": (),
+    "Scrum": (),
+    "Kanban": (),
+    "Jira": (),
+    "Project Management": (),
+    "Communication": (),
+    "Leadership": (),
+}
+
+# Spellings that are also everyday words ("go", "spring", "excel at", "swift"): matched only in this exact case
+CASE_SENSITIVE_ALIASES = frozenset({"Go", "Spring", "Excel", "Swift"})
+# Their lowercase forms, for telling which matches on lowercased text need the original case checked
+CASE_SENSITIVE_LOWER = frozenset(alias.lower() for alias in CASE_SENSITIVE_ALIASES)
+
+_CANONICAL: Dict[str, str] = {}
+for _name, _aliases in SKILL_TAXONOMY.items():
+    for _alias in (_name,) + _aliases:
+        _CANONICAL[_alias.lower()] = _name
+
+
+def _trie_pattern(aliases) -> str:
+    """Regex matching any alias, nested by shared prefix so the engine does not try each alias in turn.
+
+    Optional suffixes are greedy, so the longest alias wins ("react native" over "react").
+    """
+    trie: Dict[str, dict] = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:{})".format("|".join(branches))
+        if "" not in node:
+            return body
+        return "(?:{})?".format(body) if len(branches) == 1 and len(body) > 1 else body + "?"
+
+    return build(trie)
+
+
+# Matches skills in lowercased text (see lowercase()), where the engine compares plain characters
+# instead of folding case at every step. A match in CASE_SENSITIVE_LOWER is only a skill when the
+# original text has it in exactly that case. Edges allow "c++", "c#" and ".net" but not a skill
+# inside a longer word or file name
+SKILL_PATTERN = r"(?<![\w+#.])(?:{}|{})(?![\w+#]|\.\w)".format(
+    _trie_pattern(alias for alias in _CANONICAL if alias not in CASE_SENSITIVE_LOWER),
+    _trie_pattern(CASE_SENSITIVE_LOWER)
+)
+_SKILL_RE = re.compile(SKILL_PATTERN)
+
+
+def lowercase(text: str) -> str:
+    """text.lower() with exactly one character per character, so match offsets fit the original"""
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # "İ" is the only character that lowercases to two
+    return text.replace("\u0130", "i").lower()
+
+
+def canonical_skill(name: str) -> str:
+    """Canonical name for a skill or alias; unknown skills are returned trimmed"""
+    name = name.strip()
+    return _CANONICAL.get(name.lower(), name)
+
+
+def skill_key(name: str) -> str:
+    """Lowercase canonical name, for comparing skills from different sources"""
+    return canonical_skill(name).lower()
+
+
+def skill_keys(skills: Iterable[Any]) -> List[str]:
+    """Distinct skill keys for a stored skills list, skipping empty entries"""
+    keys: Dict[str, None] = {}
+    for skill in skills or ():
+        if skill is not None and str(skill).strip():
+            keys.setdefault(skill_key(str(skill)), None)
+    return list(keys)
+
+
+def match_skills(text: str) -> List[str]:
+    """Canonical skills mentioned in text, in order of first mention"""
+    found: Dict[str, None] = {}
+    for match in _SKILL_RE.finditer(lowercase(text)):
+        alias = match.group()
+        if alias not in CASE_SENSITIVE_LOWER or text[match.start():match.end()] in CASE_SENSITIVE_ALIASES:
+            found.setdefault(_CANONICAL[alias], None)
+    return list(found)
@@ -0,0 +1,227 @@
+"""
+Object storage backends for uploaded files: local disk or an S3-compatible bucket
+"""
+import asyncio
+import base64
+import os
+from typing import Any, Dict, Optional
+import aiofiles
+import aiofiles.os
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class LocalStorageBackend:
+    """Files under a local directory, served by the /uploads static mount"""
+
+    name = "local"
+
+    def __init__(self, root: str = "uploads", base_url: str = "/uploads"):
+        self.root = root
+        self.base_url = base_url.rstrip("/")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    def url_for(self, key: str) -> str:
+        """Stable URL to store on documents"""
+        return f"{self.base_url}/{key}"
+
+    def download_url(self, key: str) -> str:
+        """URL a client can fetch the object from right now"""
+        return self.url_for(key)
+
+    async def put_file(self, local_path: str, key: str, content_type: Optional[str] = None):
+        """Move a finished local file to key"""
+        path = self._path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        await aiofiles.os.replace(local_path, path)
+
+    async def size(self, key: str) -> Optional[int]:
+        """Size of the object at key, or None if it does not exist"""
+        try:
+            return (await aiofiles.os.stat(self._path(key))).st_size
+        except FileNotFoundError:
+            return None
+
+    async def move(self, source_key: str, key: str):
+        """Move the object at source_key to key"""
+        path = self._path(key)
+        await aiofiles.os.makedirs(os.path.dirname(path), exist_ok=True)
+        await aiofiles.os.replace(self._path(source_key), path)
+
+    async def read(self, key: str) -> bytes:
+        """Whole object at key (for small files such as images)"""
+        async with aiofiles.open(self._path(key), "rb") as handle:
+            return await handle.read()
+
+    async def delete(self, key: str):
+        try:
+            await aiofiles.os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of key, for backends that have one"""
+        return self._path(key)
+
+    def presigned_upload(self, key: str, content_type: str, size: int, sha256: str) -> Optional[Dict[str, Any]]:
+        """Direct uploads need an object store; uploads go through the API instead"""
+        return None
+
+
+class S3StorageBackend:
+    """Objects in an S3-compatible bucket (AWS S3, MinIO, LocalStack, ...).
+
+    boto3 is synchronous, so calls run in worker threads. Large files are
+    sent with multipart uploads straight from the scratch file on disk.
+    """
+
+    name = "s3"
+
+    def __init__(
+        self,
+        bucket: str,
+        region: str,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        public_base_url: Optional[str] = None,
+        url_expire_seconds: int = 900
+    ):
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+        from botocore.config import Config
+
+        self.bucket = bucket
+        self.url_expire_seconds = url_expire_seconds
+        self.public_base_url = public_base_url.rstrip("/") if public_base_url else None
+        self._client = boto3.client(
+            "s3",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            endpoint_url=endpoint_url,
+            # Path-style addressing works with local emulators as well as AWS
+            config=Config(signature_version="s3v4", s3={"addressing_style": "path"} if endpoint_url else {})
+        )
+        self._transfer_config = TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=4
+        )
+
+    def url_for(self, key: str) -> str:
+        """Stable URL to store on documents.
+
+        Without a public bucket URL this points at the API, which redirects
+        to a short-lived presigned download URL.
+        """
+        if self.public_base_url:
+            return f"{self.public_base_url}/{key}"
+        return f"{settings.API_V1_STR}/upload/files/{key}"
+
+    def download_url(self, key: str) -> str:
+        """Presigned URL a client can fetch the object from right now"""
+        return self._client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=self.url_expire_seconds
+        )
+
+    async def put_file(self, local_path: str, key: str, content_type: Optional[str] = None):
+        """Upload a finished local file to key (multipart above 8MB) and remove the local copy"""
+        extra_args = {"ContentType": content_type} if content_type else None
+        await asyncio.to_thread(
+            self._client.upload_file, local_path, self.bucket, key,
+            ExtraArgs=extra_args, Config=self._transfer_config
+        )
+        await aiofiles.os.remove(local_path)
+
+    async def size(self, key: str) -> Optional[int]:
+        """Size of the object at key, or None if it does not exist"""
+        from botocore.exceptions import ClientError
+        try:
+            head = await asyncio.to_thread(self._client.head_object, Bucket=self.bucket, Key=key)
+            return head["ContentLength"]
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def move(self, source_key: str, key: str):
+        """Copy the object at source_key to key inside the bucket, then delete the source"""
+        def _move():
+            self._client.copy_object(
+                Bucket=self.bucket, Key=key, CopySource={"Bucket": self.bucket, "Key": source_key}
+            )
+            self._client.delete_object(Bucket=self.bucket, Key=source_key)
+        await asyncio.to_thread(_move)
+
+    async def read(self, key: str) -> bytes:
+        """Whole object at key (for small files such as images)"""
+        def _read():
+            return self._client.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+        return await asyncio.to_thread(_read)
+
+    async def delete(self, key: str):
+        await asyncio.to_thread(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return None
+
+    def presigned_upload(self, key: str, content_type: str, size: int, sha256: str) -> Optional[Dict[str, Any]]:
+        """Presigned PUT the client uploads to directly.
+
+        Content length, type and SHA-256 are part of the signature, so S3
+        rejects a body that does not match what the API agreed to store.
+        """
+        checksum = base64.b64encode(bytes.fromhex(sha256)).decode()
+        url = self._client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket,
+                "Key": key,
+                "ContentType": content_type,
+                "ContentLength": size,
+                "ChecksumSHA256": checksum
+            },
+            ExpiresIn=self.url_expire_seconds
+        )
+        return {
+            "method": "PUT",
+            "url": url,
+            "headers": {
+                "Content-Type": content_type,
+                "x-amz-checksum-sha256": checksum
+            },
+            "expires_in": self.url_expire_seconds
+        }
+
+
+def _build_backend():
+    """Configured backend; a broken S3 setup fails startup instead of falling back to local disk"""
+    if settings.STORAGE_BACKEND == "s3":
+        if not settings.AWS_BUCKET_NAME:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires AWS_BUCKET_NAME")
+        try:
+            return S3StorageBackend(
+                bucket=settings.AWS_BUCKET_NAME,
+                region=settings.AWS_REGION,
+                access_key_id=settings.AWS_ACCESS_KEY_ID,
+                secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                endpoint_url=settings.S3_ENDPOINT_URL,
+                public_base_url=settings.S3_PUBLIC_BASE_URL,
+                url_expire_seconds=settings.STORAGE_URL_EXPIRE_SECONDS
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialise S3 storage: {e}") from e
+    if settings.STORAGE_BACKEND != "local":
+        raise RuntimeError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+    return LocalStorageBackend()
+
+
+# Global instance
+storage = _build_backend()
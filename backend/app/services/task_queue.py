@@ -0,0 +1,418 @@
+"""
+Background task queue for slow side effects, with an in-process backend and an optional Redis backend
+"""
+import asyncio
+import itertools
+import json
+import random
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+from app.core.config import settings
+import logging
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 5
+PRIORITY_LOW = 9
+
+
+class MemoryTaskBackend:
+    """asyncio priority queue inside the API process; queued tasks are lost on restart"""
+
+    durable = False
+
+    def __init__(self, dead_letter_limit: int = 1000):
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._sequence = itertools.count()
+        self._scheduled = 0
+        self._claims: Dict[str, float] = {}
+        self._dead: deque = deque(maxlen=dead_letter_limit)
+
+    def _get_queue(self) -> asyncio.PriorityQueue:
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        return self._queue
+
+    def _put(self, job: Dict[str, Any]):
+        # The sequence number keeps equal priorities first-in, first-out
+        self._get_queue().put_nowait((job["priority"], next(self._sequence), job))
+
+    async def push(self, job: Dict[str, Any], delay: float = 0.0):
+        if delay <= 0:
+            self._put(job)
+            return
+        self._scheduled += 1
+
+        def due():
+            self._scheduled -= 1
+            self._put(job)
+
+        asyncio.get_running_loop().call_later(delay, due)
+
+    async def pop(self, timeout: float, lease: float) -> Optional[Dict[str, Any]]:
+        try:
+            _, _, job = await asyncio.wait_for(self._get_queue().get(), timeout)
+            return job
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, job: Dict[str, Any]):
+        pass
+
+    async def requeue(self, job: Dict[str, Any]):
+        self._put(job)
+
+    async def claim(self, key: str, ttl: int) -> bool:
+        now = time.monotonic()
+        if self._claims.get(key, 0) > now:
+            return False
+        if len(self._claims) > 10000:
+            self._claims = {k: expiry for k, expiry in self._claims.items() if expiry > now}
+        self._claims[key] = now + ttl
+        return True
+
+    async def release(self, key: str):
+        self._claims.pop(key, None)
+
+    async def dead_letter(self, job: Dict[str, Any]):
+        self._dead.appendleft(job)
+
+    async def dead_letters(self, limit: int) -> List[Dict[str, Any]]:
+        return list(itertools.islice(self._dead, limit))
+
+    async def depth(self) -> int:
+        return self._get_queue().qsize() + self._scheduled
+
+
+# Moves the first task off the highest-priority non-empty list into the
+# processing set, leased until ARGV[1]; one round trip and never lost in between
+_POP_SCRIPT = """
+for i = 2, #KEYS do
+    local payload = redis.call('LPOP', KEYS[i])
+    if payload then
+        redis.call('ZADD', KEYS[1], ARGV[1], payload)
+        return payload
+    end
+end
+return false
+"""
+
+
+class RedisTaskBackend:
+    """Redis lists per priority, shared by every API process and standalone workers.
+
+    A popped task stays in a processing set until it is acked. If its worker
+    dies or is killed, the task is put back on its queue once its lease
+    expires, so it runs again instead of being lost.
+    """
+
+    durable = True
+
+    def __init__(self, url: str, prefix: str = "tasks", dead_letter_limit: int = 1000, poll_interval: float = 0.2):
+        import redis.asyncio as redis
+        self._client = redis.from_url(url)
+        self.prefix = prefix
+        self.dead_letter_limit = dead_letter_limit
+        self.poll_interval = poll_interval
+        # Checked in order by the pop script, which gives priority
+        self._queues = [f"{prefix}:queue:{priority}" for priority in range(PRIORITY_HIGH, PRIORITY_LOW + 1)]
+        self._processing = f"{prefix}:processing"
+        self._pop_script = self._client.register_script(_POP_SCRIPT)
+        # Raw payloads of the tasks this process holds, by id, to ack them by value
+        self._leased: Dict[str, bytes] = {}
+        self._next_promote = 0.0
+
+    async def push(self, job: Dict[str, Any], delay: float = 0.0):
+        payload = json.dumps(job, default=str)
+        if delay > 0:
+            await self._client.zadd(f"{self.prefix}:delayed", {payload: time.time() + delay})
+        else:
+            await self._client.rpush(self._queues[job["priority"]], payload)
+
+    async def _promote_due(self):
+        """Move retries whose delay has passed, and tasks whose worker stopped, onto their queue"""
+        now = time.time()
+        if now < self._next_promote:
+            return
+        self._next_promote = now + 1.0
+        for source in (f"{self.prefix}:delayed", self._processing):
+            for payload in await self._client.zrangebyscore(source, 0, now, start=0, num=100):
+                # Only the worker whose ZREM succeeds requeues it
+                if await self._client.zrem(source, payload):
+                    job = json.loads(payload)
+                    await self._client.rpush(self._queues[job["priority"]], payload)
+                    if source == self._processing:
+                        logger.warning(f"Requeued task {job['name']} {job['id']} whose lease expired")
+
+    async def pop(self, timeout: float, lease: float) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + timeout
+        while True:
+            await self._promote_due()
+            payload = await self._pop_script(keys=[self._processing, *self._queues], args=[time.time() + lease])
+            if payload:
+                job = json.loads(payload)
+                self._leased[job["id"]] = payload
+                return job
+            if time.monotonic() >= deadline:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    async def ack(self, job: Dict[str, Any]):
+        payload = self._leased.pop(job["id"], None)
+        if payload is not None:
+            await self._client.zrem(self._processing, payload)
+
+    async def requeue(self, job: Dict[str, Any]):
+        payload = self._leased.pop(job["id"], None)
+        if payload is None:
+            return
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.rpush(self._queues[job["priority"]], payload)
+            pipe.zrem(self._processing, payload)
+            await pipe.execute()
+
+    async def claim(self, key: str, ttl: int) -> bool:
+        return bool(await self._client.set(f"{self.prefix}:idempotency:{key}", 1, nx=True, ex=ttl))
+
+    async def release(self, key: str):
+        await self._client.delete(f"{self.prefix}:idempotency:{key}")
+
+    async def dead_letter(self, job: Dict[str, Any]):
+        dead = f"{self.prefix}:dead"
+        await self._client.lpush(dead, json.dumps(job, default=str))
+        await self._client.ltrim(dead, 0, self.dead_letter_limit - 1)
+
+    async def dead_letters(self, limit: int) -> List[Dict[str, Any]]:
+        return [json.loads(payload) for payload in await self._client.lrange(f"{self.prefix}:dead", 0, limit - 1)]
+
+    async def depth(self) -> int:
+        total = await self._client.zcard(f"{self.prefix}:delayed") + await self._client.zcard(self._processing)
+        for queue in self._queues:
+            total += await self._client.llen(queue)
+        return total
+
+
+class TaskQueue:
+    """Runs registered async functions outside the request that triggered them.
+
+    Handlers enqueue a task by name with JSON-serializable keyword arguments
+    and return immediately. Workers take the highest-priority task first;
+    a task that raises is retried with exponential backoff and jitter, and
+    after max_retries it is moved to the dead-letter list with its last
+    error. An idempotency key makes repeated enqueues of the same side
+    effect (double submits, client retries) a no-op for idempotency_ttl.
+    A task is acked only once it finishes; one whose worker is stopped
+    mid-run is put back on the queue.
+    """
+
+    def __init__(
+        self,
+        backend,
+        workers: int = 4,
+        max_retries: int = 5,
+        retry_base_seconds: float = 2.0,
+        retry_max_seconds: float = 300.0,
+        timeout: float = 60.0,
+        idempotency_ttl: int = 86400
+    ):
+        self.backend = backend
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.timeout = timeout
+        self.idempotency_ttl = idempotency_ttl
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._workers: List[asyncio.Task] = []
+        self._stopping = False
+        self.running = 0
+        self.enqueued = 0
+        self.duplicates = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.dead = 0
+
+    def task(
+        self,
+        name: str,
+        max_retries: Optional[int] = None,
+        priority: int = PRIORITY_NORMAL,
+        timeout: Optional[float] = None
+    ):
+        """Register an async function as a task under name"""
+        def decorator(func: Callable):
+            self._tasks[name] = {
+                "func": func,
+                "max_retries": self.max_retries if max_retries is None else max_retries,
+                "priority": priority,
+                "timeout": timeout
+            }
+            return func
+        return decorator
+
+    async def enqueue(
+        self,
+        name: str,
+        *,
+        priority: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
+        delay: float = 0.0,
+        **kwargs
+    ) -> Optional[str]:
+        """Queue a registered task; returns its id, or None when the idempotency key was already used"""
+        spec = self._tasks.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown task: {name}")
+        if idempotency_key and not await self.backend.claim(idempotency_key, self.idempotency_ttl):
+            self.duplicates += 1
+            return None
+        job = {
+            "id": uuid.uuid4().hex,
+            "name": name,
+            "kwargs": kwargs,
+            "priority": min(max(spec["priority"] if priority is None else priority, PRIORITY_HIGH), PRIORITY_LOW),
+            "attempts": 0,
+            "idempotency_key": idempotency_key,
+            "enqueued_at": time.time()
+        }
+        try:
+            await self.backend.push(job, delay)
+        except Exception:
+            # Give the key back, or a retry of the request would be dropped as a duplicate
+            if idempotency_key:
+                await self.backend.release(idempotency_key)
+            raise
+        self.enqueued += 1
+        return job["id"]
+
+    async def _run(self, job: Dict[str, Any]):
+        spec = self._tasks.get(job["name"])
+        if spec is None:
+            job["error"] = "Unknown task"
+            await self.backend.dead_letter(job)
+            self.dead += 1
+            return
+        self.running += 1
+        try:
+            await asyncio.wait_for(spec["func"](**job["kwargs"]), spec["timeout"] or self.timeout)
+            self.succeeded += 1
+        except Exception as e:
+            job["attempts"] += 1
+            job["error"] = f"{type(e).__name__}: {e}"
+            if job["attempts"] > spec["max_retries"]:
+                job["failed_at"] = time.time()
+                await self.backend.dead_letter(job)
+                self.dead += 1
+                logger.error(f"Task {job['name']} {job['id']} dead-lettered after {job['attempts']} attempts: {e}")
+            else:
+                delay = min(self.retry_max_seconds, self.retry_base_seconds * 2 ** (job["attempts"] - 1))
+                await self.backend.push(job, delay * random.uniform(0.5, 1.0))
+                self.retried += 1
+                logger.warning(f"Task {job['name']} {job['id']} failed (attempt {job['attempts']}), retrying: {e}")
+        finally:
+            self.running -= 1
+
+    def _lease(self) -> float:
+        """How long a popped task may go unacked before it is handed to another worker"""
+        longest = max((spec["timeout"] or self.timeout for spec in self._tasks.values()), default=self.timeout)
+        return longest + 60.0
+
+    async def _worker(self):
+        while not self._stopping:
+            try:
+                job = await self.backend.pop(timeout=1.0, lease=self._lease())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Task queue read failed: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            if job is None:
+                continue
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                # Stopped mid-task: put it back for the next worker
+                await self.backend.requeue(job)
+                raise
+            except Exception as e:
+                logger.error(f"Task {job.get('name')} could not be requeued: {e}")
+                # Left unacked, so it runs again when its lease expires
+                continue
+            try:
+                await self.backend.ack(job)
+            except Exception as e:
+                logger.error(f"Task {job.get('name')} {job.get('id')} could not be acknowledged: {e}")
+
+    def start(self):
+        """Start the worker tasks on the running event loop"""
+        if self._workers or self.workers <= 0:
+            return
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no task is queued, scheduled for retry or running; False on timeout"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.running or await self.backend.depth():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def stop(self, timeout: float = 10.0):
+        """Stop the workers, first letting queued work finish when it would otherwise be lost"""
+        if not self._workers:
+            return
+        if not self.backend.durable:
+            if not await self.join(timeout):
+                logger.warning(f"Task queue stopped with {await self.backend.depth()} tasks unfinished")
+        self._stopping = True
+        # Let running tasks finish; idle workers notice within their poll timeout
+        _, pending = await asyncio.wait(self._workers, timeout=timeout)
+        for worker in pending:
+            worker.cancel()
+        # Wait for cancelled workers to put their tasks back
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+
+    async def dead_letters(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent tasks that exhausted their retries"""
+        return await self.backend.dead_letters(limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        return {
+            "backend": type(self.backend).__name__,
+            "workers": len(self._workers),
+            "running": self.running,
+            "enqueued": self.enqueued,
+            "duplicates": self.duplicates,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "dead": self.dead
+        }
+
+
+def _build_backend():
+    if settings.TASK_QUEUE_BACKEND == "redis":
+        try:
+            return RedisTaskBackend(settings.REDIS_URL, dead_letter_limit=settings.TASK_DEAD_LETTER_LIMIT)
+        except Exception as e:
+            logger.error(f"Failed to initialise Redis task queue, falling back to memory: {e}")
+    return MemoryTaskBackend(dead_letter_limit=settings.TASK_DEAD_LETTER_LIMIT)
+
+
+# Global instance
+task_queue = TaskQueue(
+    _build_backend(),
+    workers=settings.TASK_QUEUE_WORKERS,
+    max_retries=settings.TASK_MAX_RETRIES,
+    retry_base_seconds=settings.TASK_RETRY_BASE_SECONDS,
+    retry_max_seconds=settings.TASK_RETRY_MAX_SECONDS,
+    timeout=settings.TASK_TIMEOUT_SECONDS,
+    idempotency_ttl=settings.TASK_IDEMPOTENCY_TTL_SECONDS
+)
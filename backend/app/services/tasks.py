@@ -0,0 +1,105 @@
+"""
+Background tasks for side effects that talk to third parties (SMTP, Twilio) or fan out writes
+"""
+import asyncio
+from typing import List, Optional
+from app.core.config import settings
+from app.services.mailer import mailer
+from app.services.task_queue import PRIORITY_HIGH, PRIORITY_LOW, task_queue
+import logging
+
+logger = logging.getLogger(__name__)
+
+_twilio_client = None
+
+
+def _get_twilio_client():
+    global _twilio_client
+    if _twilio_client is None:
+        from twilio.rest import Client
+        _twilio_client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+    return _twilio_client
+
+
+@task_queue.task("email.send")
+async def send_email_task(to_email: str, subject: str, body: str, is_html: bool = False):
+    """Send one email over a pooled SMTP connection"""
+    await mailer.send(to_email, subject, body, is_html)
+
+
+@task_queue.task("sms.send", max_retries=2, priority=PRIORITY_HIGH)
+async def send_sms_task(to: str, body: str):
+    """Send one SMS through Twilio (OTP codes go out ahead of other work)"""
+    message = await asyncio.to_thread(
+        _get_twilio_client().messages.create,
+        body=body,
+        from_=settings.TWILIO_PHONE_NUMBER,
+        to=to
+    )
+    logger.info(f"SMS sent to {to}: {message.sid}")
+
+
+@task_queue.task("notifications.new_application", priority=PRIORITY_LOW)
+async def new_application_notification_task(
+    employer_id: str,
+    applicant_name: str,
+    job_title: str,
+    job_id: str,
+    application_id: str
+):
+    """Tell an employer that someone applied to their job"""
+    from app.services.notification_service import notification_service
+
+    notification = await notification_service.create_new_application_notification(
+        employer_id=employer_id,
+        applicant_name=applicant_name,
+        job_title=job_title,
+        job_id=job_id,
+        application_id=application_id
+    )
+    if notification is None:
+        raise RuntimeError("Notification was not stored")
+
+
+@task_queue.task("notifications.application_status", priority=PRIORITY_LOW)
+async def application_status_notification_task(
+    applicant_id: str,
+    job_title: str,
+    company_name: Optional[str],
+    status: str,
+    job_id: str,
+    application_id: str
+):
+    """Tell an applicant that their application status changed"""
+    from app.services.notification_service import notification_service
+
+    notification = await notification_service.create_application_status_notification(
+        applicant_id=applicant_id,
+        job_title=job_title,
+        company_name=company_name or "Company",
+        status=status,
+        job_id=job_id,
+        application_id=application_id
+    )
+    if notification is None:
+        raise RuntimeError("Notification was not stored")
+
+
+@task_queue.task("notifications.job_posted", priority=PRIORITY_LOW, timeout=settings.NOTIFICATION_FANOUT_TIMEOUT_SECONDS)
+async def job_posted_fan_out_task(job_id: str, job_title: str, company_name: Optional[str], skills: List[str]):
+    """Alert matching job seekers about a new job (a retry skips users already notified)"""
+    from app.services.notification_service import notification_service
+
+    counts = await notification_service.notify_job_posted(job_id, job_title, company_name or "A company", skills)
+    if counts["failed"]:
+        raise RuntimeError(f"{counts['failed']} notifications were not stored")
+
+
+@task_queue.task("notifications.job_closed", priority=PRIORITY_LOW, timeout=settings.NOTIFICATION_FANOUT_TIMEOUT_SECONDS)
+async def job_closed_fan_out_task(job_id: str, job_title: str, company_name: Optional[str]):
+    """Tell every applicant that a job has closed (a retry skips users already notified)"""
+    from app.services.notification_service import notification_service
+
+    counts = await notification_service.notify_job_closed(job_id, job_title, company_name or "Company")
+    if counts["failed"]:
+        raise RuntimeError(f"{counts['failed']} notifications were not stored")
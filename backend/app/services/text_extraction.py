@@ -0,0 +1,157 @@
+"""
+Text extraction and parsing of uploaded resumes (PDF/DOCX) off the event loop
+"""
+import asyncio
+import hashlib
+import io
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.services.process_pool import ProcessWorkerPool
+import logging
+
+logger = logging.getLogger(__name__)
+
+PDF_MIME_TYPE = "application/pdf"
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def extract_pdf_text(content: bytes, max_pages: int, max_chars: int) -> Tuple[str, bool]:
+    """Text of the first max_pages pages, cut at max_chars; returns (text, truncated)"""
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    parts: List[str] = []
+    total = 0
+    page_count = len(reader.pages)
+    truncated = page_count > max_pages
+    # Pages are parsed one at a time as they are read
+    for index in range(min(page_count, max_pages)):
+        text = reader.pages[index].extract_text() or ""
+        if total + len(text) >= max_chars:
+            parts.append(text[:max_chars - total])
+            truncated = True
+            break
+        parts.append(text)
+        total += len(text)
+    return "".join(parts), truncated
+
+
+def extract_docx_text(content: bytes, max_chars: int) -> Tuple[str, bool]:
+    """Paragraph text, one per line, cut at max_chars; returns (text, truncated)"""
+    from docx import Document
+
+    document = Document(io.BytesIO(content))
+    parts: List[str] = []
+    total = 0
+    for paragraph in document.paragraphs:
+        line = paragraph.text + "\n"
+        if total + len(line) >= max_chars:
+            parts.append(line[:max_chars - total])
+            return "".join(parts), True
+        parts.append(line)
+        total += len(line)
+    return "".join(parts), False
+
+
+def extract_text(content: bytes, mime_type: str, max_pages: int, max_chars: int) -> Tuple[str, bool]:
+    if mime_type == PDF_MIME_TYPE:
+        return extract_pdf_text(content, max_pages, max_chars)
+    if mime_type == DOCX_MIME_TYPE:
+        return extract_docx_text(content, max_chars)
+    raise ValueError(f"Unsupported file type: {mime_type}")
+
+
+def _init_worker():
+    # Import parsers up front so the first request does not pay for it
+    import PyPDF2  # noqa: F401
+    import docx  # noqa: F401
+    import app.services.resume_extractor  # noqa: F401
+
+
+def _parse_in_worker(content: bytes, mime_type: str, max_pages: int, max_chars: int) -> Dict[str, Any]:
+    from app.services.resume_extractor import resume_extractor
+
+    text, truncated = extract_text(content, mime_type, max_pages, max_chars)
+    return {**resume_extractor.extract(text), "truncated": truncated}
+
+
+class ResumeParseService:
+    """Parses uploaded resumes in worker processes, with results cached by content hash.
+
+    Page and character caps keep huge or hostile documents from tying up a
+    worker. Re-uploading the same file returns the cached result without
+    touching the pool.
+    """
+
+    def __init__(
+        self,
+        pool: ProcessWorkerPool,
+        max_pages: int = 20,
+        max_chars: int = 200_000,
+        cache_entries: int = 1024
+    ):
+        self.pool = pool
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, digest: str, mime_type: str) -> str:
+        return f"{digest}:{mime_type}:{self.max_pages}:{self.max_chars}"
+
+    async def parse(self, content: bytes, mime_type: str, digest: Optional[str] = None) -> Dict[str, Any]:
+        """Resume fields extracted from a PDF or DOCX file (digest: its SHA-256, if already known)"""
+        if digest is None:
+            digest = (await asyncio.to_thread(hashlib.sha256, content)).hexdigest()
+        key = self._key(digest, mime_type)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        parsed = await self.pool.submit(_parse_in_worker, content, mime_type, self.max_pages, self.max_chars)
+        self._cache[key] = parsed
+        while len(self._cache) > self.cache_entries:
+            self._cache.popitem(last=False)
+        return parsed
+
+    async def start(self):
+        """Start the workers with the parsers imported"""
+        await self.pool.start()
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self.pool.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            **self.pool.stats(),
+            "cache_entries": len(self._cache),
+            "cache_hits": self.hits,
+            "cache_misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+
+# Global instance
+resume_parser = ResumeParseService(
+    ProcessWorkerPool(
+        "Resume parsing",
+        max_workers=settings.RESUME_PARSE_WORKERS or min(2, os.cpu_count() or 1),
+        max_pending=settings.RESUME_PARSE_MAX_PENDING,
+        timeout=settings.RESUME_PARSE_TIMEOUT_SECONDS,
+        queue_timeout=settings.RESUME_PARSE_QUEUE_TIMEOUT_SECONDS,
+        initializer=_init_worker
+    ),
+    max_pages=settings.RESUME_PARSE_MAX_PAGES,
+    max_chars=settings.RESUME_PARSE_MAX_CHARS,
+    cache_entries=settings.RESUME_PARSE_CACHE_ENTRIES
+)
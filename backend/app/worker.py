@@ -0,0 +1,42 @@
+"""
+Standalone background task worker.
+
+Run alongside the API when TASK_QUEUE_BACKEND=redis (set TASK_QUEUE_WORKERS=0
+on the API processes to keep third-party I/O out of them entirely):
+    python -m app.worker
+"""
+import asyncio
+import logging
+import signal
+from app.core.config import settings
+from app.db.mongodb import close_mongo_connection, connect_to_mongo
+from app.services.email_templates import email_templates
+from app.services.mailer import mailer
+from app.services.task_queue import task_queue
+import app.services.tasks  # noqa: F401  (registers background tasks)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    await connect_to_mongo()
+    email_templates.load()
+    task_queue.workers = settings.TASK_WORKER_CONCURRENCY
+    task_queue.start()
+    logger.info(f"Task worker started: {task_queue.stats()}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await task_queue.stop()
+    await mailer.close()
+    await close_mongo_connection()
+    logger.info(f"Task worker stopped: {task_queue.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
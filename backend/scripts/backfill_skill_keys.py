@@ -0,0 +1,51 @@
+"""
+Set users.skill_keys from users.skills for accounts created before the field
+existed, so new-job alerts reach them. Safe to re-run; it only writes users
+whose keys are missing or out of date.
+
+Usage (from the backend directory):
+    python scripts/backfill_skill_keys.py [--batch-size 1000]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.services.skill_taxonomy import skill_keys
+
+
+async def run(batch_size: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    users = client[settings.MONGODB_DB_NAME].users
+    scanned = updated = 0
+    batch = []
+    async for user in users.find({"skills": {"$exists": True}}, {"skills": 1, "skill_keys": 1}):
+        scanned += 1
+        keys = skill_keys(user["skills"] if isinstance(user["skills"], list) else [])
+        if user.get("skill_keys") != keys:
+            batch.append(UpdateOne({"_id": user["_id"]}, {"$set": {"skill_keys": keys}}))
+        if len(batch) >= batch_size:
+            updated += (await users.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+    if batch:
+        updated += (await users.bulk_write(batch, ordered=False)).modified_count
+    await users.create_index("skill_keys")
+    client.close()
+    print(f"scanned {scanned} users, updated {updated}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(run(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark batch rendering of job-alert emails.
+
+Each alert lists a few jobs drawn from a shared pool, the way a daily digest
+does, and a share of recipients get the Spanish variant. Compared:
+- inline f-strings with html.escape per field (the old approach, made safe)
+- Jinja2 compiling the template source for every email
+- templates compiled once, without the fragment cache
+- templates compiled once, with job cards from the fragment cache
+
+Usage (from the backend directory):
+    python scripts/benchmark_email_templates.py [--alerts 5000] [--jobs 300] [--per-alert 5]
+"""
+import argparse
+import html
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.email_templates import TEMPLATE_DIR, EmailTemplates
+
+APP_URL = "http://localhost:3000"
+JOB_TYPES = ["full_time", "part_time", "contract", "internship"]
+CITIES = ["Bengaluru", "Pune", "Mumbai", "Hyderabad", "Remote"]
+
+
+def build_alerts(alert_count: int, job_count: int, per_alert: int, spanish_share: float):
+    rng = random.Random(7)
+    jobs = [
+        {
+            "_id": f"{i:024x}",
+            "title": f"Senior Engineer & Lead #{i}",
+            "company_name": f"Company {i % 40}",
+            "location": rng.choice(CITIES),
+            "job_type": rng.choice(JOB_TYPES),
+            "updated_at": "2026-10-01T09:00:00"
+        }
+        for i in range(job_count)
+    ]
+    return [
+        {
+            "email": f"user{i}@example.com",
+            "name": f"User <{i}>",
+            "locale": "es" if rng.random() < spanish_share else "en",
+            "jobs": rng.sample(jobs, per_alert)
+        }
+        for i in range(alert_count)
+    ]
+
+
+def render_fstring(alert):
+    cards = "".join(
+        f"""<table width="100%" cellpadding="12"><tr><td>
+            <a href="{APP_URL}/jobs/{html.escape(job['_id'])}">{html.escape(job['title'])}</a>
+            <p>{html.escape(job['company_name'])} &middot; {html.escape(job['location'])}</p>
+            <p>{html.escape(job['job_type'].replace('_', ' ').title())}</p>
+        </td></tr></table>"""
+        for job in alert["jobs"]
+    )
+    subject = f"{len(alert['jobs'])} new jobs for you - SkillGlide"
+    body = f"""<html><head><title>{subject}</title></head><body>
+        <h2>Hi {html.escape(alert['name'])},</h2>
+        <p>These jobs were posted recently and match your profile:</p>
+        {cards}
+        <p><a href="{APP_URL}/jobs">See all jobs</a></p>
+        <br><p>Best regards,<br>The SkillGlide Team</p>
+    </body></html>"""
+    return subject, body
+
+
+def render_compile_per_email(alert):
+    """A fresh environment per email, so the template chain is compiled every time"""
+    templates = EmailTemplates(TEMPLATE_DIR, fragment_cache_size=0, globals={"app_url": APP_URL})
+    name = "es/job_alert.html" if alert["locale"] == "es" else "job_alert.html"
+    return templates.env.get_template(name).render(name=alert["name"], jobs=alert["jobs"], locale=alert["locale"])
+
+
+def make_compiled(fragment_cache_size: int):
+    templates = EmailTemplates(TEMPLATE_DIR, fragment_cache_size=fragment_cache_size, globals={"app_url": APP_URL})
+    templates.load()
+
+    def render(alert):
+        return templates.render("job_alert.html", alert["locale"], name=alert["name"], jobs=alert["jobs"])
+    return render, templates
+
+
+def bench(label: str, render, alerts) -> float:
+    started = time.perf_counter()
+    for alert in alerts:
+        render(alert)
+    elapsed = time.perf_counter() - started
+    rate = len(alerts) / elapsed
+    print(f"  {label:<38} {elapsed * 1000:9.1f} ms  {rate:10.0f} emails/s")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--alerts", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--per-alert", type=int, default=5)
+    parser.add_argument("--spanish-share", type=float, default=0.2)
+    args = parser.parse_args()
+    alerts = build_alerts(args.alerts, args.jobs, args.per_alert, args.spanish_share)
+
+    uncached, _ = make_compiled(0)
+    cached, templates = make_compiled(5000)
+    for alert in alerts[:200]:
+        assert uncached(alert) == cached(alert), alert["email"]
+    templates.clear_fragments()
+
+    print(f"{args.alerts} job alerts, {args.per_alert} of {args.jobs} jobs each, "
+          f"{args.spanish_share:.0%} Spanish")
+    sample = alerts[:max(1, args.alerts // 20)]
+    bench("inline f-strings + html.escape", render_fstring, alerts)
+    per_email = bench(f"compile per email ({len(sample)} sampled)", render_compile_per_email, sample)
+    no_cache = bench("compiled once, no fragment cache", uncached, alerts)
+    bench("compiled once, fragment cache (cold)", cached, alerts)
+    warm = bench("compiled once, fragment cache (warm)", cached, alerts)
+    print(f"fragment cache holds {templates.stats()['fragments']} job cards; warm rendering is "
+          f"{warm / no_cache:.1f}x uncached fragments and {warm / per_email:.0f}x compiling per email")
+
+
+if __name__ == "__main__":
+    main()
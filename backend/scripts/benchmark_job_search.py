@@ -0,0 +1,93 @@
+"""
+Benchmark the in-process job search index on a synthetic corpus.
+
+Usage (from the backend directory):
+    python scripts/benchmark_job_search.py --jobs 100000 --runs 200
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.job_search import JobSearchIndex
+
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer",
+          "Frontend Developer", "Backend Developer", "QA Analyst", "UX Designer",
+          "Machine Learning Engineer", "Sales Executive", "Marketing Manager", "Accountant"]
+SKILLS = ["python", "java", "javascript", "react", "node", "sql", "mongodb", "aws", "docker",
+          "kubernetes", "excel", "figma", "tensorflow", "go", "rust", "c++", "c#", "salesforce"]
+LOCATIONS = ["Bangalore", "Mumbai", "Delhi", "Pune", "Hyderabad", "Chennai", "Remote", "Gurgaon"]
+JOB_TYPES = ["full_time", "part_time", "contract", "internship"]
+WORK_MODES = ["remote", "onsite", "hybrid"]
+LEVELS = ["entry", "mid", "senior", "lead"]
+WORDS = ("build maintain scalable services team customers platform design deliver features "
+         "collaborate cross functional stakeholders analyse data pipelines testing quality "
+         "cloud infrastructure automation reporting growth strategy mentoring").split()
+
+
+def make_job(i: int, rng: random.Random) -> dict:
+    skills = rng.sample(SKILLS, 4)
+    return {
+        "_id": f"{i:024x}",
+        "title": f"{rng.choice(['Senior', 'Junior', 'Lead', ''])} {rng.choice(TITLES)}".strip(),
+        "description": " ".join(rng.choices(WORDS, k=60)),
+        "required_skills": skills[:3],
+        "preferred_skills": skills[3:],
+        "keywords": rng.sample(WORDS, 3),
+        "status": "published",
+        "job_type": rng.choice(JOB_TYPES),
+        "work_mode": rng.choice(WORK_MODES),
+        "experience_level": rng.choice(LEVELS),
+        "location": rng.choice(LOCATIONS),
+        "company_id": f"company-{rng.randrange(500)}",
+        "salary_min": rng.randrange(300000, 3000000, 50000),
+        "salary_max": rng.randrange(3000000, 6000000, 50000),
+        "created_at": datetime(2024, 1, 1) + timedelta(minutes=i)
+    }
+
+
+def measure(index: JobSearchIndex, runs: int, **kwargs) -> str:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        result = index.search(**kwargs)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    return f"p50 {statistics.median(timings):7.2f} ms   p95 {p95:7.2f} ms   total {result['total']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    jobs = [make_job(i, rng) for i in range(args.jobs)]
+
+    started = time.perf_counter()
+    index = JobSearchIndex()
+    for job in jobs:
+        index.upsert(job)
+    print(f"Indexed {len(index)} jobs in {time.perf_counter() - started:.2f} s")
+
+    cases = {
+        "exact term": {"query": "python engineer", "prefix": False},
+        "prefix (type-ahead)": {"query": "backend dev"},
+        "filtered": {"query": "engineer", "filters": {"work_mode": ["remote"], "location": "bangalore",
+                                                      "salary_min": 1000000}},
+        "filters only": {"filters": {"job_type": ["full_time"], "experience_level": "senior"}},
+        "faceted": {"query": "data", "include_facets": True},
+    }
+    for name, kwargs in cases.items():
+        print(f"{name:22} {measure(index, args.runs, **kwargs)}")
+
+
+if __name__ == "__main__":
+    main()
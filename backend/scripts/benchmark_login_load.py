@@ -0,0 +1,105 @@
+"""
+Measure how concurrent logins affect the latency of unrelated endpoints.
+
+Runs an in-process ASGI app with a cheap /ping endpoint and two login
+variants: one calling bcrypt inline on the event loop (the old behaviour)
+and one going through the password hashing pool. While a number of clients
+log in continuously, another client measures /ping latency.
+
+Usage (from the backend directory):
+    python scripts/benchmark_login_load.py --logins 16 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+from app.services.password_hasher import password_hasher
+
+PASSWORD = "correct horse battery staple"
+HASHED = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+@app.post("/login/inline")
+async def login_inline():
+    return {"ok": bcrypt.checkpw(PASSWORD.encode("utf-8"), HASHED.encode("utf-8"))}
+
+
+@app.post("/login/pooled")
+async def login_pooled():
+    return {"ok": await password_hasher.verify(PASSWORD, HASHED)}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(mode: str, logins: int, seconds: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        stop = asyncio.Event()
+        login_count = 0
+
+        async def login_loop():
+            nonlocal login_count
+            while not stop.is_set():
+                await client.post(f"/login/{mode}")
+                login_count += 1
+                # Stand in for the network round trip between requests
+                await asyncio.sleep(0.001)
+
+        workers = [asyncio.create_task(login_loop()) for _ in range(logins)] if mode != "idle" else []
+        await asyncio.sleep(0.2)
+
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            # Latency is measured from when the ping was due, so time spent
+            # waiting for a blocked event loop is counted
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - due) * 1000)
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*workers)
+
+    print(
+        f"{mode:8} /ping p50 {statistics.median(latencies):8.2f} ms  "
+        f"p99 {percentile(latencies, 0.99):8.2f} ms  "
+        f"samples {len(latencies):5}  "
+        f"logins/s {login_count / elapsed:7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=16, help="concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10, help="measurement time per mode")
+    args = parser.parse_args()
+
+    for mode in ("idle", "inline", "pooled"):
+        asyncio.run(run(mode, args.logins, args.seconds))
+    print(f"pool stats: {password_hasher.stats()}")
+    password_hasher.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Load test of concurrent video seeking against the uploads file server.
+
+Writes a random "video" into a temporary uploads directory as a
+content-addressed blob, then has a number of clients seek to random
+offsets with Range requests, like a player scrubbing through a video.
+Every response body is checked against the file. Plain StaticFiles is
+run for comparison: it ignores Range, so each seek downloads the whole
+file.
+
+Usage (from the backend directory):
+    python scripts/benchmark_media_seek.py --clients 32 --seeks 50 --size-mb 64
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from starlette.staticfiles import StaticFiles
+
+from app.services.media_files import MediaFiles
+
+SEEK_BYTES = 1024 * 1024  # what a player typically asks for after a seek
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def check_protocol(client_app, url: str, payload: bytes, sha256: str):
+    """Conditional GET, suffix and open ranges, If-Range and 416 behave as expected"""
+    async def run():
+        transport = httpx.ASGITransport(app=client_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            full = await client.get(url)
+            assert full.status_code == 200 and full.content == payload
+            assert full.headers["etag"] == f'"{sha256}"'
+            assert "immutable" in full.headers["cache-control"]
+
+            assert (await client.get(url, headers={"If-None-Match": full.headers["etag"]})).status_code == 304
+            tail = await client.get(url, headers={"Range": "bytes=-100"})
+            assert tail.status_code == 206 and tail.content == payload[-100:]
+            assert tail.headers["content-range"] == f"bytes {len(payload) - 100}-{len(payload) - 1}/{len(payload)}"
+            rest = await client.get(url, headers={"Range": f"bytes={len(payload) - 10}-"})
+            assert rest.status_code == 206 and rest.content == payload[-10:]
+            stale = await client.get(url, headers={"Range": "bytes=0-9", "If-Range": '"stale"'})
+            assert stale.status_code == 200 and len(stale.content) == len(payload)
+            beyond = await client.get(url, headers={"Range": f"bytes={len(payload)}-"})
+            assert beyond.status_code == 416 and beyond.headers["content-range"] == f"bytes */{len(payload)}"
+            head = await client.head(url, headers={"Range": "bytes=0-99"})
+            assert head.status_code == 206 and head.content == b"" and head.headers["content-length"] == "100"
+            assert (await client.get("/uploads/tmp/scratch.part")).status_code == 404
+    asyncio.run(run())
+    print("protocol checks ok")
+
+
+async def seek_load(app, url: str, payload: bytes, clients: int, seeks: int):
+    transport = httpx.ASGITransport(app=app)
+    latencies = []
+    transferred = 0
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def player(seed: int):
+            nonlocal transferred
+            rng = random.Random(seed)
+            for _ in range(seeks):
+                start = rng.randrange(0, len(payload) - SEEK_BYTES)
+                end = start + SEEK_BYTES - 1
+                began = time.perf_counter()
+                response = await client.get(url, headers={"Range": f"bytes={start}-{end}"})
+                latencies.append((time.perf_counter() - began) * 1000)
+                transferred += len(response.content)
+                expected = payload[start:end + 1] if response.status_code == 206 else payload
+                assert response.content == expected, "body does not match the requested range"
+
+        started = time.perf_counter()
+        await asyncio.gather(*(player(seed) for seed in range(clients)))
+        elapsed = time.perf_counter() - started
+    return latencies, transferred, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=32, help="concurrent players")
+    parser.add_argument("--seeks", type=int, default=50, help="seeks per player")
+    parser.add_argument("--size-mb", type=int, default=64, help="size of the test video")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        payload = os.urandom(args.size_mb * 1024 * 1024)
+        sha256 = hashlib.sha256(payload).hexdigest()
+        key = f"blobs/{sha256[:2]}/{sha256}.mp4"
+        os.makedirs(os.path.join(root, os.path.dirname(key)))
+        os.makedirs(os.path.join(root, "tmp"))
+        with open(os.path.join(root, key), "wb") as handle:
+            handle.write(payload)
+        with open(os.path.join(root, "tmp", "scratch.part"), "wb") as handle:
+            handle.write(b"partial")
+        url = f"/uploads/{key}"
+
+        apps = {
+            "media": Starlette(routes=[Mount("/uploads", MediaFiles(directory=root))]),
+            "static": Starlette(routes=[Mount("/uploads", StaticFiles(directory=root))]),
+        }
+        check_protocol(apps["media"], url, payload, sha256)
+
+        for name, app in apps.items():
+            latencies, transferred, elapsed = asyncio.run(seek_load(app, url, payload, args.clients, args.seeks))
+            print(
+                f"{name:6} seeks {len(latencies):5}  "
+                f"p50 {statistics.median(latencies):8.2f} ms  "
+                f"p99 {percentile(latencies, 0.99):8.2f} ms  "
+                f"seeks/s {len(latencies) / elapsed:8.1f}  "
+                f"transferred {transferred / 1024 / 1024:9.1f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
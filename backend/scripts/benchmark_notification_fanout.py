@@ -0,0 +1,116 @@
+"""
+Benchmark notification fan-out against MongoDB: one insert_one per recipient
+(create_notification in a loop over a fully loaded user list) versus
+NotificationService.fan_out, which streams recipients from a cursor and writes
+insert_many(ordered=False) batches. Also checks preference filtering and that
+repeating a fan-out (a retried task) inserts nothing new.
+
+Seeds a throwaway database on MONGODB_URI and drops it afterwards.
+
+Usage (from the backend directory):
+    python scripts/benchmark_notification_fanout.py [--users 20000] [--batch-size 500]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.config import settings
+from app.services.notification_service import NotificationService
+
+SKILLS = ["Python", "React", "SQL", "AWS", "Docker", "Java", "Go", "Figma"]
+QUERY = {"role": "jobseeker", "skills": {"$in": ["Python"]}}
+
+
+async def seed_users(db, count: int):
+    rng = random.Random(11)
+    docs = [
+        {
+            "email": f"seeker{i}@example.com",
+            "name": f"Seeker {i}",
+            "role": "jobseeker",
+            "skills": rng.sample(SKILLS, 3),
+            "job_alerts": rng.random() >= 0.1,
+            "push_notifications": rng.random() >= 0.1,
+            "email_notifications": rng.random() >= 0.5
+        }
+        for i in range(count)
+    ]
+    for start in range(0, count, 5000):
+        await db.users.insert_many(docs[start:start + 5000], ordered=False)
+    await db.notifications.create_index(
+        [("fan_out_id", 1), ("user_id", 1)],
+        unique=True,
+        partialFilterExpression={"fan_out_id": {"$exists": True}}
+    )
+
+
+async def bench(db, user_count: int, batch_size: int):
+    await seed_users(db, user_count)
+    service = NotificationService()
+    service.users_collection = db.users
+    service.notifications_collection = db.notifications
+    notification = dict(title="New Python job", message="Acme posted Backend Engineer", notification_type="job_posted")
+
+    # Before: load every recipient, filter preferences in Python, one insert per user
+    started = time.perf_counter()
+    users = await db.users.find({**QUERY, "job_alerts": {"$ne": False}}).to_list(length=None)
+    per_user = 0
+    for user in users:
+        if user.get("push_notifications", True) is not False:
+            await service.create_notification(user_id=str(user["_id"]), **notification)
+            per_user += 1
+    per_user_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    counts = await service.fan_out(
+        QUERY, preference="job_alerts", fan_out_id="bench", batch_size=batch_size, **notification
+    )
+    fan_out_seconds = time.perf_counter() - started
+    assert counts["inserted"] == per_user and counts["failed"] == 0, counts
+    assert counts["recipients"] == len(users) and counts["skipped"] == len(users) - per_user, counts
+
+    print(f"{user_count} users, {len(users)} match, {per_user} want in-app notifications")
+    print(f"  insert_one per user: {per_user_seconds * 1000:9.1f} ms  {per_user / per_user_seconds:9.0f} notifications/s")
+    print(f"  fan_out ({batch_size}/batch): {fan_out_seconds * 1000:9.1f} ms  {per_user / fan_out_seconds:9.0f} notifications/s"
+          f"  {per_user_seconds / fan_out_seconds:.1f}x")
+
+    repeat = await service.fan_out(QUERY, preference="job_alerts", fan_out_id="bench", batch_size=batch_size, **notification)
+    assert repeat["inserted"] == 0 and repeat["duplicates"] == per_user, repeat
+    print(f"repeated fan-out inserted nothing: {repeat}")
+
+    ids = (str(user["_id"]) for user in users)
+    by_id = await service.fan_out_to_users(ids, fan_out_id="bench-ids", batch_size=batch_size, **notification)
+    opted_in = sum(1 for user in users if user.get("push_notifications", True) is not False)
+    assert by_id["inserted"] == opted_in, by_id
+    print(f"fan_out_to_users ok: {by_id}")
+
+
+async def run(user_count: int, batch_size: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"fanout_bench_{uuid.uuid4().hex[:8]}"]
+    try:
+        await bench(db, user_count, batch_size)
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.batch_size))
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measure the resume PDF render cache.
+
+Times a cold ReportLab render, a memory-tier hit and a disk-tier hit (fresh
+memory, as after a restart), then replays a resume-builder style workload
+where each edit is followed by several preview refreshes of the same data
+and prints the resulting cache stats.
+
+Usage (from the backend directory):
+    python scripts/benchmark_pdf_cache.py --edits 50 --refreshes 4
+"""
+import argparse
+import copy
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.pdf_cache import PDFRenderCache
+from app.services.pdf_generator import PDFGenerator
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_pdf_response import sample_resume
+
+
+def timed(fn, repeat: int = 20) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--edits", type=int, default=50, help="distinct versions of the resume")
+    parser.add_argument("--refreshes", type=int, default=4, help="preview refreshes per version")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        resume = sample_resume(6)
+        uncached = PDFGenerator()
+        cache = PDFRenderCache(directory)
+        cached = PDFGenerator(cache=cache)
+
+        print(f"cold render     {timed(lambda: uncached.generate_resume_pdf(resume)):8.3f} ms")
+        cached.generate_resume_pdf(resume)
+        print(f"memory hit      {timed(lambda: cached.generate_resume_pdf(resume), 200):8.3f} ms")
+
+        def disk_hit():
+            cache.clear()
+            cached.generate_resume_pdf(resume)
+        print(f"disk hit        {timed(disk_hit, 200):8.3f} ms")
+
+        workload = PDFRenderCache(directory=None)
+        generator = PDFGenerator(cache=workload)
+        started = time.perf_counter()
+        for edit in range(args.edits):
+            version = copy.deepcopy(resume)
+            version["personalInfo"]["summary"] += f" Edit {edit}."
+            for _ in range(1 + args.refreshes):
+                # Clients do not preserve key order between requests
+                generator.generate_resume_pdf(dict(reversed(list(version.items()))))
+        elapsed = time.perf_counter() - started
+        requests = args.edits * (1 + args.refreshes)
+        print(f"workload        {elapsed / requests * 1000:8.3f} ms/request over {requests} requests")
+        print(f"workload stats  {workload.stats()}")
+
+
+if __name__ == "__main__":
+    main()
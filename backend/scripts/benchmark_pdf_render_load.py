@@ -0,0 +1,111 @@
+"""
+Measure how concurrent PDF generation affects the latency of unrelated endpoints.
+
+Runs an in-process ASGI app with a cheap /ping endpoint (standing in for job
+browsing) and two render variants: ReportLab called inline on the event
+loop (the old behaviour) and the worker process pool. The render cache is
+bypassed so every request lays out a document. While a number of clients
+request PDFs continuously, another client measures /ping latency.
+
+Usage (from the backend directory):
+    python scripts/benchmark_pdf_render_load.py --clients 8 --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.services.pdf_generator import PDFGenerator
+from app.services.pdf_renderer import PDFRenderPool
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from benchmark_pdf_response import sample_resume
+
+RESUME = sample_resume(8)
+generator = PDFGenerator()
+pool = PDFRenderPool(max_workers=min(2, os.cpu_count() or 1), max_pending=64)
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping():
+    return {"ok": True}
+
+
+@app.post("/pdf/inline")
+async def pdf_inline():
+    return {"size": len(generator.render_resume_pdf(RESUME))}
+
+
+@app.post("/pdf/pool")
+async def pdf_pool():
+    return {"size": len(await pool.render_resume(RESUME))}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(mode: str, clients: int, seconds: float):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        if mode == "pool":
+            await pool.start()
+        stop = asyncio.Event()
+        renders = 0
+
+        async def render_loop():
+            nonlocal renders
+            while not stop.is_set():
+                (await client.post(f"/pdf/{mode}")).raise_for_status()
+                renders += 1
+                # Stand in for the network round trip between requests
+                await asyncio.sleep(0.001)
+
+        workers = [asyncio.create_task(render_loop()) for _ in range(clients)] if mode != "idle" else []
+        await asyncio.sleep(0.2)
+
+        latencies = []
+        started = time.perf_counter()
+        while time.perf_counter() - started < seconds:
+            # Measured from when the ping was due, so time blocked behind a render counts
+            due = time.perf_counter() + 0.005
+            await asyncio.sleep(0.005)
+            await client.get("/ping")
+            latencies.append((time.perf_counter() - due) * 1000)
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await asyncio.gather(*workers)
+
+    print(
+        f"{mode:6} /ping p50 {statistics.median(latencies):8.2f} ms  "
+        f"p99 {percentile(latencies, 0.99):8.2f} ms  "
+        f"samples {len(latencies):5}  "
+        f"renders/s {renders / elapsed:7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=8, help="concurrent PDF clients")
+    parser.add_argument("--seconds", type=float, default=10, help="measurement time per mode")
+    args = parser.parse_args()
+
+    for mode in ("idle", "inline", "pool"):
+        asyncio.run(run(mode, args.clients, args.seconds))
+    print(f"pool stats: {pool.stats()}")
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
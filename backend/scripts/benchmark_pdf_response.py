@@ -0,0 +1,94 @@
+"""
+Compare the generate-pdf response formats for typical resumes.
+
+Posts a short and a long resume to /resumes/generate-pdf in-process and
+reports response bytes and end-to-end latency (including turning the
+response back into PDF bytes on the client) for the binary stream, the
+base64 JSON mode and the legacy hex JSON mode.
+
+Usage (from the backend directory):
+    python scripts/benchmark_pdf_response.py --requests 30
+"""
+import argparse
+import asyncio
+import base64
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.v1.endpoints import resumes
+
+
+def sample_resume(jobs: int) -> dict:
+    return {
+        "personalInfo": {
+            "name": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "phone": "+1 234 567 8900",
+            "location": "San Francisco, CA",
+            "summary": "Backend engineer focused on APIs, data pipelines and developer tooling. " * 3
+        },
+        "experience": [
+            {
+                "title": f"Senior Engineer {i}",
+                "company": f"Company {i}",
+                "location": "Remote",
+                "startDate": "2019-01-01",
+                "endDate": "2021-06-01",
+                "description": "Designed and operated services handling millions of requests per day. " * 4
+            }
+            for i in range(jobs)
+        ],
+        "education": [{"degree": "BSc Computer Science", "institution": "State University", "graduationDate": "2015-06-01"}],
+        "skills": ["Python", "FastAPI", "MongoDB", "Redis", "TypeScript", "React", "Docker", "AWS"],
+        "projects": [{"name": "Open source CLI", "description": "A tool used by thousands of developers. " * 2}],
+        "certifications": [{"name": "AWS Solutions Architect", "issuer": "Amazon", "date": "2022-01-01"}]
+    }
+
+
+def decode(mode: str, response: httpx.Response) -> bytes:
+    if mode == "binary":
+        return response.content
+    body = response.json()
+    return base64.b64decode(body["pdf_base64"]) if mode == "base64" else bytes.fromhex(body["pdf_content"])
+
+
+async def measure(client: httpx.AsyncClient, payload: dict, mode: str, requests: int):
+    latencies, sizes = [], []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.post("/resumes/generate-pdf", params={"format": mode}, json=payload)
+        response.raise_for_status()
+        pdf = decode(mode, response)
+        latencies.append((time.perf_counter() - started) * 1000)
+        sizes.append(len(response.content))
+        assert pdf.startswith(b"%PDF"), "response is not a PDF"
+    return statistics.median(latencies), statistics.median(sizes), len(pdf)
+
+
+async def main(requests: int):
+    app = FastAPI()
+    app.include_router(resumes.router, prefix="/resumes")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for label, jobs in (("short", 2), ("long", 12)):
+            payload = sample_resume(jobs)
+            for mode in ("binary", "base64", "hex"):
+                latency, size, pdf_size = await measure(client, payload, mode, requests)
+                print(
+                    f"{label:5} {mode:6} response {size / 1024:8.1f} KB "
+                    f"({size / pdf_size:4.2f}x pdf)  p50 {latency:7.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=30, help="requests per resume and format")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,81 @@
+"""
+Check and measure the streamed applicant resume ZIP export.
+
+Feeds fake application and user cursors through ResumeExporter with a real
+render pool, verifies the archive, and reports chunks streamed, archive
+size, peak Python memory held besides the output, and wall time for a few
+applicant counts. Peak memory should stay roughly flat as the count grows.
+
+Usage (from the backend directory):
+    python scripts/benchmark_resume_export.py --applicants 0 50 200 1000
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bson import ObjectId
+
+from app.services.pdf_renderer import PDFRenderPool
+from app.services.resume_export import ResumeExporter
+
+
+
+class Cursor:
+    """Minimal stand-in for an async Motor cursor"""
+
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def __aiter__(self):
+        for doc in self.docs:
+            yield doc
+
+
+class Users:
+    def find(self, query):
+        emails = query["email"]["$in"]
+        return Cursor({"email": email, "name": "N", "skills": ["Python"], "bio": "Bio " * 50} for email in emails)
+
+
+def applications(count: int):
+    for i in range(count):
+        yield {"_id": ObjectId(), "applicant_name": f"Person {i}", "applicant_email": f"p{i}@example.com"}
+
+
+async def main(count: int):
+    pool = PDFRenderPool(max_workers=2, max_pending=8)
+    await pool.start()
+    exporter = ResumeExporter(pool, window=4)
+
+    tracemalloc.start()
+    out = io.BytesIO()
+    chunks = 0
+    started = time.perf_counter()
+    async for chunk in exporter.stream_zip(Cursor(applications(count)), Users()):
+        out.write(chunk)
+        chunks += 1
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    pool.shutdown()
+
+    archive = zipfile.ZipFile(out)
+    assert archive.testzip() is None and len(archive.namelist()) == max(count, 1), "archive is incomplete"
+    print(
+        f"applicants {count:5}  chunks {chunks:5}  zip {out.tell() / 1024:8.1f} KB  "
+        f"peak {(peak - out.tell()) / 1024:8.1f} KB  {time.perf_counter() - started:6.1f} s"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applicants", type=int, nargs="+", default=[0, 50, 200, 1000])
+    args = parser.parse_args()
+    for count in args.applicants:
+        asyncio.run(main(count))
@@ -0,0 +1,140 @@
+"""
+Measure resume field extraction on the sample corpus in scripts/resume_corpus.
+
+Each resume has hand-labelled fields in expected.json. For the old
+multi-pass extractor and the single-pass ResumeExtractor this reports:
+- throughput (resumes per second) on the corpus and on one very long text
+- field accuracy: contact fields, experience entries (position, company,
+  start, end), education entries (institution, degree, end date)
+- skill precision and recall against the labelled canonical skills
+
+Usage (from the backend directory):
+    python scripts/benchmark_resume_extractor.py [--rounds 200]
+
+Accepted results (Python 3.11, --rounds 200, spread over several runs on
+one machine; compare the "x old" ratios when running elsewhere):
+
+                  resumes/s   long text     fields   skills P/R
+    old           6900-7900   25-28 ms         23%      0%/0%
+    single-pass   3200-4600   48-65 ms         99%    100%/100%
+
+The single-pass extractor runs at about half the old throughput and about
+2x its long-text time (first version: 2550 resumes/s, 95-116 ms). The old
+extractor finds no sections, dates or skills; the token scan alone, which
+tries the skill taxonomy at every word start, costs about as much as the
+whole old extractor, and the rest is the per-line classification.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.resume_extractor import resume_extractor
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_corpus")
+
+
+def old_extract(text_content: str):
+    """The previous extractor: several findall passes over the whole text"""
+    lines = text_content.split('\n')
+    personal_info = {}
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text_content)
+    if emails:
+        personal_info['email'] = emails[0]
+    phones = re.findall(r'(\+?[\d\s\-\(\)]{10,})', text_content)
+    if phones:
+        personal_info['phone'] = phones[0].strip()
+    for line in lines[:10]:
+        line = line.strip()
+        if line and len(line.split()) <= 4 and not any(char.isdigit() for char in line):
+            personal_info['name'] = line
+            break
+    summary_candidates = [line.strip() for line in lines if 50 < len(line.strip()) < 500]
+    if summary_candidates:
+        personal_info['summary'] = summary_candidates[0]
+    for pattern in (r'\b[A-Z][a-z]+,\s*[A-Z]{2}\b', r'\b[A-Z][a-z]+,\s*[A-Z][a-z]+\b'):
+        locations = re.findall(pattern, text_content)
+        if locations:
+            personal_info['location'] = locations[0]
+            break
+    return {'personalInfo': personal_info, 'rawText': text_content[:1000]}
+
+
+def load_corpus():
+    with open(os.path.join(CORPUS, "expected.json")) as f:
+        expected = json.load(f)
+    samples = []
+    for name in sorted(expected):
+        with open(os.path.join(CORPUS, name), encoding="utf-8") as f:
+            samples.append((name, f.read(), expected[name]))
+    return samples
+
+
+def score(result, expected):
+    """(correct, total) field counts and (true positive, predicted, labelled) skill counts"""
+    correct = total = 0
+    for field, value in expected["personalInfo"].items():
+        total += 1
+        correct += result.get("personalInfo", {}).get(field) == value
+
+    experience = result.get("experience", [])
+    for index, (position, company, start, end) in enumerate(expected["experience"]):
+        got = experience[index] if index < len(experience) else {}
+        for key, value in (("position", position), ("company", company), ("startDate", start), ("endDate", end)):
+            total += 1
+            correct += key in got and got[key] == value
+
+    education = result.get("education", [])
+    for index, (institution, degree, end) in enumerate(expected["education"]):
+        got = education[index] if index < len(education) else {}
+        for key, value in (("institution", institution), ("degree", degree), ("endDate", end)):
+            total += 1
+            correct += key in got and got[key] == value
+
+    predicted = {skill.lower() for skill in result.get("skills", [])}
+    labelled = {skill.lower() for skill in expected["skills"]}
+    return correct, total, len(predicted & labelled), len(predicted), len(labelled)
+
+
+def throughput(extract, texts, rounds: int) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            extract(text)
+    return rounds * len(texts) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    samples = load_corpus()
+    texts = [text for _, text, _ in samples]
+    long_text = "\n".join(texts * 40)
+    print(f"corpus: {len(samples)} resumes, long text {len(long_text) / 1024:.0f} KB")
+
+    baseline = None
+    for label, extract in (("old", old_extract), ("single-pass", resume_extractor.extract)):
+        totals = [0, 0, 0, 0, 0]
+        for name, text, expected in samples:
+            for i, value in enumerate(score(extract(text), expected)):
+                totals[i] += value
+        correct, total, true_positive, predicted, labelled = totals
+        per_second = throughput(extract, texts, args.rounds)
+        long_ms = 1000 / throughput(extract, [long_text], 5)
+        baseline = baseline or (per_second, long_ms)
+        print(
+            f"{label:12} {per_second:9.0f} resumes/s ({per_second / baseline[0]:.2f}x old)   "
+            f"long text {long_ms:7.1f} ms ({long_ms / baseline[1]:.2f}x old)   "
+            f"fields {correct}/{total} ({correct / total:.0%})   "
+            f"skills precision {true_positive / predicted if predicted else 0:.0%} recall {true_positive / labelled:.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Measure uploaded resume parsing.
+
+Builds a normal 2-page PDF resume, a 300-page PDF and a large DOCX, then
+reports:
+- the old full extraction (string += over every page or paragraph) against
+  the capped, list-joined extraction
+- an end-to-end parse through the worker pool, cold and from the
+  content-hash cache
+
+Usage (from the backend directory):
+    python scripts/benchmark_resume_parse.py
+"""
+import asyncio
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PyPDF2
+from docx import Document
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.core.config import settings
+from app.services.text_extraction import DOCX_MIME_TYPE, PDF_MIME_TYPE, extract_docx_text, extract_pdf_text, resume_parser
+
+LINE = "Led a team of engineers building data pipelines and APIs in Python. "
+
+
+def make_pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    for page in range(pages):
+        for row in range(50):
+            pdf.drawString(40, 800 - row * 15, f"{page}.{row} {LINE}")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def make_docx(paragraphs: int) -> bytes:
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i} {LINE * 3}")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def old_pdf(content: bytes) -> str:
+    text = ""
+    for page in PyPDF2.PdfReader(io.BytesIO(content)).pages:
+        text += page.extract_text()
+    return text
+
+
+def old_docx(content: bytes) -> str:
+    text = ""
+    for paragraph in Document(io.BytesIO(content)).paragraphs:
+        text += paragraph.text + "\n"
+    return text
+
+
+def timed(fn) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+async def pooled(samples):
+    await resume_parser.start()
+    for label, content, mime_type in samples:
+        cold = time.perf_counter()
+        await resume_parser.parse(content, mime_type)
+        cold = (time.perf_counter() - cold) * 1000
+        warm = time.perf_counter()
+        await resume_parser.parse(content, mime_type)
+        warm = (time.perf_counter() - warm) * 1000
+        print(f"{label:12} pool cold {cold:9.2f} ms   cached {warm:7.3f} ms")
+    print(f"parser stats: {resume_parser.stats()}")
+    resume_parser.shutdown()
+
+
+def main():
+    pages, chars = settings.RESUME_PARSE_MAX_PAGES, settings.RESUME_PARSE_MAX_CHARS
+    samples = [
+        ("resume.pdf", make_pdf(2), PDF_MIME_TYPE),
+        ("huge.pdf", make_pdf(300), PDF_MIME_TYPE),
+        ("huge.docx", make_docx(5000), DOCX_MIME_TYPE),
+    ]
+    for label, content, mime_type in samples:
+        if mime_type == PDF_MIME_TYPE:
+            old = timed(lambda: old_pdf(content))
+            new = timed(lambda: extract_pdf_text(content, pages, chars))
+        else:
+            old = timed(lambda: old_docx(content))
+            new = timed(lambda: extract_docx_text(content, chars))
+        print(f"{label:12} {len(content) / 1024:8.1f} KB   old {old:9.2f} ms   capped {new:9.2f} ms")
+    asyncio.run(pooled(samples))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Check the async Google Drive client against a local fake Drive server.
+
+The fake serves the two Drive v3 endpoints the client uses (metadata and
+alt=media / export) and records which client ports it saw, so connection
+reuse can be checked. It covers:
+- metadata, streamed download content and its SHA-256
+- 401 for a bad token, 404 for a missing file
+- 403s told apart by reason: rate limits, missing scope, blocked downloads
+- unsupported file types rejected before any content is fetched
+- file ids with reserved URL characters
+- files over the size cap, by declared size and while streaming
+- Google Docs exported as DOCX
+- the full import path into the resume parser
+
+Usage (from the backend directory):
+    python scripts/check_drive_client.py
+"""
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from app.services.drive_client import (
+    DriveAuthError, DriveClient, DriveFileTooLarge, DriveForbidden, DriveNotFound, DriveRateLimited, DriveUnsupportedType
+)
+from app.services.text_extraction import DOCX_MIME_TYPE, PDF_MIME_TYPE
+
+TOKEN = "good-token"
+
+
+def make_pdf() -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    pdf.drawString(40, 800, "Jane Doe")
+    pdf.drawString(40, 780, "jane.doe@example.com")
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+FILES = {
+    "resume": {"name": "resume.pdf", "mimeType": PDF_MIME_TYPE, "content": make_pdf()},
+    "big": {"name": "big.pdf", "mimeType": PDF_MIME_TYPE, "content": os.urandom(300 * 1024)},
+    # Drive does not always report a size; the stream cap must still hold
+    "unsized": {"name": "unsized.pdf", "mimeType": PDF_MIME_TYPE, "content": os.urandom(300 * 1024), "hide_size": True},
+    "doc": {"name": "CV", "mimeType": "application/vnd.google-apps.document", "export": b"PK fake docx"},
+    "photo": {"name": "photo.png", "mimeType": "image/png", "content": os.urandom(1024)},
+    "locked": {"name": "locked.pdf", "mimeType": PDF_MIME_TYPE, "content": b"%PDF", "forbidden": "cannotDownloadFile"},
+    "odd/id?#": {"name": "odd.pdf", "mimeType": PDF_MIME_TYPE, "content": b"%PDF odd"},
+}
+# Tokens the fake answers with a 403 and this reason
+FORBIDDEN_TOKENS = {"throttled-token": "userRateLimitExceeded", "no-scope-token": "insufficientPermissions"}
+client_ports = set()
+media_requests = []
+
+
+def drive_error(code: int, reason: str) -> bytes:
+    return json.dumps({"error": {"code": code, "errors": [{"reason": reason}]}}).encode()
+
+
+class FakeDrive(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        client_ports.add(self.client_address[1])
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        token = self.headers.get("Authorization", "").removeprefix("Bearer ")
+        if token in FORBIDDEN_TOKENS:
+            return self._send(403, drive_error(403, FORBIDDEN_TOKENS[token]))
+        if token != TOKEN:
+            return self._send(401, b'{"error": "invalid_token"}')
+        parts = url.path.split("/")
+        file_id = unquote(parts[4]) if len(parts) > 4 else ""
+        if file_id not in FILES:
+            return self._send(404, b'{"error": "notFound"}')
+        item = FILES[file_id]
+        if url.path.endswith("/export"):
+            return self._send(200, item["export"], query["mimeType"][0])
+        if query.get("alt") == ["media"]:
+            media_requests.append(file_id)
+            if "forbidden" in item:
+                return self._send(403, drive_error(403, item["forbidden"]))
+            return self._send(200, item["content"], item["mimeType"])
+        metadata = {"id": file_id, "name": item["name"], "mimeType": item["mimeType"]}
+        if "content" in item and not item.get("hide_size"):
+            metadata["size"] = str(len(item["content"]))
+        self._send(200, json.dumps(metadata).encode())
+
+
+async def expect(error, coro):
+    try:
+        await coro
+    except error:
+        return
+    raise AssertionError(f"expected {error.__name__}")
+
+
+async def run(base_url: str):
+    client = DriveClient(base_url=base_url, max_bytes=256 * 1024, timeout=5.0)
+
+    download = await client.download("resume", TOKEN)
+    content = FILES["resume"]["content"]
+    assert download["content"] == content and download["mime_type"] == PDF_MIME_TYPE
+    assert download["sha256"] == hashlib.sha256(content).hexdigest()
+    print(f"download ok: {download['name']} {len(content)} bytes")
+
+    await expect(DriveAuthError, client.download("resume", "bad-token"))
+    await expect(DriveNotFound, client.download("missing", TOKEN))
+    await expect(DriveFileTooLarge, client.download("big", TOKEN))
+    await expect(DriveFileTooLarge, client.download("unsized", TOKEN))
+    print("401 / 404 / 413 ok")
+
+    await expect(DriveRateLimited, client.download("resume", "throttled-token"))
+    await expect(DriveAuthError, client.download("resume", "no-scope-token"))
+    await expect(DriveForbidden, client.download("locked", TOKEN))
+    print("403 rate limit -> 429, missing scope -> 401, blocked download -> 403 ok")
+
+    media_requests.clear()
+    await expect(DriveUnsupportedType, client.download("photo", TOKEN, allowed_mime_types=(PDF_MIME_TYPE, DOCX_MIME_TYPE)))
+    assert media_requests == [], media_requests
+    print("unsupported type rejected from metadata alone")
+
+    odd = await client.download("odd/id?#", TOKEN)
+    assert odd["content"] == b"%PDF odd", odd
+    print("file id with reserved characters ok")
+
+    exported = await client.download("doc", TOKEN)
+    assert exported["mime_type"] == DOCX_MIME_TYPE and exported["content"] == b"PK fake docx"
+    print("Google Doc export ok")
+
+    client_ports.clear()
+    await asyncio.gather(*(client.get_metadata("resume", TOKEN) for _ in range(5)))
+    for _ in range(20):
+        await client.download("resume", TOKEN)
+    print(f"45 requests over {len(client_ports)} connection(s)")
+    assert len(client_ports) <= 5
+
+    # Full import path: drive client -> resume parser worker pool
+    from app.services.drive_client import drive_client
+    from app.services.google_drive_service import google_drive_service
+    from app.services.text_extraction import resume_parser
+
+    drive_client.base_url = base_url
+    await resume_parser.start()
+    try:
+        parsed = await google_drive_service.process_google_drive_file("resume", TOKEN)
+        assert parsed["personalInfo"].get("email") == "jane.doe@example.com", parsed
+        print(f"import ok: {parsed['personalInfo']}")
+    finally:
+        resume_parser.shutdown()
+        await drive_client.aclose()
+    print(f"client stats: {client.stats()}")
+    await client.aclose()
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDrive)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        asyncio.run(run(f"http://127.0.0.1:{server.server_address[1]}"))
+    finally:
+        server.shutdown()
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+"""
+Check the pooled SMTP mailer against a local SMTP sink and compare it with
+opening a fresh connection per message.
+
+The sink speaks enough ESMTP for aiosmtplib (EHLO, AUTH PLAIN, MAIL, RCPT,
+DATA, RSET, QUIT) without STARTTLS, stores what it receives and counts
+connections. Each
+connection pays a configurable handshake delay standing in for TCP, TLS and
+AUTH to a remote server. It checks:
+- a burst is delivered over at most pool_size connections
+- bad credentials and rejected recipients surface as errors
+- a server that does not offer STARTTLS is refused before AUTH
+- a pooled connection dropped by the server is reopened transparently
+- the send rate limit holds
+
+Usage (from the backend directory):
+    python scripts/check_mailer.py [--messages 200] [--handshake-ms 50]
+"""
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiosmtplib
+
+from app.services.mailer import Mailer
+
+USERNAME, PASSWORD = "mailer", "secret"
+
+
+class SmtpSink:
+    def __init__(self, handshake_delay: float):
+        self.handshake_delay = handshake_delay
+        self.connections = 0
+        self.messages = []
+        self.auth_attempts = []
+        self.writers = []
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    def drop_all(self):
+        """Close every open connection, as a server does with idle clients"""
+        for writer in self.writers:
+            writer.close()
+        self.writers.clear()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        self.writers.append(writer)
+
+        def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+
+        await asyncio.sleep(self.handshake_delay)
+        reply("220 sink ESMTP")
+        try:
+            while True:
+                line = (await reader.readline()).decode().rstrip("\r\n")
+                if not line:
+                    break
+                command = line[:4].upper()
+                if command == "EHLO":
+                    reply("250-sink\r\n250-AUTH PLAIN\r\n250 8BITMIME")
+                elif command == "HELO":
+                    reply("250 sink")
+                elif command == "AUTH":
+                    credentials = line.split()[2] if len(line.split()) > 2 else ""
+                    self.auth_attempts.append(credentials)
+                    _, user, password = base64.b64decode(credentials).decode().split("\0")
+                    reply("235 ok" if (user, password) == (USERNAME, PASSWORD) else "535 bad credentials")
+                elif command == "MAIL":
+                    reply("250 ok")
+                elif command == "RCPT":
+                    reply("550 no such user" if "reject" in line else "250 ok")
+                elif command == "DATA":
+                    reply("354 go ahead")
+                    await writer.drain()
+                    data = []
+                    while True:
+                        chunk = await reader.readline()
+                        if chunk in (b".\r\n", b""):
+                            break
+                        data.append(chunk)
+                    self.messages.append(b"".join(data))
+                    reply("250 queued")
+                elif command in ("RSET", "NOOP"):
+                    reply("250 ok")
+                elif command == "QUIT":
+                    reply("221 bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 not implemented")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def mailer_for(port: int, **options) -> Mailer:
+    defaults = dict(
+        hostname="127.0.0.1", port=port, username=USERNAME, password=PASSWORD,
+        sender="noreply@example.com", sender_name="SkillGlide", pool_size=3, rate_per_second=0,
+        # The sink speaks plaintext only; the STARTTLS requirement is checked separately
+        start_tls=False
+    )
+    defaults.update(options)
+    return Mailer(**defaults)
+
+
+async def run(messages: int, handshake_ms: float):
+    sink = SmtpSink(handshake_ms / 1000)
+    port = await sink.start()
+    mailer = mailer_for(port)
+    batch = [mailer.build_message(f"user{i}@example.com", f"Welcome {i}", "<p>Hello</p>", is_html=True) for i in range(messages)]
+
+    # Before: a new connection, handshake and login for every message
+    sink.connections = 0
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        aiosmtplib.send(message, hostname="127.0.0.1", port=port, username=USERNAME, password=PASSWORD)
+        for message in batch
+    ))
+    fresh_seconds = time.perf_counter() - started
+    fresh_connections = sink.connections
+
+    sink.connections = 0
+    sink.messages.clear()
+    started = time.perf_counter()
+    errors = await mailer.send_many(batch)
+    pooled_seconds = time.perf_counter() - started
+    assert errors == [None] * messages and len(sink.messages) == messages
+    assert sink.connections <= mailer.pool_size, sink.connections
+    print(f"{messages} messages, {handshake_ms:.0f} ms handshake")
+    print(f"  connection per message: {fresh_seconds * 1000:8.1f} ms over {fresh_connections} connections")
+    print(f"  pooled mailer:          {pooled_seconds * 1000:8.1f} ms over {sink.connections} connections")
+
+    # A pooled connection closed by the server is replaced on the next send
+    sink.drop_all()
+    await asyncio.sleep(0.05)
+    opened = sink.connections
+    await mailer.send("after-drop@example.com", "Still there?", "yes")
+    assert sink.connections == opened + 1 and b"after-drop@example.com" in sink.messages[-1]
+    print(f"reconnect ok: {mailer.stats()}")
+
+    results = await mailer.send_many([
+        mailer.build_message("ok@example.com", "a", "a"),
+        mailer.build_message("reject@example.com", "b", "b"),
+    ])
+    assert results[0] is None and isinstance(results[1], aiosmtplib.SMTPRecipientsRefused), results
+    print(f"rejected recipient reported: {type(results[1]).__name__}")
+
+    try:
+        await mailer_for(port, password="wrong").send("x@example.com", "x", "x")
+        raise AssertionError("expected an authentication error")
+    except aiosmtplib.SMTPAuthenticationError:
+        print("bad credentials rejected")
+
+    # The default requires STARTTLS: the sink does not offer it, so no credentials may be sent
+    before = len(sink.auth_attempts)
+    try:
+        await mailer_for(port, start_tls=True).send("x@example.com", "x", "x")
+        raise AssertionError("expected the connect to fail without STARTTLS")
+    except aiosmtplib.SMTPException as e:
+        assert len(sink.auth_attempts) == before, "credentials sent without TLS"
+        print(f"server without STARTTLS refused: {e}")
+
+    limited = mailer_for(port, rate_per_second=50)
+    started = time.perf_counter()
+    await limited.send_many(batch[:20])
+    elapsed = time.perf_counter() - started
+    assert elapsed >= 19 / 50 * 0.95, elapsed
+    print(f"rate limit ok: 20 messages at 50/s took {elapsed * 1000:.0f} ms")
+
+    await limited.close()
+    await mailer.close()
+    sink.drop_all()
+    sink.server.close()
+    await sink.server.wait_closed()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--handshake-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.messages, args.handshake_ms))
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Round-trip check of the configured upload storage backend.
+
+Run it against a local S3 emulator before pointing the API at a real
+bucket, e.g. with MinIO:
+
+    docker run -p 9000:9000 -e MINIO_ROOT_USER=minio -e MINIO_ROOT_PASSWORD=minio123 minio/minio server /data
+    STORAGE_BACKEND=s3 S3_ENDPOINT_URL=http://localhost:9000 AWS_BUCKET_NAME=munus-test \\
+    AWS_ACCESS_KEY_ID=minio AWS_SECRET_ACCESS_KEY=minio123 python scripts/check_storage_backend.py
+
+The bucket is created if the backend is S3 and it does not exist yet.
+"""
+import asyncio
+import hashlib
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.services.storage import S3StorageBackend, storage
+
+
+async def main():
+    print(f"Backend: {storage.name}")
+    if isinstance(storage, S3StorageBackend):
+        try:
+            storage._client.head_bucket(Bucket=storage.bucket)
+        except Exception:
+            storage._client.create_bucket(Bucket=storage.bucket)
+            print(f"Created bucket {storage.bucket}")
+
+    payload = os.urandom(10 * 1024 * 1024)  # above the multipart threshold
+    sha256 = hashlib.sha256(payload).hexdigest()
+    key = f"blobs/check/{sha256}.bin"
+
+    with tempfile.NamedTemporaryFile(delete=False) as handle:
+        handle.write(payload)
+    await storage.put_file(handle.name, key, "application/octet-stream")
+    assert await storage.size(key) == len(payload), "size mismatch after put_file"
+    print(f"put_file ok ({len(payload)} bytes)")
+
+    download_url = storage.download_url(key)
+    if download_url.startswith("http"):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(download_url)
+        assert hashlib.sha256(response.content).hexdigest() == sha256, "downloaded content differs"
+        print("download_url ok")
+
+    small = b"direct upload check"
+    small_sha256 = hashlib.sha256(small).hexdigest()
+    direct_key = f"blobs/check/{small_sha256}.txt"
+    upload = storage.presigned_upload(direct_key, "text/plain", len(small), small_sha256)
+    if upload is None:
+        print("presigned_upload not supported by this backend")
+    else:
+        async with httpx.AsyncClient() as client:
+            response = await client.request(upload["method"], upload["url"], content=small, headers=upload["headers"])
+            response.raise_for_status()
+            tampered = await client.request(upload["method"], upload["url"], content=small.upper(), headers=upload["headers"])
+        assert await storage.size(direct_key) == len(small), "direct upload missing"
+        assert tampered.status_code >= 400, "tampered direct upload was accepted"
+        print("presigned_upload ok (tampered body rejected)")
+        await storage.delete(direct_key)
+
+    await storage.delete(key)
+    assert await storage.size(key) is None, "object still present after delete"
+    print("delete ok")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
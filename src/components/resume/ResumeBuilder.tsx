@@ -72,21 +72,12 @@ export const ResumeBuilder: React.FC = () => {
       
       console.log('PDF generation result:', result);
       
-      if (!result.pdfContent) {
+      if (!result.blob || result.blob.size === 0) {
         throw new Error('No PDF content received from server');
       }
       
-      // Convert hex string back to bytes
-      const pdfBytes = new Uint8Array(
-        result.pdfContent.match(/.{1,2}/g)?.map(byte => parseInt(byte, 16)) || []
-      );
-      
-      if (pdfBytes.length === 0) {
-        throw new Error('Invalid PDF content received');
-      }
-      
-      // Create blob and download
-      const blob = new Blob([pdfBytes], { type: 'application/pdf' });
+      // Download the PDF returned by the server
+      const blob = result.blob;
       const url = window.URL.createObjectURL(blob);
       const link = document.createElement('a');
       link.href = url;
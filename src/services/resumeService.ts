@@ -1,4 +1,4 @@
-import { api } from './api';
+import apiClient, { api } from './api';
 import type { Resume, Experience, Education } from '../types';
 
 export interface ResumeResponse {
@@ -208,18 +208,18 @@ class ResumeService {
     }
   }
 
-  async generatePDFFromData(resumeData: any): Promise<{ filename: string; pdfContent: string }> {
+  async generatePDFFromData(resumeData: any): Promise<{ filename: string; blob: Blob }> {
     try {
-      const response = await api.post<any>('/resumes/generate-pdf', resumeData);
-      
-      if (response.data.success) {
-        return {
-          filename: response.data.filename,
-          pdfContent: response.data.pdf_content
-        };
-      } else {
-        throw new Error('Failed to generate PDF');
-      }
+      const response = await apiClient.post('/resumes/generate-pdf', resumeData, {
+        responseType: 'blob',
+      });
+      const disposition: string = response.headers['content-disposition'] || '';
+      const encoded = disposition.match(/filename\*=UTF-8''([^;]+)/i);
+      const plain = disposition.match(/filename="([^"]+)"/i);
+      return {
+        filename: encoded ? decodeURIComponent(encoded[1]) : plain ? plain[1] : 'resume.pdf',
+        blob: response.data
+      };
     } catch (error: any) {
       throw new Error(error.response?.data?.detail || 'Failed to generate PDF');
     }